@@ -1,3 +1,8 @@
 """AXV Gateway application package."""
 
+import time
+
 __version__ = "0.1.0"
+
+# Anchor for the startup report (app.startup): first gateway code to run.
+IMPORT_STARTED_AT = time.perf_counter()
@@ -0,0 +1,119 @@
+"""Incremental parser for batched hook envelopes (NDJSON or JSON array)."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi.exceptions import RequestValidationError
+
+from app.body import RequestBody
+
+NDJSON = "ndjson"
+ARRAY = "array"
+
+
+class BatchTooLargeError(Exception):
+    """More events than allowed in one batch (413)."""
+
+
+class BatchFormatError(Exception):
+    """The envelope itself is unusable, e.g. a malformed JSON array (400)."""
+
+
+@dataclass
+class BatchEvent:
+    """
+    One event of a batch: {"hook": "<name>", "id": "<sender id>", "payload": {...}}.
+
+    `error` is set (status, message) when the event cannot be dispatched;
+    the rest of the batch is still processed.
+    """
+
+    index: int
+    hook: str = ""
+    id: Any = None
+    payload: dict | None = None
+    error: tuple[int, str] | None = None
+
+
+class BatchParser:
+    """
+    Feed body chunks as they arrive; NDJSON lines are parsed as soon as they
+    are complete, a JSON array is parsed once at the end.
+
+    The format comes from the Content-Type, or is sniffed from the first
+    non-whitespace byte ("[" = array, anything else = NDJSON).
+    """
+
+    def __init__(self, max_events: int, content_type: str = ""):
+        self.max_events = max_events
+        self.events: list[BatchEvent] = []
+        self._buf = bytearray()
+        ct = content_type.lower()
+        if "ndjson" in ct or "jsonl" in ct or "jsonlines" in ct:
+            self.mode: str | None = NDJSON
+        elif "json" in ct:
+            self.mode = ARRAY
+        else:
+            self.mode = None
+
+    def feed(self, chunk: bytes) -> None:
+        self._buf += chunk
+        if self.mode is None:
+            stripped = self._buf.lstrip()
+            if not stripped:
+                return
+            self.mode = ARRAY if stripped[:1] == b"[" else NDJSON
+        if self.mode == NDJSON:
+            start = 0
+            while (nl := self._buf.find(b"\n", start)) != -1:
+                self._line(bytes(self._buf[start:nl]))
+                start = nl + 1
+            del self._buf[:start]
+
+    def close(self) -> list[BatchEvent]:
+        if self.mode == ARRAY:
+            try:
+                items = RequestBody(bytes(self._buf)).json()
+            except RequestValidationError as e:
+                raise BatchFormatError("invalid JSON array") from e
+            if not isinstance(items, list):
+                raise BatchFormatError("expected a JSON array of events")
+            if len(items) > self.max_events:
+                raise BatchTooLargeError(f"batch exceeds {self.max_events} events")
+            for item in items:
+                self._event(item)
+        elif self._buf.strip():
+            self._line(bytes(self._buf))
+        self._buf.clear()
+        return self.events
+
+    def _line(self, line: bytes) -> None:
+        if not line.strip():
+            return
+        try:
+            item = RequestBody(line).json()
+        except RequestValidationError:
+            self._add(BatchEvent(len(self.events), error=(422, "invalid JSON")))
+            return
+        self._event(item)
+
+    def _event(self, item: Any) -> None:
+        ev = BatchEvent(len(self.events))
+        if not isinstance(item, dict):
+            ev.error = (422, "event must be an object")
+        else:
+            ev.id = item.get("id")
+            ev.hook = item.get("hook") if isinstance(item.get("hook"), str) else ""
+            payload = item.get("payload")
+            if not ev.hook:
+                ev.error = (422, "missing hook")
+            elif not isinstance(payload, dict):
+                ev.error = (422, "payload must be an object")
+            else:
+                ev.payload = payload
+        self._add(ev)
+
+    def _add(self, ev: BatchEvent) -> None:
+        if len(self.events) >= self.max_events:
+            raise BatchTooLargeError(f"batch exceeds {self.max_events} events")
+        self.events.append(ev)
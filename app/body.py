@@ -0,0 +1,126 @@
+"""Request-scoped body shared by HMAC verification, middlewares and hook handlers."""
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency (pip install .[fast])
+    orjson = None
+
+
+def _reject_constant(name: str) -> Any:
+    # NaN/Infinity are not JSON; refusing them keeps pass-through output valid.
+    raise ValueError(f"invalid JSON constant {name}")
+
+
+class RequestBody:
+    """
+    Raw body bytes read once per request, JSON parsed lazily at most once.
+
+    Stored on ``request.state.body`` so every layer (capture middleware,
+    hmac_verify, handlers) sees the same bytes instead of re-reading and
+    re-decoding them.
+    """
+
+    __slots__ = ("raw", "_parsed", "_value")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._parsed = False
+        self._value: Any = None
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def json(self) -> Any:
+        """
+        Parsed JSON body (cached).
+
+        Raises:
+            RequestValidationError: body is not valid JSON (422, same shape
+                as FastAPI's own body parsing errors).
+        """
+        if not self._parsed:
+            try:
+                if orjson is not None:
+                    self._value = orjson.loads(self.raw)
+                else:
+                    # Strict UTF-8 like orjson: bytes would let json.loads auto-detect a
+                    # BOM / UTF-16 / UTF-32, which pass-through routes can't re-emit as JSON
+                    self._value = json.loads(
+                        self.raw.decode("utf-8"), parse_constant=_reject_constant
+                    )
+            except ValueError as e:
+                raise RequestValidationError(
+                    [
+                        {
+                            "type": "json_invalid",
+                            "loc": ("body",),
+                            "msg": "JSON decode error",
+                            "input": {},
+                            "ctx": {"error": str(e)},
+                        }
+                    ]
+                ) from e
+            self._parsed = True
+        return self._value
+
+    def json_object(self) -> dict:
+        """Parsed body that must be a JSON object (422 otherwise)."""
+        value = self.json()
+        if not isinstance(value, dict):
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "dict_type",
+                        "loc": ("body",),
+                        "msg": "Input should be a valid dictionary",
+                        "input": value,
+                    }
+                ]
+            )
+        return value
+
+
+def attach_body(request: Request, raw: bytes) -> RequestBody:
+    """Share already-read bytes with the rest of the request (used by middlewares)."""
+    ctx = RequestBody(raw)
+    request.state.body = ctx
+    return ctx
+
+
+async def request_body(request: Request) -> RequestBody:
+    """Dependency: the shared RequestBody of this request, reading it on first use."""
+    ctx = getattr(request.state, "body", None)
+    if ctx is None:
+        ctx = attach_body(request, await request.body())
+    return ctx
+
+
+async def iter_body(request: Request) -> AsyncIterator[bytes]:
+    """
+    Stream the request body without buffering it; yields the shared bytes
+    instead when a middleware already read them (capture mode).
+    """
+    ctx = getattr(request.state, "body", None)
+    if ctx is not None:
+        if ctx.raw:
+            yield ctx.raw
+        return
+    async for chunk in request.stream():
+        if chunk:
+            yield chunk
+
+
+# OpenAPI requestBody for routes that take RequestBody instead of a typed model.
+JSON_OBJECT_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": {"type": "object"}}},
+    }
+}
@@ -0,0 +1,189 @@
+"""Sampled request capture to JSONL, replayable with ``bench.replay``."""
+
+from __future__ import annotations
+
+import atexit
+import base64
+import hashlib
+import json
+import logging
+import queue
+import random
+import threading
+from pathlib import Path
+from typing import IO
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Headers worth keeping for replay. Signature headers are intentionally left
+# out: replay re-signs /hooks/* with a fresh timestamp anyway.
+CAPTURED_HEADERS = (
+    "accept",
+    "content-type",
+    "user-agent",
+    "x-forwarded-for",
+    "x-request-id",
+)
+
+
+class TrafficRecorder:
+    """
+    Append-only JSONL recorder for sampled requests.
+
+    One line per request:
+        {"t": <arrival epoch s>, "method", "path", "query", "headers": {...},
+         "body_len", "body_sha256", ["body" | "body_b64"], "status", "duration_ms"}
+
+    Bodies are stored only with ``capture_bodies`` enabled (they may carry
+    sensitive payloads); otherwise only length and SHA-256 digest are kept.
+
+    record() only formats the line and queues it; a writer thread appends
+    queued lines in batches, so the event loop never waits on the disk.
+    Above `max_pending` queued lines new records are dropped (`dropped`).
+    close() (also run at exit) writes out what is queued.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        sample_rate: float = 1.0,
+        capture_bodies: bool = False,
+        max_body_bytes: int = 65536,
+        max_pending: int = 10000,
+    ):
+        self.path = Path(path)
+        self.sample_rate = sample_rate
+        self.capture_bodies = capture_bodies
+        self.max_body_bytes = max_body_bytes
+        self.dropped = 0
+        self._fh: IO[str] | None = None
+        self._lines: queue.Queue[str | None] = queue.Queue(max_pending)
+        self._writer: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> TrafficRecorder | None:
+        if not settings.capture_path:
+            return None
+        return cls(
+            settings.capture_path,
+            sample_rate=settings.capture_sample_rate,
+            capture_bodies=settings.capture_bodies,
+            max_body_bytes=settings.capture_max_body_bytes,
+        )
+
+    def should_sample(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def record(
+        self,
+        *,
+        t: float,
+        method: str,
+        path: str,
+        query: str,
+        headers: dict[str, str],
+        body: bytes,
+        status: int,
+        duration_ms: float,
+    ) -> None:
+        entry: dict = {
+            "t": round(t, 6),
+            "method": method,
+            "path": path,
+            "query": query,
+            "headers": {k: headers[k] for k in CAPTURED_HEADERS if k in headers},
+            "body_len": len(body),
+            "body_sha256": hashlib.sha256(body).hexdigest() if body else "",
+        }
+        if self.capture_bodies and body and len(body) <= self.max_body_bytes:
+            try:
+                entry["body"] = body.decode("utf-8")
+            except UnicodeDecodeError:
+                entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        entry["status"] = status
+        entry["duration_ms"] = round(duration_ms, 3)
+
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+        if self._writer is None:
+            self._start()
+        try:
+            self._lines.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(
+                target=self._write_loop, name="axv-gw-capture", daemon=True
+            )
+            self._writer.start()
+            atexit.register(self.close)
+
+    def _write_loop(self) -> None:
+        while True:
+            lines = [self._lines.get()]
+            # Wszystko, co już czeka, jednym zapisem
+            while len(lines) < 1024:
+                try:
+                    lines.append(self._lines.get_nowait())
+                except queue.Empty:
+                    break
+            done = None in lines
+            self._write([line for line in lines if line is not None])
+            if done:
+                return
+
+    def _write(self, lines: list[str]) -> None:
+        if not lines:
+            return
+        try:
+            if self._fh is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.writelines(lines)
+            self._fh.flush()  # batch on disk before waiting for the next one
+        except OSError as e:
+            logger.error(f"Traffic capture write failed: {e}")
+
+    def close(self) -> None:
+        """Write out queued records and stop the writer thread."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._lines.put(None)
+            writer.join()
+            atexit.unregister(self.close)
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def load_capture(path: str | Path) -> list[dict]:
+    """Read a capture file, skipping blank and malformed lines, ordered by arrival."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    records.sort(key=lambda r: r.get("t", 0.0))
+    return records
+
+
+def record_body(entry: dict) -> bytes | None:
+    """Original body bytes of a captured record, or None if only a digest was kept."""
+    if "body" in entry:
+        return entry["body"].encode("utf-8")
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return b"" if not entry.get("body_len") else None
@@ -0,0 +1,68 @@
+"""`axv-gw` command line (installed as a console script)."""
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import asdict
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from app.config import settings
+    from app.serve import ServeOptions, serve
+
+    try:
+        opts = ServeOptions.from_settings(
+            settings,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            reuse_port=args.reuse_port,
+            max_requests=args.max_requests,
+            max_rss_mb=args.max_rss_mb,
+            log_level=args.log_level,
+        )
+    except ValueError as e:
+        print(f"axv-gw serve: {e}", file=sys.stderr)
+        return 2
+    if args.print_config:
+        print(json.dumps(asdict(opts), indent=2))
+        return 0
+    serve(opts)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="axv-gw", description="AXV Gateway")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser(
+        "serve",
+        help="run the gateway (per-core workers, uvloop/httptools when installed)",
+        description="Defaults come from AXV_GW_* settings; flags override them.",
+    )
+    p.add_argument("--host")
+    p.add_argument("--port", type=int)
+    p.add_argument("--workers", type=int, help="0 = one per usable CPU (default)")
+    p.add_argument(
+        "--reuse-port",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="one SO_REUSEPORT socket per worker (default: on where supported)",
+    )
+    p.add_argument("--max-requests", type=int, help="recycle a worker after ~N requests")
+    p.add_argument("--max-rss-mb", type=int, help="recycle a worker above this RSS")
+    p.add_argument("--log-level")
+    p.add_argument("--print-config", action="store_true", help="print resolved options and exit")
+    p.set_defaults(func=_serve)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,16 @@
 """Application configuration via environment variables."""
 
+import json
+import logging
+from collections.abc import Callable
+
+from pydantic import ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from axv_gw import runtime_config
+
+logger = logging.getLogger(__name__)
+
 
 class Settings(BaseSettings):
     # --- internal signer ---
@@ -28,5 +37,159 @@ class Settings(BaseSettings):
     port: int = 8000
     log_level: str = "info"
 
+    # `axv-gw serve`: workers=0 = one per usable CPU (affinity + cgroup quota);
+    # a worker is recycled after ~max_requests (±10%) or above max_rss_mb (0 = off)
+    workers: int = 0
+    backlog: int = 2048
+    keepalive_timeout_s: int = 65
+    reuse_port: bool = True
+    max_requests: int = 0
+    max_rss_mb: int = 0
+    graceful_timeout_s: int = 30
+
+    # Startup: warm caches before accepting traffic, budget for import→ready
+    prewarm: bool = True
+    startup_budget_ms: int = 2000
+    docs_enabled: bool = True
+
+    # Fast JSON: orjson (if installed) + pre-encoded model bodies, no re-validation
+    fast_json: bool = True
+
+    # Hook ingestion: "inline" (handler runs in the request) or "queue"
+    # (durable segment log, 202 Accepted, background workers)
+    hooks_ingest_mode: str = "inline"
+    hooks_queue_dir: str = "var/hooks-queue"
+    hooks_queue_workers: int = 4
+    hooks_queue_max_attempts: int = 5
+    hooks_queue_max_depth: int = 100000
+    hooks_queue_segment_mb: int = 8
+    hooks_queue_fsync_interval_ms: int = 5
+    hooks_queue_fsync_batch: int = 256
+
+    # /hooks/batch: max events per signed envelope (body size: MAX_BATCH_BODY_KB)
+    hooks_batch_max_events: int = 500
+
+    # Forwarding of handled hooks: JSON {"<hook>": ["<url>", ...]}, empty = off.
+    # Re-signed with hooks_forward_secret (default: AXV_HMAC_SECRET).
+    hooks_forward: dict[str, list[str]] = {}
+    hooks_forward_secret: str = ""
+    hooks_forward_concurrency: int = 8
+    hooks_forward_timeout_s: float = 5.0
+    hooks_forward_max_attempts: int = 6
+    hooks_forward_backoff_base_ms: int = 500
+    hooks_forward_backoff_max_ms: int = 60000
+    hooks_forward_max_pending: int = 10000
+
+    # Reverse proxy: JSON {"/axv": "http://axv-api:8001"} or {"/axv": {"url": ...,
+    # "timeout_s": ..., "connect_timeout_s": ..., "max_connections": ...,
+    # "strip_prefix": false}}; empty = no proxy routes
+    proxy_routes: dict[str, str | dict] = {}
+    proxy_timeout_s: float = 10.0
+    proxy_connect_timeout_s: float = 2.0
+    proxy_max_connections: int = 100
+
+    # Keyed status documents: <front_sites_dir>/<site>/<locale>.json, served by
+    # /front/sites/{site}/status and /front/status + X-AXV-Site; empty = off
+    front_sites_dir: str = ""
+    front_default_locale: str = "en"
+    front_registry_max_mb: float = 16.0
+
+    # Default /front/status document from an upstream (GET, FrontStatusV1 JSON)
+    # instead of stub_path; timeout/retries: request_timeout_seconds and
+    # request_max_retries. Empty = stub file
+    front_status_url: str = ""
+
+    # Status history (/front/status/history): raw samples per service, hourly
+    # rollups (2400 h = 100 days); snapshot file empty = in memory only
+    history_path: str = ""
+    history_capacity: int = 20160
+    history_hours: int = 2400
+    history_snapshot_s: float = 60.0
+
+    # Traffic capture (RequestLoggingMiddleware); empty path = disabled
+    capture_path: str = ""
+    capture_sample_rate: float = 1.0
+    capture_bodies: bool = False
+    capture_max_body_bytes: int = 65536
+
+
+# Used once when the app/worker starts; a runtime change only takes effect
+# after a restart (logged as a warning on reload).
+RESTART_REQUIRED = frozenset(
+    {
+        "host",
+        "port",
+        "workers",
+        "backlog",
+        "keepalive_timeout_s",
+        "reuse_port",
+        "max_requests",
+        "max_rss_mb",
+        "graceful_timeout_s",
+        "docs_enabled",
+        "fast_json",
+        "prewarm",
+        "startup_budget_ms",
+        "hooks_ingest_mode",
+        "capture_path",
+        "capture_sample_rate",
+        "capture_bodies",
+        "capture_max_body_bytes",
+        "front_sites_dir",
+        "front_default_locale",
+        "front_registry_max_mb",
+    }
+) | {
+    f
+    for f in Settings.model_fields
+    if f.startswith(("hooks_queue_", "hooks_forward", "proxy_", "history_"))
+}
+
+_FIELDS = {name.lower(): name for name in Settings.model_fields}
+_listeners: list[Callable[[Settings, Settings], None]] = []
+
+
+def on_change(fn: Callable[[Settings, Settings], None]) -> Callable[[Settings, Settings], None]:
+    """Register fn(old, new), called after `settings` was replaced by a reload."""
+    _listeners.append(fn)
+    return fn
+
+
+def _overrides(cfg: runtime_config.RuntimeConfig) -> dict:
+    prefix = Settings.model_config["env_prefix"]
+    out = {}
+    for key, value in cfg.values.items():
+        if not key.upper().startswith(prefix):
+            continue
+        name = _FIELDS.get(key[len(prefix) :].lower())
+        if name is None:
+            logger.warning(f"Unknown runtime config key {key}, ignored")
+            continue
+        out[name] = json.loads(value) if value[:1] in "[{" else value
+    return out
+
+
+def _prepare(old: runtime_config.RuntimeConfig, new: runtime_config.RuntimeConfig):
+    """Build the new Settings (env + file overrides) before anything is swapped."""
+    try:
+        staged = Settings(**_overrides(new))
+    except (ValidationError, json.JSONDecodeError) as e:
+        raise ValueError(f"invalid settings: {e}") from None
+
+    def commit() -> None:
+        global settings
+        previous, settings = settings, staged
+        changed = [f for f in Settings.model_fields if getattr(previous, f) != getattr(staged, f)]
+        if needs_restart := sorted(RESTART_REQUIRED.intersection(changed)):
+            logger.warning(f"Changed settings need a restart to apply: {', '.join(needs_restart)}")
+        for fn in _listeners:
+            fn(previous, staged)
+
+    return commit
+
 
+# Readers use `config.settings.<field>` (attribute lookup per use), so a reload
+# swaps the whole object atomically.
 settings = Settings()
+runtime_config.subscribe(_prepare)
+runtime_config.reload()
@@ -0,0 +1,226 @@
+"""Fan-out of handled hooks to configured downstream targets (AXV_GW_HOOKS_FORWARD)."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+
+import httpx
+
+from app.config import Settings
+from axv_gw.metrics import forward_deliveries, forward_duration_seconds, forward_pending
+from axv_gw.timer_wheel import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+# Statusy, po których warto ponowić (reszta 4xx = błąd po stronie zdarzenia).
+RETRYABLE_STATUS = {408, 425, 429}
+
+
+@dataclass(slots=True)
+class Delivery:
+    """One hook body on its way to one target."""
+
+    target: str
+    hook: str
+    raw: bytes
+    request_id: str = ""
+    attempt: int = 0
+
+
+def sign(secret: bytes, ts: str, raw: bytes) -> str:
+    """Same contract as inbound hooks: "sha256=" + HMAC(secret, "<ts>.<body>")."""
+    return "sha256=" + hmac.new(secret, ts.encode() + b"." + raw, hashlib.sha256).hexdigest()
+
+
+class _Target:
+    __slots__ = ("url", "queue", "pending", "workers")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.queue: asyncio.Queue[Delivery] = asyncio.Queue()
+        self.pending = 0
+        self.workers: list[asyncio.Task] = []
+
+
+class HookForwarder:
+    """
+    Delivers every handled hook to the targets configured for its name.
+
+    - one shared httpx.AsyncClient (keep-alive pool sized for all targets)
+    - `concurrency` worker tasks per target = max requests in flight to it
+    - every attempt is re-signed with the gateway key and a fresh timestamp
+    - failed attempts (network error, 5xx, 408/425/429) are retried with
+      jittered exponential backoff, scheduled on a TimerWheel instead of a
+      sleeping task per delivery; other statuses fail immediately
+
+    Deliveries live in memory only: whatever is still pending on shutdown is
+    logged and dropped (durability is the ingestion queue's job).
+    """
+
+    def __init__(
+        self,
+        routes: dict[str, list[str]],
+        secret: str,
+        *,
+        concurrency: int = 8,
+        timeout_s: float = 5.0,
+        max_attempts: int = 6,
+        backoff_base_s: float = 0.5,
+        backoff_max_s: float = 60.0,
+        max_pending: int = 10_000,
+        client: httpx.AsyncClient | None = None,
+        wheel: TimerWheel | None = None,
+    ):
+        self.routes = {hook: list(urls) for hook, urls in routes.items() if urls}
+        self.secret = secret.encode()
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.max_pending = max_pending
+        self.targets = {url: _Target(url) for urls in self.routes.values() for url in urls}
+
+        pool = max(len(self.targets) * concurrency, 1)
+        self.client = client or httpx.AsyncClient(
+            timeout=timeout_s,
+            limits=httpx.Limits(max_connections=pool, max_keepalive_connections=pool),
+            headers={"User-Agent": f"axv-gw/{os.getenv('GATEWAY_VERSION', 'dev')}"},
+        )
+        self.wheel = wheel or TimerWheel()
+        self._pending = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> HookForwarder:
+        return cls(
+            settings.hooks_forward,
+            settings.hooks_forward_secret or os.getenv("AXV_HMAC_SECRET", ""),
+            concurrency=settings.hooks_forward_concurrency,
+            timeout_s=settings.hooks_forward_timeout_s,
+            max_attempts=settings.hooks_forward_max_attempts,
+            backoff_base_s=settings.hooks_forward_backoff_base_ms / 1000.0,
+            backoff_max_s=settings.hooks_forward_backoff_max_ms / 1000.0,
+            max_pending=settings.hooks_forward_max_pending,
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        self.wheel.start()
+        for target in self.targets.values():
+            target.workers = [
+                asyncio.create_task(self._work(target), name=f"axv-gw-forward-{i}")
+                for i in range(self.concurrency)
+            ]
+
+    async def stop(self) -> None:
+        if self._pending:
+            logger.warning(f"Dropping {self._pending} undelivered hook forwards on shutdown")
+        await self.wheel.stop()
+        tasks = [t for target in self.targets.values() for t in target.workers]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.client.aclose()
+
+    def submit(self, hook: str, raw: bytes, request_id: str = "") -> int:
+        """Queue `raw` for every target of `hook`; returns deliveries queued."""
+        queued = 0
+        for url in self.routes.get(hook, ()):
+            if self._pending >= self.max_pending:
+                logger.warning(f"Forward backlog full, dropping {hook!r} for {url}")
+                forward_deliveries.labels(target=url, outcome="dropped").inc()
+                continue
+            target = self.targets[url]
+            self._track(target, +1)
+            target.queue.put_nowait(Delivery(url, hook, raw, request_id))
+            queued += 1
+        return queued
+
+    async def drain(self) -> None:
+        """Wait until nothing is queued, in flight or scheduled (tests, graceful stop)."""
+        await self._idle.wait()
+
+    def _track(self, target: _Target, delta: int) -> None:
+        target.pending += delta
+        self._pending += delta
+        forward_pending.labels(target=target.url).set(target.pending)
+        if self._pending:
+            self._idle.clear()
+        else:
+            self._idle.set()
+
+    async def _work(self, target: _Target) -> None:
+        while True:
+            d = await target.queue.get()
+            try:
+                done = await self._attempt(d)
+            except Exception:
+                # Np. httpx.InvalidURL z błędnego wpisu w AXV_GW_HOOKS_FORWARD: ponowienie
+                # nic nie da, a martwy worker zostawiłby pending > 0 i drain() na zawsze.
+                logger.exception(f"Forwarding {d.hook!r} to {d.target} failed")
+                forward_deliveries.labels(target=d.target, outcome="failed").inc()
+                done = True
+            if done:
+                self._track(target, -1)
+
+    async def _attempt(self, d: Delivery) -> bool:
+        """One POST; returns True when the delivery is finished (ok or given up)."""
+        d.attempt += 1
+        ts = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            "X-AXV-Timestamp": ts,
+            "X-AXV-Signature": sign(self.secret, ts, d.raw),
+            "X-AXV-Hook": d.hook,
+            "X-AXV-Delivery-Attempt": str(d.attempt),
+        }
+        if d.request_id:
+            headers["X-Request-ID"] = d.request_id
+
+        status: int | None = None
+        retry_after: str | None = None
+        t0 = time.perf_counter()
+        try:
+            resp = await self.client.post(d.target, content=d.raw, headers=headers)
+            status = resp.status_code
+            retry_after = resp.headers.get("Retry-After")
+            error = f"HTTP {status}"
+        except httpx.HTTPError as e:
+            error = f"{type(e).__name__}: {e}"
+        forward_duration_seconds.labels(target=d.target).observe(time.perf_counter() - t0)
+
+        if status is not None and 200 <= status < 300:
+            forward_deliveries.labels(target=d.target, outcome="delivered").inc()
+            return True
+
+        retryable = status is None or status >= 500 or status in RETRYABLE_STATUS
+        if not retryable or d.attempt >= self.max_attempts:
+            logger.error(
+                f"Forwarding {d.hook!r} to {d.target} failed after {d.attempt} attempts: {error}"
+            )
+            forward_deliveries.labels(target=d.target, outcome="failed").inc()
+            return True
+
+        forward_deliveries.labels(target=d.target, outcome="retried").inc()
+        queue = self.targets[d.target].queue
+        self.wheel.schedule(self._backoff(d.attempt, retry_after), queue.put_nowait, d)
+        return False
+
+    def _backoff(self, attempt: int, retry_after: str | None) -> float:
+        delay = min(self.backoff_base_s * 2 ** (attempt - 1), self.backoff_max_s)
+        # Jitter, żeby ponowienia do jednego celu się nie synchronizowały.
+        delay *= random.uniform(0.5, 1.0)
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.backoff_max_s))
+        return delay
@@ -0,0 +1,405 @@
+"""Per-service status history: array ring buffers, hourly rollups, mmap snapshots."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import time
+import zlib
+from array import array
+from pathlib import Path
+
+from app import config
+from app.config import Settings
+from app.schemas.status import ServiceState
+
+logger = logging.getLogger(__name__)
+
+STATES = [s.value for s in ServiceState]  # kod stanu = indeks: ok, warn, down, unknown
+CODES = {state: code for code, state in enumerate(STATES)}
+UNKNOWN = CODES[ServiceState.UNKNOWN.value]
+HOUR = 3600
+
+MAGIC = b"AXVHIST1"
+HEADER = struct.Struct("<8sII")  # magic, index length, crc32(index + data)
+
+
+class Ring:
+    """Fixed-capacity ring of parallel typed arrays; the oldest row is overwritten."""
+
+    def __init__(self, capacity: int, **typecodes: str):
+        self.capacity = capacity
+        self.head = 0  # next write position
+        self.size = 0
+        self.columns = {
+            name: array(tc, bytes(array(tc).itemsize * capacity)) for name, tc in typecodes.items()
+        }
+
+    def append(self, **values) -> None:
+        for name, value in values.items():
+            self.columns[name][self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def pos(self, i: int) -> int:
+        """Array position of the i-th oldest row."""
+        return (self.head - self.size + i) % self.capacity
+
+    def bisect(self, ts: float) -> int:
+        """Index (oldest = 0) of the first row with ts >= `ts`."""
+        col = self.columns["ts"]
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if col[self.pos(mid)] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class HourlyRollup:
+    """
+    Per-hour counts per state and latency sum/count/max, one slot per hour in
+    a ring of `hours` slots. Long ranges are answered from here, so a 90-day
+    query reads ~2160 slots instead of every sample.
+    """
+
+    def __init__(self, hours: int):
+        self.hours = hours
+        zeros = bytes(hours)
+
+        def col(tc: str) -> array:
+            return array(tc, zeros * array(tc).itemsize)
+
+        self.slot = col("q")
+        self.counts = [col("I") for _ in STATES]
+        self.lat_sum = col("d")
+        self.lat_n = col("I")
+        self.lat_max = col("f")
+
+    def add(self, ts: float, code: int, latency_ms: float) -> None:
+        slot = int(ts // HOUR)
+        pos = slot % self.hours
+        if self.slot[pos] != slot:
+            self.slot[pos] = slot
+            for counts in self.counts:
+                counts[pos] = 0
+            self.lat_sum[pos] = self.lat_n[pos] = self.lat_max[pos] = 0
+        self.counts[code][pos] += 1
+        if not math.isnan(latency_ms):
+            self.lat_sum[pos] += latency_ms
+            self.lat_n[pos] += 1
+            self.lat_max[pos] = max(self.lat_max[pos], latency_ms)
+
+    def arrays(self) -> list[array]:
+        return [self.slot, *self.counts, self.lat_sum, self.lat_n, self.lat_max]
+
+
+class ServiceHistory:
+    """Raw samples (ts, state, latency), state transitions and hourly rollups."""
+
+    def __init__(self, capacity: int, transitions: int, hours: int):
+        self.raw = Ring(capacity, ts="d", state="b", latency="f")
+        self.transitions = Ring(transitions, ts="d", state="b")
+        self.hourly = HourlyRollup(hours)
+        self.state = -1
+
+    def record(self, ts: float, code: int, latency_ms: float) -> None:
+        self.raw.append(ts=ts, state=code, latency=latency_ms)
+        self.hourly.add(ts, code, latency_ms)
+        if code != self.state:
+            self.transitions.append(ts=ts, state=code)
+            self.state = code
+
+    def arrays(self) -> list[array]:
+        return [
+            *self.raw.columns.values(),
+            *self.transitions.columns.values(),
+            *self.hourly.arrays(),
+        ]
+
+    def query(self, start: float, end: float, bucket_s: int) -> dict:
+        n = math.ceil((end - start) / bucket_s)
+        counts = [[0] * n for _ in STATES]
+        lat_sum, lat_n, lat_max = [0.0] * n, [0] * n, [0.0] * n
+
+        if bucket_s % HOUR == 0 and start % HOUR == 0:
+            h = self.hourly
+            per_bucket = bucket_s // HOUR
+            first = int(start // HOUR)
+            for slot in range(first, int(math.ceil(end / HOUR))):
+                pos = slot % h.hours
+                if h.slot[pos] != slot:
+                    continue
+                b = (slot - first) // per_bucket
+                for code, col in enumerate(h.counts):
+                    counts[code][b] += col[pos]
+                if h.lat_n[pos]:
+                    lat_sum[b] += h.lat_sum[pos]
+                    lat_n[b] += h.lat_n[pos]
+                    lat_max[b] = max(lat_max[b], h.lat_max[pos])
+        else:
+            raw = self.raw
+            ts_col, state_col, lat_col = (raw.columns[c] for c in ("ts", "state", "latency"))
+            for i in range(raw.bisect(start), raw.size):
+                pos = raw.pos(i)
+                ts = ts_col[pos]
+                if ts >= end:
+                    break
+                b = int((ts - start) // bucket_s)
+                counts[state_col[pos]][b] += 1
+                latency = lat_col[pos]
+                if not math.isnan(latency):
+                    lat_sum[b] += latency
+                    lat_n[b] += 1
+                    lat_max[b] = max(lat_max[b], latency)
+
+        ok, warn, down = counts[CODES["ok"]], counts[CODES["warn"]], counts[CODES["down"]]
+        # Uptime: ok + warn (działa, choć zdegradowane) / znane próbki; unknown pomijamy
+        uptime = [
+            round((ok[b] + warn[b]) / known, 4) if (known := ok[b] + warn[b] + down[b]) else None
+            for b in range(n)
+        ]
+        out = {state: counts[code] for code, state in enumerate(STATES)}
+        out["uptime"] = uptime
+        out["latency_avg_ms"] = [
+            round(lat_sum[b] / lat_n[b], 2) if lat_n[b] else None for b in range(n)
+        ]
+        out["latency_max_ms"] = [round(lat_max[b], 2) if lat_n[b] else None for b in range(n)]
+        out["transitions"] = self._transitions(start, end)
+        return out
+
+    def _transitions(self, start: float, end: float) -> list[list]:
+        tr = self.transitions
+        ts_col, state_col = tr.columns["ts"], tr.columns["state"]
+        # Stan obowiązujący na początku zakresu + zmiany w zakresie
+        i = max(tr.bisect(start) - 1, 0)
+        out = []
+        while i < tr.size:
+            pos = tr.pos(i)
+            if ts_col[pos] >= end:
+                break
+            out.append([round(ts_col[pos], 3), STATES[state_col[pos]]])
+            i += 1
+        return out
+
+
+class HistoryStore:
+    """
+    Status history of every service seen in the front-status document.
+
+    A sample is recorded per service on every document load (cache fill or
+    pre-warm), with the load latency unless the service entry carries its
+    own `latencyMs`. With a snapshot path, the arrays are copied into a
+    memory-mapped file every `snapshot_s` seconds and on shutdown, and read
+    back on startup (checksum or layout mismatch → start empty).
+    """
+
+    def __init__(
+        self,
+        capacity: int = 20160,
+        transitions: int = 4096,
+        hours: int = 2400,
+        max_services: int = 256,
+    ):
+        self.capacity = capacity
+        self.transitions_capacity = transitions
+        self.hours = hours
+        self.max_services = max_services
+        self.services: dict[str, ServiceHistory] = {}
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> HistoryStore:
+        return cls(capacity=settings.history_capacity, hours=settings.history_hours)
+
+    def _service(self, service_id: str) -> ServiceHistory | None:
+        history = self.services.get(service_id)
+        if history is None:
+            if len(self.services) >= self.max_services:
+                return None
+            history = ServiceHistory(self.capacity, self.transitions_capacity, self.hours)
+            self.services[service_id] = history
+        return history
+
+    def record(self, data: dict, latency_s: float | None = None, ts: float | None = None) -> None:
+        ts = time.time() if ts is None else ts
+        default_ms = latency_s * 1000 if latency_s is not None else math.nan
+        for svc in data.get("services") or []:
+            history = self._service(str(svc.get("id", "")))
+            if history is None:
+                continue
+            latency = svc.get("latencyMs")
+            history.record(
+                ts,
+                CODES.get(svc.get("state"), UNKNOWN),
+                float(latency) if isinstance(latency, int | float) else default_ms,
+            )
+
+    def query(
+        self, start: float, end: float, bucket_s: int, ids: list[str] | None = None
+    ) -> list[dict]:
+        out = []
+        for service_id, history in self.services.items():
+            if ids and service_id not in ids:
+                continue
+            out.append(
+                {
+                    "id": service_id,
+                    "state": STATES[history.state] if history.state >= 0 else None,
+                    **history.query(start, end, bucket_s),
+                }
+            )
+        return out
+
+    # --- snapshot (mmap) ---
+
+    def _index(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "transitions": self.transitions_capacity,
+            "hours": self.hours,
+            "services": [
+                {
+                    "id": sid,
+                    "raw": [h.raw.head, h.raw.size],
+                    "transitions": [h.transitions.head, h.transitions.size],
+                    "state": h.state,
+                }
+                for sid, h in self.services.items()
+            ],
+        }
+
+    def _layout(self) -> tuple[bytes, list[bytes]]:
+        # Na pętli: indeks i kopie tablic z jednej chwili; record() w trakcie
+        # zapisu w wątku nie może przesunąć head ani dopisać wiersza do kopii
+        return json.dumps(self._index()).encode(), [
+            a.tobytes() for h in self.services.values() for a in h.arrays()
+        ]
+
+    def snapshot(self, path: str | Path) -> int:
+        """Write all arrays to the snapshot file (see write_snapshot)."""
+        return write_snapshot(path, *self._layout())
+
+    async def snapshot_async(self, path: str | Path) -> int:
+        """snapshot() with the file I/O in a thread; the layout is taken here."""
+        return await asyncio.to_thread(write_snapshot, path, *self._layout())
+
+    def load(self, path: str | Path) -> bool:
+        """Restore from a snapshot; False (and an empty store) if missing or unusable."""
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, index_len, crc = HEADER.unpack_from(mm)
+                body = mm[HEADER.size :]
+        except (FileNotFoundError, ValueError, struct.error):
+            return False
+        if magic != MAGIC or zlib.crc32(body) != crc:
+            logger.warning(f"History snapshot {path} is corrupt, starting empty")
+            return False
+        index = json.loads(body[:index_len])
+        if (index["capacity"], index["transitions"], index["hours"]) != (
+            self.capacity,
+            self.transitions_capacity,
+            self.hours,
+        ):
+            logger.warning(f"History snapshot {path} has a different layout, starting empty")
+            return False
+
+        services = {}
+        pos = index_len
+        for meta in index["services"]:
+            history = ServiceHistory(self.capacity, self.transitions_capacity, self.hours)
+            for a in history.arrays():
+                view = memoryview(a).cast("B")
+                view[:] = body[pos : pos + len(view)]
+                pos += len(view)
+            history.raw.head, history.raw.size = meta["raw"]
+            history.transitions.head, history.transitions.size = meta["transitions"]
+            history.state = meta["state"]
+            services[meta["id"]] = history
+        self.services = services
+        return True
+
+    def start_snapshots(self, path: str, interval_s: float) -> None:
+        async def run() -> None:
+            while True:
+                await asyncio.sleep(interval_s)
+                try:
+                    await self.snapshot_async(path)
+                except Exception as e:
+                    logger.error(f"History snapshot to {path} failed: {e}")
+
+        self._task = asyncio.create_task(run(), name="history-snapshots")
+
+    async def stop(self, path: str | None = None) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if path:
+            await self.snapshot_async(path)
+
+
+def write_snapshot(path: str | Path, index: bytes, arrays: list[bytes]) -> int:
+    """
+    Copy the array contents (taken on the loop, see HistoryStore._layout) into
+    a fresh mmap'ed temp file next to `path`, fsync it and rename it over
+    `path`: a crash or a second writer mid-snapshot never leaves a torn file,
+    readers see the old snapshot or the new one.
+    """
+    data_at = HEADER.size + len(index)
+    size = data_at + sum(map(len, arrays))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, size)
+        with mmap.mmap(fd, size) as mm:
+            crc = zlib.crc32(index)
+            pos = data_at
+            for data in arrays:
+                mm[pos : pos + len(data)] = data
+                crc = zlib.crc32(data, crc)
+                pos += len(data)
+            mm[HEADER.size : data_at] = index
+            mm[: HEADER.size] = HEADER.pack(MAGIC, len(index), crc)
+            mm.flush()
+        os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        tmp.unlink(missing_ok=True)
+        raise
+    os.close(fd)
+    os.replace(tmp, path)
+    return size
+
+
+def parse_duration(value: str) -> int:
+    """'90d', '24h', '15m', '30s' or plain seconds → seconds."""
+    units = {"s": 1, "m": 60, "h": HOUR, "d": 86400, "w": 7 * 86400}
+    value = value.strip().lower()
+    try:
+        if value and value[-1] in units:
+            return int(float(value[:-1]) * units[value[-1]])
+        return int(value)
+    except ValueError:
+        raise ValueError(f"invalid duration {value!r}") from None
+
+
+# Auto bucket: smallest "nice" width giving at most this many buckets
+NICE_BUCKETS = [60, 300, 900, HOUR, 6 * HOUR, 86400, 7 * 86400]
+AUTO_BUCKETS = 120
+MAX_BUCKETS = 5000
+
+store = HistoryStore.from_settings(config.settings)
@@ -0,0 +1,174 @@
+"""Durable ingestion queue for /hooks/* (202 Accepted + background workers)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.body import RequestBody
+from app.config import Settings
+from axv_gw.metrics import hooks_queue_depth, hooks_queue_events, hooks_queue_lag_seconds
+from axv_gw.segment_log import SegmentLog
+
+logger = logging.getLogger(__name__)
+
+HookHandler = Callable[[dict], Awaitable[Any]]
+# Called with (hook, raw body, request ID) once a handler succeeded, e.g. HookForwarder.submit
+OnHandled = Callable[[str, bytes, str], Any]
+
+
+class QueueFullError(Exception):
+    """Raised when the queue depth limit is reached; mapped to 503 by the route."""
+
+
+def encode_event(meta: dict, raw: bytes) -> bytes:
+    """Log record: compact JSON envelope, newline, original body bytes."""
+    return json.dumps(meta, separators=(",", ":")).encode() + b"\n" + raw
+
+
+def decode_event(payload: bytes) -> tuple[dict, bytes]:
+    head, _, raw = payload.partition(b"\n")
+    return json.loads(head), raw
+
+
+class HookQueue:
+    """
+    Verified hooks are appended to a SegmentLog (durable once the batched
+    fsync completes), acknowledged to the sender with 202 + event ID and
+    drained by a pool of workers into the hook handlers.
+
+    Delivery is at-least-once: a record is acked in the log only after its
+    handler returned (or failed `max_attempts` times); anything unacked is
+    redelivered after a restart.
+    """
+
+    def __init__(
+        self,
+        log: SegmentLog,
+        handlers: dict[str, HookHandler],
+        *,
+        workers: int = 4,
+        max_attempts: int = 5,
+        max_depth: int = 100_000,
+        retry_base_s: float = 0.5,
+        on_handled: OnHandled | None = None,
+    ):
+        self.log = log
+        self.handlers = handlers
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.max_depth = max_depth
+        self.retry_base_s = retry_base_s
+        self.on_handled = on_handled
+        self._queue: asyncio.Queue[tuple[int, dict, bytes]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        handlers: dict[str, HookHandler],
+        on_handled: OnHandled | None = None,
+    ) -> HookQueue:
+        log = SegmentLog(
+            settings.hooks_queue_dir,
+            segment_bytes=settings.hooks_queue_segment_mb * 1024 * 1024,
+            fsync_interval=settings.hooks_queue_fsync_interval_ms / 1000.0,
+            fsync_batch=settings.hooks_queue_fsync_batch,
+        )
+        return cls(
+            log,
+            handlers,
+            workers=settings.hooks_queue_workers,
+            max_attempts=settings.hooks_queue_max_attempts,
+            max_depth=settings.hooks_queue_max_depth,
+            on_handled=on_handled,
+        )
+
+    async def start(self) -> None:
+        recovered = self.log.open()
+        self.log.start()
+        for seq, payload in recovered:
+            meta, raw = decode_event(payload)
+            self._queue.put_nowait((seq, meta, raw))
+        if recovered:
+            logger.info(f"Recovered {len(recovered)} unhandled hook events from the log")
+            hooks_queue_events.labels(outcome="recovered").inc(len(recovered))
+        hooks_queue_depth.set(self.log.depth)
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"axv-gw-hook-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        # Nieukończone zdarzenia zostają w logu i wrócą po restarcie.
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.log.close()
+
+    async def enqueue(self, hook: str, raw: bytes, request_id: str = "") -> str:
+        """Durably append a verified hook event; returns its event ID."""
+        if self.log.depth >= self.max_depth:
+            hooks_queue_events.labels(outcome="rejected").inc()
+            raise QueueFullError(f"hook queue depth limit {self.max_depth} reached")
+
+        meta = {"id": uuid.uuid4().hex, "hook": hook, "ts": time.time(), "req_id": request_id}
+        # Kolejkowane zaraz po zapisie ramki: anulowane żądanie albo błąd fsync
+        # nie może zostawić rekordu w logu bez dostarczenia (zablokowany watermark).
+        await self.log.append(
+            encode_event(meta, raw), lambda seq: self._queue.put_nowait((seq, meta, raw))
+        )
+        hooks_queue_events.labels(outcome="accepted").inc()
+        hooks_queue_depth.set(self.log.depth)
+        return meta["id"]
+
+    async def _work(self) -> None:
+        while True:
+            seq, meta, raw = await self._queue.get()
+            try:
+                await self._handle(meta, raw)
+            finally:
+                self._queue.task_done()
+            # Not reached on cancellation: the event stays unacked and is redelivered.
+            self.log.ack(seq)
+            hooks_queue_depth.set(self.log.depth)
+
+    async def _handle(self, meta: dict, raw: bytes) -> None:
+        handler = self.handlers.get(meta["hook"])
+        if handler is None:
+            logger.error(f"No handler for hook {meta['hook']!r}, dropping event {meta['id']}")
+            hooks_queue_events.labels(outcome="unknown_hook").inc()
+            return
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await handler(RequestBody(raw).json_object())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    logger.error(
+                        f"Hook event {meta['id']} ({meta['hook']}) failed "
+                        f"after {attempt} attempts: {e}"
+                    )
+                    hooks_queue_events.labels(outcome="failed").inc()
+                    return
+                hooks_queue_events.labels(outcome="retried").inc()
+                await asyncio.sleep(self.retry_base_s * 2 ** (attempt - 1))
+                continue
+            hooks_queue_lag_seconds.observe(max(time.time() - meta["ts"], 0.0))
+            hooks_queue_events.labels(outcome="handled").inc()
+            if self.on_handled is not None:
+                self.on_handled(meta["hook"], raw, meta.get("req_id", ""))
+            return
+
+    async def join(self) -> None:
+        """Wait until every queued event has been handled (tests, graceful drain)."""
+        await self._queue.join()
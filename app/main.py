@@ -1,31 +1,127 @@
 import logging
 import sys
 
+from axv_gw.middleware.admission import AdmissionControlMiddleware
+from axv_gw.middleware.fast_lane import FastLaneMiddleware
 from axv_gw.middleware.hmac_ts import HMACTimeSkewMiddleware
 from axv_gw.middleware.hooks_metrics import HookMetricsMiddleware
 from axv_gw.middleware.rate_limit import RateLimitMiddleware
+from axv_gw.middleware.response_cache import ResponseCacheMiddleware
 from axv_gw.middleware.size_guard import RequestSizeGuardMiddleware
 
 logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
 import os
 import time
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from app import config, history, startup
 from app.middleware import RequestLoggingMiddleware
+from app.probes import Probes
+from app.responses import FastJSONResponse
 from app.routers import front, hooks, internal
-
-app = FastAPI(title="AXV Gateway", version=os.getenv("GATEWAY_VERSION", "dev"))
+from axv_gw.loop_monitor import LoopMonitor
+from axv_gw.runtime_config import ConfigWatcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    monitor = LoopMonitor()
+    await monitor.start()
+    app.state.loop_monitor = monitor
+
+    # RUNTIME_CONFIG_FILE: reload on SIGHUP / file change, no restart needed
+    watcher = ConfigWatcher()
+    await watcher.start()
+
+    # Optional components are imported only when enabled
+    forwarder = None
+    if config.settings.hooks_forward:
+        from app.forwarder import HookForwarder
+
+        forwarder = HookForwarder.from_settings(config.settings)
+        forwarder.start()
+    app.state.forwarder = forwarder
+
+    hook_queue = None
+    if config.settings.hooks_ingest_mode == "queue":
+        from app.ingest import HookQueue
+
+        on_handled = forwarder.submit if forwarder is not None else None
+        hook_queue = HookQueue.from_settings(config.settings, hooks.HOOK_HANDLERS, on_handled)
+        await hook_queue.start()
+    app.state.hook_queue = hook_queue
+
+    # Status history survives restarts through its snapshot file
+    history_path = config.settings.history_path
+    if history_path:
+        history.store.load(history_path)
+        history.store.start_snapshots(history_path, config.settings.history_snapshot_s)
+
+    # Warm caches before uvicorn starts accepting connections
+    t0 = time.perf_counter()
+    if config.settings.prewarm:
+        await startup.prewarm(app)
+    prewarm_s = time.perf_counter() - t0
+    app.state.startup = startup.report(IMPORTED_AT, time.perf_counter(), prewarm_s)
+    app.state.accepting = True
+    try:
+        yield
+    finally:
+        # /readyz → 503 while draining
+        app.state.accepting = False
+        if hook_queue is not None:
+            await hook_queue.stop()
+        if forwarder is not None:
+            await forwarder.stop()
+        if app.state.proxy_pool is not None:
+            await app.state.proxy_pool.aclose()
+        await front.aclose()
+        if history_path:
+            await history.store.stop(history_path)
+        await watcher.stop()
+        await monitor.stop()
+
+
+# OpenAPI schema is generated lazily on first /openapi.json hit;
+# AXV_GW_DOCS_ENABLED=false drops the docs routes altogether.
+_docs = (
+    {}
+    if config.settings.docs_enabled
+    else {"openapi_url": None, "docs_url": None, "redoc_url": None}
+)
+
+app = FastAPI(
+    title="AXV Gateway",
+    version=os.getenv("GATEWAY_VERSION", "dev"),
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if config.settings.fast_json else JSONResponse,
+    **_docs,
+)
 app.state.started_at = time.time()
+app.state.accepting = False
+probes = Probes(app)
 
 
-# --- middleware order (outermost → innermost) ---
+# --- middleware order (innermost → outermost: add_middleware wraps what is
+# already there, so the last one added sees the request first) ---
+# Response cache (RESPONSE_CACHE_ROUTES) is opt-in; inside request logging, so
+# hits are still logged, rate limited and get their own X-Request-ID
+if os.getenv("RESPONSE_CACHE_ROUTES"):
+    app.add_middleware(ResponseCacheMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(RateLimitMiddleware)
 app.add_middleware(HMACTimeSkewMiddleware)
 app.add_middleware(RequestSizeGuardMiddleware)
 app.add_middleware(HookMetricsMiddleware)
+# Sheds overload before any other stage does work
+app.add_middleware(AdmissionControlMiddleware)
+# Outermost: probes, /status and HEAD /metrics answered from precomputed bytes
+# (FAST_LANE=0 → the routes below serve them through the full stack)
+app.add_middleware(FastLaneMiddleware, routes=probes.routes())
 
 # Add request logging middleware
 
@@ -35,6 +131,12 @@ def healthz():
     return {"ok": True}
 
 
+@app.get("/readyz")
+def readyz():
+    ready = probes.ready()
+    return Response(ready.body, status_code=ready.status, media_type="application/json")
+
+
 @app.get("/status")
 def status(request: Request):
     request_id = getattr(request.state, "request_id", "unknown")
@@ -56,9 +158,18 @@ def metrics():
 
 # Routers
 app.include_router(hooks.router)
+app.include_router(hooks.batch_router)
 app.include_router(internal.router)
 app.include_router(front.router)
 
+# Reverse proxy (AXV_GW_PROXY_ROUTES): routes are fixed at startup
+app.state.proxy_pool = None
+if config.settings.proxy_routes:
+    from app.routers import proxy
+
+    app.state.proxy_pool = proxy.ProxyPool.from_settings(config.settings)
+    app.include_router(proxy.build_router(app.state.proxy_pool))
+
 
 # HEAD /metrics (bez body; te same nagłówki co GET)
 @app.head("/metrics")
@@ -69,3 +180,6 @@ def metrics_head():
 def create_app():
     """Factory for tests — returns the already-configured FastAPI app."""
     return app
+
+
+IMPORTED_AT = time.perf_counter()
@@ -9,10 +9,20 @@ from collections.abc import Callable
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app import config
+from app.body import attach_body
+from app.capture import TrafficRecorder
+from axv_gw.metrics import inflight_requests
+
 logger = logging.getLogger(__name__)
 
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, recorder: TrafficRecorder | None = None):
+        super().__init__(app)
+        # Capture mode: AXV_GW_CAPTURE_PATH (+ _SAMPLE_RATE, _BODIES)
+        self.recorder = recorder or TrafficRecorder.from_settings(config.settings)
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # Generate or extract request ID
         request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
@@ -21,7 +31,15 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         # Start timer
         start_time = time.time()
 
+        capture = self.recorder is not None and self.recorder.should_sample()
+        body = b""
+        if capture and request.method in ("POST", "PUT", "PATCH"):
+            # Shared with hmac_verify/handlers through request.state.body
+            body = await request.body()
+            attach_body(request, body)
+
         status = 500
+        inflight_requests.inc()
         try:
             response = await call_next(request)
             status = response.status_code
@@ -29,6 +47,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             logger.exception("Request failed: %s", exc)
             raise
         finally:
+            inflight_requests.dec()
             # Calculate duration
             duration_ms = int((time.time() - start_time) * 1000)
             # Resolve client IP (prefer X-Forwarded-For)
@@ -51,6 +70,17 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 "client_ip": client_ip,
             }
             logger.info(json.dumps(log_data))
+            if capture:
+                self.recorder.record(
+                    t=start_time,
+                    method=request.method,
+                    path=request.url.path,
+                    query=request.url.query,
+                    headers=dict(request.headers),
+                    body=body,
+                    status=status,
+                    duration_ms=(time.time() - start_time) * 1000,
+                )
 
         # Add request ID to response headers
         response.headers["X-Request-ID"] = request_id
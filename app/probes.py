@@ -0,0 +1,96 @@
+"""Liveness/readiness probes and /status, served by the fast lane from bytes."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+
+from fastapi import FastAPI
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app import config
+from app.routers import front
+from axv_gw.middleware.fast_lane import Handler, Precomputed
+
+LIVE = Precomputed.json(b'{"ok":true}')
+METRICS_HEAD = Precomputed(200, ((b"content-type", CONTENT_TYPE_LATEST.encode()),))
+
+
+def _paths(key: str, default: str) -> list[str]:
+    return [p.strip() for p in os.getenv(key, default).split(",") if p.strip()]
+
+
+class Probes:
+    """
+    Readiness reflects real state: the lifespan finished (and has not begun
+    shutting down), the front-status cache holds a document when prewarm is
+    on, and the hook queue (queue mode) is below its depth limit. Bodies are
+    encoded once per distinct check result; /status once per second.
+    """
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self._ready: dict[tuple, Precomputed] = {}
+        self._status_second = -1
+        self._status_prefix = b""
+
+    def checks(self) -> dict[str, bool]:
+        state = self.app.state
+        checks = {"started": getattr(state, "accepting", False)}
+        # Bez prewarmu cache grzeje pierwsze /front/status — nie blokujemy ruchu
+        if config.settings.prewarm:
+            checks["front_status"] = front.is_warm()
+        queue = getattr(state, "hook_queue", None)
+        if queue is not None:
+            checks["hooks_queue"] = queue.log.depth < queue.max_depth
+        return checks
+
+    def ready(self, scope: dict | None = None) -> Precomputed:
+        checks = self.checks()
+        key = tuple(checks.items())
+        response = self._ready.get(key)
+        if response is None:
+            ok = all(checks.values())
+            body = json.dumps({"ok": ok, "checks": checks}, separators=(",", ":")).encode()
+            response = self._ready[key] = Precomputed.json(body, 200 if ok else 503)
+        return response
+
+    def status(self, scope: dict) -> Precomputed:
+        now = int(time.time())
+        if now != self._status_second:
+            # Same fields and order as the /status route
+            fields = {
+                "now": now,
+                "ok": True,
+                "service": "axv-gw",
+                "version": os.getenv("GATEWAY_VERSION", "dev"),
+                "uptime_s": int(now - self.app.state.started_at),
+            }
+            self._status_prefix = json.dumps(fields, separators=(",", ":")).encode()[:-1]
+            self._status_second = now
+        request_id = _header(scope, b"x-request-id") or str(uuid.uuid4())
+        body = b'%s,"request_id":%s}' % (self._status_prefix, json.dumps(request_id).encode())
+        return Precomputed.json(body, headers=((b"x-request-id", request_id.encode("latin-1")),))
+
+    def routes(self) -> dict[tuple[str, str], Handler]:
+        """
+        PROBE_LIVENESS_PATHS (default /healthz), PROBE_READINESS_PATHS
+        (default /readyz), plus GET /status and HEAD /metrics.
+        """
+        routes: dict[tuple[str, str], Handler] = {}
+        for path in _paths("PROBE_LIVENESS_PATHS", "/healthz"):
+            routes["GET", path] = lambda scope: LIVE
+        for path in _paths("PROBE_READINESS_PATHS", "/readyz"):
+            routes["GET", path] = self.ready
+        routes["GET", "/status"] = self.status
+        routes["HEAD", "/metrics"] = lambda scope: METRICS_HEAD
+        return routes
+
+
+def _header(scope: dict, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
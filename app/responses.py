@@ -0,0 +1,63 @@
+"""Fast JSON response path (orjson when installed, no response_model re-validation)."""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app import config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency (pip install .[fast])
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode JSON exactly like Starlette's JSONResponse (compact, UTF-8).
+
+    Uses orjson when available; falls back to the stdlib encoder with the
+    same separators and ensure_ascii=False so output bytes match. Content
+    orjson rejects but the stdlib accepts (non-str dict keys, integers above
+    64 bits) goes through the fallback too.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(content)
+        except TypeError:  # orjson.JSONEncodeError
+            pass
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class of the gateway when AXV_GW_FAST_JSON is on."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def encode_model(model: BaseModel) -> bytes:
+    """Serialise a model straight to bytes using its aliases (API field names)."""
+    return model.model_dump_json(by_alias=True).encode("utf-8")
+
+
+def json_bytes_response(body: bytes, status_code: int = 200) -> Response:
+    """Response for an already-encoded JSON body."""
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response | BaseModel:
+    """
+    Return a trusted, already-valid model from a handler.
+
+    In fast mode the model is serialised directly to bytes and returned as a
+    Response, so FastAPI skips jsonable_encoder and the response_model
+    re-validation. Otherwise the model is returned for the default path.
+    """
+    if not config.settings.fast_json:
+        return model
+    return json_bytes_response(encode_model(model), status_code)
@@ -1,15 +1,21 @@
 """Frontend status endpoint with caching and fallback."""
 
+import asyncio
 import json
 import logging
-from datetime import UTC, datetime
+import math
+import time
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException
+import httpx
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
 from prometheus_client import Counter, Gauge, Histogram
 
-from app.config import settings
+from app import config, history
+from app.responses import dumps, encode_model, json_bytes_response
 from app.schemas.status import FrontStatusV1, ServiceState
+from app.status_registry import STALE_RETRY_S, StatusRegistry, UnknownDocumentError
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/front")
@@ -27,13 +33,29 @@ cache_hits = Counter(
 cache_misses = Counter(
     "axv_gw_front_status_cache_misses_total", "Cache misses for status data"
 )
+stale_served = Counter(
+    "axv_gw_front_status_stale_total",
+    "Responses served from the stale cache (failed load or refresh in flight)",
+)
 degraded_mode = Gauge(
     "axv_gw_front_status_degraded", "Whether service is in degraded mode (1=yes, 0=no)"
 )
 
+# Keyed documents (site × locale); the default document keeps the cache below
+registry = StatusRegistry.from_settings(config.settings)
+VARY = "X-AXV-Site, X-AXV-Locale, Accept-Language"
+
 # In-memory cache
 _cache: dict | None = None
 _cache_timestamp: datetime | None = None
+# Pre-encoded FrontStatusV1 JSON for _cache (served as-is in fast JSON mode)
+_cache_body: bytes | None = None
+# _cache is a stale fallback kept alive until the next reload attempt
+_stale = False
+
+# Upstream source (AXV_GW_FRONT_STATUS_URL): one pooled client, one fetch at a time
+_client: httpx.AsyncClient | None = None
+_inflight: asyncio.Task | None = None
 
 
 def _load_stub() -> dict:
@@ -46,7 +68,7 @@ def _load_stub() -> dict:
     Raises:
         HTTPException: If stub file cannot be loaded.
     """
-    stub_path = Path(settings.stub_path)
+    stub_path = Path(config.settings.stub_path)
 
     try:
         with open(stub_path, encoding="utf-8") as f:
@@ -61,6 +83,85 @@ def _load_stub() -> dict:
         raise HTTPException(status_code=500, detail=f"Invalid JSON in stub file: {e}")
 
 
+def _upstream_error(url: str, e: Exception) -> HTTPException:
+    logger.error(f"Status upstream {url} failed: {e!r}")
+    return HTTPException(status_code=502, detail=f"Status upstream unavailable: {url}")
+
+
+def _retryable(e: Exception) -> bool:
+    """Transport errors, timeouts and 5xx; a 4xx or a bad document won't improve."""
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code >= 500
+    return isinstance(e, httpx.TransportError | TimeoutError)
+
+
+def _load_upstream_sync(url: str) -> dict:
+    """
+    Blocking variant of _fetch_upstream for the pre-warm thread: the same
+    request, retries and total deadline, on the thread's own loop and client.
+    """
+
+    async def fetch() -> dict:
+        async with _new_client() as client:
+            return await _get_upstream(url, client)
+
+    return asyncio.run(fetch())
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(headers={"Accept": "application/json"})
+
+
+async def _get_upstream(url: str, client: httpx.AsyncClient) -> dict:
+    settings = config.settings
+    for attempt in range(settings.request_max_retries + 1):
+        try:
+            # Limit na całość (także wolne body), nie na pojedynczy odczyt
+            async with asyncio.timeout(settings.request_timeout_seconds):
+                response = await client.get(url)
+                response.raise_for_status()
+                return response.json()
+        except Exception as e:
+            if attempt == settings.request_max_retries or not _retryable(e):
+                raise _upstream_error(url, e) from e
+
+
+async def _fetch_upstream(url: str) -> dict:
+    """GET the upstream document; concurrent cache misses share one request."""
+    global _client, _inflight
+
+    if _client is None:
+        _client = _new_client()
+    if _inflight is None:
+        _inflight = asyncio.create_task(_get_upstream(url, _client))
+        _inflight.add_done_callback(_fetch_done)
+    # shield: anulowany klient nie przerywa pobierania dla pozostałych
+    return await asyncio.shield(_inflight)
+
+
+def _fetch_done(task: asyncio.Task) -> None:
+    global _inflight
+
+    _inflight = None
+    if not task.cancelled():
+        task.exception()  # odebrany, nawet gdy nikt już nie czeka
+
+
+async def aclose() -> None:
+    """Close the upstream client (lifespan shutdown)."""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _load() -> dict:
+    """The default document from its configured source (blocking)."""
+    url = config.settings.front_status_url
+    return _load_upstream_sync(url) if url else _load_stub()
+
+
 def _is_cache_valid() -> bool:
     """Check if cached data is still valid based on TTL."""
     if _cache is None or _cache_timestamp is None:
@@ -69,7 +170,7 @@ def _is_cache_valid() -> bool:
     now = datetime.now(UTC)
     age_seconds = (now - _cache_timestamp).total_seconds()
 
-    return age_seconds < settings.cache_ttl_seconds
+    return age_seconds < config.settings.cache_ttl_seconds
 
 
 def _apply_degraded_mode(data: dict) -> dict:
@@ -96,66 +197,259 @@ def _apply_degraded_mode(data: dict) -> dict:
     return data
 
 
+def _store(data: dict) -> None:
+    """Validate `data` once, then cache it together with its encoded body."""
+    global _cache, _cache_timestamp, _cache_body, _stale
+
+    model = FrontStatusV1(**(data or {}))
+    _cache_body = encode_model(model)
+    _cache = data
+    _cache_timestamp = datetime.now(UTC)
+    _stale = False
+
+
+def _keep_stale() -> None:
+    """
+    Keep serving the stale document as a cache hit for a few seconds, so a
+    failing source is retried once per interval, not by every request.
+    """
+    global _cache_timestamp, _stale
+
+    ttl = config.settings.cache_ttl_seconds
+    retry_in = min(ttl, STALE_RETRY_S)
+    _cache_timestamp = datetime.now(UTC) - timedelta(seconds=ttl - retry_in)
+    _stale = True
+
+
+def _cached_response() -> Response | FrontStatusV1:
+    """Serve the cached document, from pre-encoded bytes in fast JSON mode."""
+    if not config.settings.fast_json:
+        return FrontStatusV1(**(_cache or {}))
+    body = _cache_body
+    if body is None:
+        body = encode_model(FrontStatusV1(**(_cache or {})))
+    return json_bytes_response(body)
+
+
+def warm_cache() -> bool:
+    """
+    Fill the status cache before the worker accepts traffic.
+
+    Runs the same load + validation as a cache miss, so the first request is
+    served from memory. Failures are logged and left to the request path.
+
+    Returns:
+        True if the cache is warm.
+    """
+    try:
+        t0 = time.perf_counter()
+        data = _load()
+        _store(data)
+    except Exception as e:
+        logger.error(f"Status cache pre-warm failed: {e}")
+        return False
+    history.store.record(data, time.perf_counter() - t0)
+
+    _apply_degraded_mode(data)
+    return True
+
+
+def is_warm() -> bool:
+    """True once a document can be served (fresh or as the stale fallback)."""
+    return _cache is not None
+
+
+@config.on_change
+def _on_settings_change(old: config.Settings, new: config.Settings) -> None:
+    """
+    Runtime reload: a new TTL applies on the next read as-is. A new stub path
+    or upstream URL expires the cache, keeping the old document as the stale
+    fallback.
+    """
+    global _cache_timestamp
+
+    if old.stub_path != new.stub_path or old.front_status_url != new.front_status_url:
+        logger.info("Status source changed, expiring status cache")
+        _cache_timestamp = None
+
+
+def _requested_locale(query: str | None, header: str | None, accept: str | None) -> str | None:
+    """?locale= → X-AXV-Locale → first Accept-Language tag."""
+    if query or header:
+        return query or header
+    if accept:
+        return accept.split(",")[0].split(";")[0].strip() or None
+    return None
+
+
+async def _site_response(site: str, locale: str | None) -> Response:
+    try:
+        entry = await registry.get(site, locale, config.settings.cache_ttl_seconds)
+    except UnknownDocumentError:
+        status_requests.labels(status_code="404").inc()
+        raise HTTPException(status_code=404, detail=f"No status document for site {site!r}")
+    except Exception:
+        status_requests.labels(status_code="500").inc()
+        raise HTTPException(status_code=500, detail=f"Status document for {site!r} unavailable")
+    status_requests.labels(status_code="200").inc()
+    response = json_bytes_response(entry.body)
+    response.headers["Content-Language"] = entry.locale
+    response.headers["Vary"] = VARY
+    return response
+
+
+@router.get("/sites/{site}/status", response_model=FrontStatusV1)
+async def get_site_status(
+    site: str,
+    locale: str | None = Query(None, description="e.g. pl, en-gb (default: headers)"),
+    x_axv_locale: str | None = Header(None),
+    accept_language: str | None = Header(None),
+) -> Response:
+    """
+    Status document of one site in the requested locale.
+
+    Locale falls back to the language, then AXV_GW_FRONT_DEFAULT_LOCALE;
+    the chosen one is returned in Content-Language.
+    """
+    return await _site_response(site, _requested_locale(locale, x_axv_locale, accept_language))
+
+
 @router.get("/status", response_model=FrontStatusV1)
-async def get_front_status() -> FrontStatusV1:
+async def get_front_status(request: Request, response: Response) -> Response | FrontStatusV1:
     """
     Get current frontend status.
 
+    With an X-AXV-Site header (and AXV_GW_FRONT_SITES_DIR set) the keyed
+    document of that site is served instead, like /front/sites/{site}/status.
+
     Data flow:
     1. Check cache (TTL-based)
-    2. If cache miss, load from stub
+    2. If cache miss, load from stub (or AXV_GW_FRONT_STATUS_URL)
     3. Apply degraded mode check
     4. Return validated response
 
+    The document is validated once per cache fill; in fast JSON mode every
+    response is the pre-encoded body, with no response_model re-validation.
+
     Fallback strategy:
-    - On any error loading stub, return cached data if available
-    - If no cache available, raise 500 error
+    - On any error loading, return cached data if available and retry the
+      source after a few seconds (counted in axv_gw_front_status_stale_total)
+    - While an upstream fetch is in flight, other misses get the cached data
+    - If no cache available, raise 500 error (502 for the upstream)
 
     Returns:
         Frontend status following FrontStatusV1 contract
     """
-    global _cache, _cache_timestamp
-
+    # Plain header reads: Header() params would add dependency resolution to
+    # every default-document request
+    if not registry.enabled:
+        return await _default_status()
+    if site := request.headers.get("x-axv-site"):
+        headers = request.headers
+        locale = _requested_locale(
+            None, headers.get("x-axv-locale"), headers.get("accept-language")
+        )
+        return await _site_response(site, locale)
+
+    # Ta sama ścieżka serwuje też dokumenty site'ów: cache odpowiedzi uczy się
+    # Vary z ostatniej odpowiedzi, więc dokument domyślny też musi go nieść
+    result = await _default_status()
+    (result if isinstance(result, Response) else response).headers["Vary"] = VARY
+    return result
+
+
+async def _default_status() -> Response | FrontStatusV1:
     with status_fetch_duration.time():
         # Check cache first
         if _is_cache_valid():
             cache_hits.inc()
+            if _stale:
+                stale_served.inc()
             logger.debug("Cache hit - returning cached status")
             status_requests.labels(status_code="200").inc()
-            return FrontStatusV1(**(_cache or {}))
+            return _cached_response()
 
         cache_misses.inc()
         logger.debug("Cache miss - fetching fresh data")
 
-        # Try to load fresh data from stub
+        # Refresh from the upstream already underway: only its caller waits
+        if _inflight is not None and _cache is not None:
+            stale_served.inc()
+            status_requests.labels(status_code="200").inc()
+            return _cached_response()
+
+        # Try to load fresh data from stub or upstream
         try:
-            data = _load_stub()
+            t0 = time.perf_counter()
+            url = config.settings.front_status_url
+            data = await _fetch_upstream(url) if url else _load_stub()
 
-            # Update cache
-            _cache = data
-            _cache_timestamp = datetime.now(UTC)
+            # Validate and update cache
+            _store(data)
+            history.store.record(data, time.perf_counter() - t0)
 
             # Apply degraded mode check
             _apply_degraded_mode(data)
 
-            # Validate and return
-            response = FrontStatusV1(**(data or {}))
             status_requests.labels(status_code="200").inc()
             logger.info("Successfully loaded and cached status data")
 
-            return response
+            return _cached_response()
 
         except Exception as e:
-            logger.error(f"Error loading stub: {e}")
+            logger.error(f"Error loading status: {e}")
 
             # Fallback to stale cache if available
             if _cache is not None:
                 logger.warning("Falling back to stale cache due to error")
                 degraded_mode.set(1)
+                stale_served.inc()
+                _keep_stale()
                 status_requests.labels(status_code="200").inc()
-                return FrontStatusV1(**(_cache or {}))
+                return _cached_response()
 
             # No cache available - fail
             logger.error("No cache available for fallback")
             status_requests.labels(status_code="500").inc()
             raise
+
+
+@router.get("/status/history")
+async def get_status_history(
+    window: str = Query("24h", alias="range", description="e.g. 1h, 24h, 7d, 90d"),
+    bucket: str | None = Query(None, description="bucket width, e.g. 5m, 1h, 1d (auto)"),
+    service: list[str] | None = Query(None, description="service id(s), default all"),
+) -> Response:
+    """
+    Per-service state counts, uptime and latency per time bucket.
+
+    Buckets are aligned to multiples of their width (UTC); hour-multiple
+    widths are served from hourly rollups, shorter ones from raw samples.
+    Each list has one value per bucket starting at `from`; `transitions`
+    holds the state in effect at `from` followed by every change.
+    """
+    try:
+        window_s = history.parse_duration(window)
+        bucket_s = history.parse_duration(bucket) if bucket else None
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if bucket_s is None:
+        bucket_s = next(
+            (b for b in history.NICE_BUCKETS if window_s / b <= history.AUTO_BUCKETS),
+            history.NICE_BUCKETS[-1],
+        )
+    if window_s <= 0 or bucket_s <= 0 or window_s / bucket_s > history.MAX_BUCKETS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"range/bucket must be positive, at most {history.MAX_BUCKETS} buckets",
+        )
+
+    end = time.time()
+    start = math.floor((end - window_s) / bucket_s) * bucket_s
+    payload = {
+        "from": start,
+        "to": end,
+        "bucket_s": bucket_s,
+        "services": history.store.query(start, end, bucket_s, service),
+    }
+    return json_bytes_response(dumps(payload))
@@ -1,10 +1,186 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
 
-from app.security import hmac_verify
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from app import config
+from app.batch import BatchEvent, BatchFormatError, BatchParser, BatchTooLargeError
+from app.body import JSON_OBJECT_BODY, RequestBody, iter_body, request_body
+from app.responses import dumps, json_bytes_response
+from app.security import check_signature, hmac_verify, signature_context
+from axv_gw import runtime_config
+from axv_gw.metrics import hooks_batch_events
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/hooks", dependencies=[Depends(hmac_verify)])
+# /hooks/batch weryfikuje podpis sam, w trakcie streamingu body
+batch_router = APIRouter(prefix="/hooks")
+
+# Hook name -> handler(payload). Used inline by the routes and by the
+# ingestion queue workers (AXV_GW_HOOKS_INGEST_MODE=queue).
+HOOK_HANDLERS: dict[str, Callable[[dict], Awaitable[Any]]] = {}
+
+
+def hook_handler(name: str):
+    """Register a hook handler under `name`."""
+
+    def register(fn):
+        HOOK_HANDLERS[name] = fn
+        return fn
+
+    return register
+
+
+def forward_hook(request: Request, name: str, raw: bytes) -> None:
+    """Hand a handled hook to the forwarder (AXV_GW_HOOKS_FORWARD), if running."""
+    forwarder = getattr(request.app.state, "forwarder", None)
+    if forwarder is not None:
+        forwarder.submit(name, raw, getattr(request.state, "request_id", ""))
+
+
+async def enqueue_hook(request: Request, name: str, body: RequestBody):
+    """
+    Queue mode: durably append the verified event and answer 202 right away.
+
+    Returns:
+        202 JSON {"ok": true, "event_id": ...}
+    """
+    from app.ingest import QueueFullError
+
+    queue = getattr(request.app.state, "hook_queue", None)
+    if queue is None:
+        raise HTTPException(status_code=503, detail="hook queue not running")
+    request_id = getattr(request.state, "request_id", "")
+    try:
+        event_id = await queue.enqueue(name, body.raw, request_id)
+    except QueueFullError:
+        raise HTTPException(status_code=503, detail="hook queue full")
+    except OSError:
+        raise HTTPException(status_code=503, detail="hook queue write failed")
+    return json_bytes_response(dumps({"ok": True, "event_id": event_id}), status_code=202)
+
+
+@hook_handler("ping")
+async def handle_ping(payload: dict) -> dict:
+    return payload
+
+
+@router.post("/ping", openapi_extra=JSON_OBJECT_BODY)
+async def hooks_ping(request: Request, body: RequestBody = Depends(request_body)):
+    # Walidujemy (obiekt JSON, 422 jak dotąd) przed przyjęciem zdarzenia.
+    payload = body.json_object()
+    if config.settings.hooks_ingest_mode == "queue":
+        return await enqueue_hook(request, "ping", body)
+
+    await handle_ping(payload)
+    forward_hook(request, "ping", body.raw)
+    # Payload jest tylko echem: oddajemy oryginalne bajty bez ponownej serializacji.
+    return json_bytes_response(b'{"ok":true,"data":' + body.raw + b"}")
+
+
+BATCH_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/x-ndjson": {"schema": {"type": "string"}},
+            "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+        },
+    }
+}
+
+
+def _error(status_code: int, error: str, **extra) -> Response:
+    return json_bytes_response(dumps({"ok": False, "error": error, **extra}), status_code)
+
+
+async def _dispatch_event(request: Request, ev: BatchEvent, queue) -> dict:
+    result: dict = {"index": ev.index, "id": ev.id}
+    if ev.error is None and ev.hook not in HOOK_HANDLERS:
+        ev.error = (404, "unknown hook")
+    if ev.error is not None:
+        status, msg = ev.error
+        return result | {"ok": False, "status": status, "error": msg}
+
+    if queue is not None:
+        from app.ingest import QueueFullError
+
+        request_id = getattr(request.state, "request_id", "")
+        try:
+            event_id = await queue.enqueue(ev.hook, dumps(ev.payload), request_id)
+        except (QueueFullError, OSError):
+            return result | {"ok": False, "status": 503, "error": "hook queue unavailable"}
+        return result | {"ok": True, "status": 202, "event_id": event_id}
+
+    try:
+        await HOOK_HANDLERS[ev.hook](ev.payload)
+    except Exception as e:
+        logger.error(f"Batch event {ev.index} ({ev.hook}) failed: {e}")
+        return result | {"ok": False, "status": 500, "error": "handler failed"}
+    forward_hook(request, ev.hook, dumps(ev.payload))
+    return result | {"ok": True, "status": 200}
+
+
+@batch_router.post("/batch", openapi_extra=BATCH_BODY)
+async def hooks_batch(request: Request):
+    """
+    Many events in one signed envelope: NDJSON (one event per line) or a
+    JSON array of {"hook", "id", "payload"} objects.
+
+    The body is streamed once through the HMAC and the incremental parser;
+    events are dispatched only after the signature checks out, and parse
+    errors are reported only after it too. Rate limiting charges one unit per
+    event (RATE_LIMIT_HOOK_EVENTS), at least one per request; a batch larger
+    than that limit could never pass, so it is rejected with 413 like one
+    above hooks_batch_max_events. Per-event results are returned in order;
+    one bad event does not fail the batch.
+    """
+    sig, mac = signature_context(request)
+    limit_kb = runtime_config.env_int("MAX_BATCH_BODY_KB", 1024)
+    limiter = getattr(request.state, "rate_limiter", None)
+    max_events = config.settings.hooks_batch_max_events
+    if limiter is not None:
+        max_events = min(max_events, limiter.limit_for(request.url.path))
+    parser = BatchParser(max_events, request.headers.get("content-type", ""))
+
+    size = 0
+    parse_error: Exception | None = None
+    try:
+        async for chunk in iter_body(request):
+            size += len(chunk)
+            if size > limit_kb * 1024:
+                return _error(413, "body_too_large", limit_kb=limit_kb)
+            mac.update(chunk)
+            if parse_error is None:
+                try:
+                    parser.feed(chunk)
+                except (BatchTooLargeError, BatchFormatError) as e:
+                    parse_error = e  # bez podpisu klient nie dostaje szczegółów
+        check_signature(sig, mac)
+        if parse_error is not None:
+            raise parse_error
+        events = parser.close()
+    except BatchTooLargeError:
+        return _error(413, "too_many_events", limit=max_events)
+    except BatchFormatError as e:
+        return _error(400, "bad_batch", detail=str(e))
+
+    if limiter is not None and len(events) > 1:
+        rejected = await limiter.consume(request, len(events) - 1)
+        if rejected is not None:
+            return rejected
 
+    queue = None
+    if config.settings.hooks_ingest_mode == "queue":
+        queue = getattr(request.app.state, "hook_queue", None)
+        if queue is None:
+            raise HTTPException(status_code=503, detail="hook queue not running")
 
-@router.post("/ping")
-async def hooks_ping(payload: dict):
-    return {"ok": True, "data": payload}
+    results = await asyncio.gather(*(_dispatch_event(request, ev, queue) for ev in events))
+    for r in results:
+        hooks_batch_events.labels(status=str(r["status"])).inc()
+    return json_bytes_response(
+        dumps({"ok": all(r["ok"] for r in results), "count": len(results), "results": results})
+    )
@@ -7,6 +7,8 @@ from typing import Any
 from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
 
+from app.responses import model_response
+
 router = APIRouter(prefix="/internal", tags=["internal"])
 
 
@@ -38,4 +40,4 @@ async def hmac_sign(
 
     msg = f"{req.ts}.{body_s}".encode()
     sig = hmac.new(secret, msg, hashlib.sha256).hexdigest()
-    return HMACSignResponse(signature=f"sha256={sig}")
+    return model_response(HMACSignResponse(signature=f"sha256={sig}"))
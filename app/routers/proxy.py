@@ -0,0 +1,224 @@
+"""Streaming reverse proxy for configured path prefixes (AXV_GW_PROXY_ROUTES)."""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+
+import httpx
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.body import iter_body
+from app.config import Settings
+from app.responses import dumps, json_bytes_response
+from axv_gw.metrics import proxy_requests, proxy_upstream_seconds
+
+logger = logging.getLogger(__name__)
+
+METHODS = ["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+
+# RFC 9110 §7.6.1 — nagłówki jednego połączenia, nie przechodzą przez proxy
+HOP_BY_HOP = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "proxy-connection",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+# Set by the proxy itself
+REQUEST_OVERRIDES = frozenset({"host", "x-request-id", "x-forwarded-proto", "x-forwarded-host"})
+
+
+@dataclass(frozen=True)
+class Upstream:
+    """One proxied prefix, e.g. "/axv" → http://axv-api:8001."""
+
+    prefix: str
+    url: str
+    timeout_s: float = 10.0
+    connect_timeout_s: float = 2.0
+    max_connections: int = 100
+    strip_prefix: bool = False
+
+
+def parse_upstreams(settings: Settings) -> list[Upstream]:
+    """
+    AXV_GW_PROXY_ROUTES: {"<prefix>": "<url>"} or {"<prefix>": {"url": ...,
+    "timeout_s": ..., "connect_timeout_s": ..., "max_connections": ...,
+    "strip_prefix": ...}}; missing values come from AXV_GW_PROXY_* defaults.
+    """
+    upstreams = []
+    for prefix, spec in settings.proxy_routes.items():
+        if isinstance(spec, str):
+            spec = {"url": spec}
+        upstreams.append(
+            Upstream(
+                prefix="/" + prefix.strip("/"),
+                url=spec["url"].rstrip("/"),
+                timeout_s=float(spec.get("timeout_s", settings.proxy_timeout_s)),
+                connect_timeout_s=float(
+                    spec.get("connect_timeout_s", settings.proxy_connect_timeout_s)
+                ),
+                max_connections=int(spec.get("max_connections", settings.proxy_max_connections)),
+                strip_prefix=bool(spec.get("strip_prefix", False)),
+            )
+        )
+    # Najdłuższy prefiks pierwszy ("/axv/admin" przed "/axv")
+    return sorted(upstreams, key=lambda u: len(u.prefix), reverse=True)
+
+
+class ProxyPool:
+    """
+    One keep-alive httpx.AsyncClient per upstream, created on first use on
+    the running loop and closed by the app lifespan (aclose()).
+    """
+
+    def __init__(
+        self, upstreams: list[Upstream], transport: httpx.AsyncBaseTransport | None = None
+    ):
+        self.upstreams = upstreams
+        self._transport = transport  # tests / benchmarks (e.g. ASGITransport)
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> ProxyPool:
+        return cls(parse_upstreams(settings))
+
+    def client(self, upstream: Upstream) -> httpx.AsyncClient:
+        client = self._clients.get(upstream.prefix)
+        if client is None:
+            client = httpx.AsyncClient(
+                base_url=upstream.url,
+                timeout=httpx.Timeout(upstream.timeout_s, connect=upstream.connect_timeout_s),
+                limits=httpx.Limits(
+                    max_connections=upstream.max_connections,
+                    max_keepalive_connections=upstream.max_connections,
+                ),
+                transport=self._transport,
+                follow_redirects=False,
+            )
+            self._clients[upstream.prefix] = client
+        return client
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+def _request_headers(request: Request) -> list[tuple[str, str]]:
+    # Nagłówki wymienione w Connection też są hop-by-hop
+    listed = {
+        token.strip().lower()
+        for value in request.headers.getlist("connection")
+        for token in value.split(",")
+    }
+    drop = HOP_BY_HOP | REQUEST_OVERRIDES | listed | {"x-forwarded-for"}
+    headers = [(k, v) for k, v in request.headers.items() if k not in drop]
+
+    client_ip = request.client.host if request.client else ""
+    xff = request.headers.get("x-forwarded-for")
+    headers.append(("x-forwarded-for", f"{xff}, {client_ip}" if xff else client_ip))
+    headers.append(("x-forwarded-proto", request.url.scheme))
+    if host := request.headers.get("host"):
+        headers.append(("x-forwarded-host", host))
+    request_id = getattr(request.state, "request_id", None) or request.headers.get("x-request-id")
+    if request_id:
+        headers.append(("x-request-id", request_id))
+    return headers
+
+
+def _upstream_path(request: Request, upstream: Upstream) -> str:
+    # raw_path zachowuje oryginalne kodowanie (%2F itd.)
+    path = request.scope.get("raw_path", b"").decode("latin-1") or request.url.path
+    if upstream.strip_prefix:
+        path = path[len(upstream.prefix) :] or "/"
+    query = request.url.query
+    return f"{path}?{query}" if query else path
+
+
+def _error(upstream: Upstream, status_code: int, error: str) -> Response:
+    proxy_requests.labels(upstream=upstream.prefix, status=str(status_code)).inc()
+    return json_bytes_response(dumps({"ok": False, "error": error}), status_code)
+
+
+async def forward(request: Request, pool: ProxyPool, upstream: Upstream) -> Response:
+    """
+    Send the request upstream and stream the response back.
+
+    Bodies are streamed in both directions (never buffered whole); the
+    upstream connection returns to the pool once the response body has been
+    sent or the client went away.
+    """
+    client = pool.client(upstream)
+    has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+    upstream_req = client.build_request(
+        request.method,
+        _upstream_path(request, upstream),
+        headers=_request_headers(request),
+        content=iter_body(request) if has_body else None,
+    )
+
+    t0 = time.perf_counter()
+    try:
+        upstream_resp = await client.send(upstream_req, stream=True)
+    except httpx.TimeoutException:
+        logger.warning(f"Proxy {upstream.prefix}: upstream timeout ({upstream.url})")
+        return _error(upstream, 504, "upstream_timeout")
+    except httpx.HTTPError as e:
+        logger.warning(f"Proxy {upstream.prefix}: upstream unavailable ({upstream.url}): {e}")
+        return _error(upstream, 502, "upstream_unavailable")
+    proxy_upstream_seconds.labels(upstream=upstream.prefix).observe(time.perf_counter() - t0)
+    proxy_requests.labels(upstream=upstream.prefix, status=str(upstream_resp.status_code)).inc()
+
+    return UpstreamResponse(upstream_resp)
+
+
+class UpstreamResponse(StreamingResponse):
+    """
+    Streams an httpx response as-is (aiter_raw: no decompression, so
+    Content-Encoding/Content-Length stay valid) and always releases the
+    upstream connection, also when the client disconnects before the body.
+    """
+
+    def __init__(self, upstream: httpx.Response):
+        super().__init__(upstream.aiter_raw(), status_code=upstream.status_code)
+        self.upstream = upstream
+        self.raw_headers = [
+            (k, v)
+            for k, v in upstream.headers.raw
+            if k.lower().decode("latin-1") not in HOP_BY_HOP and k.lower() != b"x-request-id"
+        ]
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.upstream.aclose()
+
+
+def build_router(pool: ProxyPool) -> APIRouter:
+    """Routes `<prefix>` and `<prefix>/{path}` for every configured upstream."""
+    router = APIRouter(tags=["proxy"])
+    for upstream in pool.upstreams:
+        endpoint = _endpoint(pool, upstream)
+        for path in (upstream.prefix, upstream.prefix + "/{path:path}"):
+            router.add_api_route(
+                path, endpoint, methods=METHODS, include_in_schema=False, name=f"proxy:{path}"
+            )
+    return router
+
+
+def _endpoint(pool: ProxyPool, upstream: Upstream):
+    async def proxy(request: Request) -> Response:
+        return await forward(request, pool, upstream)
+
+    return proxy
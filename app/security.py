@@ -2,19 +2,16 @@ import hashlib
 import hmac
 import os
 
-from fastapi import HTTPException, Request
+from fastapi import Depends, HTTPException, Request
 from starlette.status import HTTP_401_UNAUTHORIZED
 
+from app.body import RequestBody, request_body
 
-async def hmac_verify(request: Request):
+
+def signature_context(request: Request) -> tuple[str, "hmac.HMAC"]:
     """
-    Dependency: weryfikacja HMAC
-    - Czyta nagłówki z aliasami:
-      * Timestamp: X-AXV-Timestamp lub X-Signature-Timestamp
-      * Signature: X-AXV-Signature lub X-Signature
-    - Sekret i parametry z ENV:
-      * AXV_HMAC_SECRET  (wymagany do poprawnej weryfikacji)
-      * AXV_HMAC_DRIFT_S (opcjonalne; nieegzekwowane tu — robi to middleware TS)
+    Nagłówki + sekret → (podpis z nagłówka, HMAC zainicjowany "<ts>.").
+    Body dopisuje wywołujący przez mac.update() — także kawałkami (stream).
     """
     ts = request.headers.get("X-AXV-Timestamp") or request.headers.get(
         "X-Signature-Timestamp"
@@ -28,23 +25,27 @@ async def hmac_verify(request: Request):
         # Brak sekretu = traktujemy jak złą konfigurację podpisu
         raise HTTPException(HTTP_401_UNAUTHORIZED, "bad signature")
 
-    try:
-        body_bytes = await request.body()
-    except Exception:
-        body_bytes = b""
-    payload = (
-        body_bytes.decode()
-        if isinstance(body_bytes, (bytes, bytearray))
-        else str(body_bytes)
-    )
+    return sig, hmac.new(secret, ts.encode() + b".", hashlib.sha256)
 
-    # Liczymy "sha256=<hexdigest>" zgodnie z kontraktem
-    def calc(p: str) -> str:
-        msg = f"{ts}.{p}".encode()
-        return "sha256=" + hmac.new(secret, msg, hashlib.sha256).hexdigest()
-
-    expected = calc(payload)
 
+def check_signature(sig: str, mac: "hmac.HMAC") -> None:
     # Stałe porównanie — akceptujemy wyłącznie format z prefiksem "sha256="
-    if not hmac.compare_digest(sig, expected):
+    if not hmac.compare_digest(sig, "sha256=" + mac.hexdigest()):
         raise HTTPException(HTTP_401_UNAUTHORIZED, "bad signature")
+
+
+async def hmac_verify(request: Request, body: RequestBody = Depends(request_body)):
+    """
+    Dependency: weryfikacja HMAC
+    - Czyta nagłówki z aliasami:
+      * Timestamp: X-AXV-Timestamp lub X-Signature-Timestamp
+      * Signature: X-AXV-Signature lub X-Signature
+    - Sekret i parametry z ENV:
+      * AXV_HMAC_SECRET  (wymagany do poprawnej weryfikacji)
+      * AXV_HMAC_DRIFT_S (opcjonalne; nieegzekwowane tu — robi to middleware TS)
+    - Body z request.state.body (RequestBody) — czytane raz, bez dekodowania
+    """
+    sig, mac = signature_context(request)
+    # Liczymy "sha256=<hexdigest>" po "<ts>.<body>" zgodnie z kontraktem
+    mac.update(body.raw)
+    check_signature(sig, mac)
@@ -0,0 +1,364 @@
+"""Production server: per-core uvicorn workers under a small supervisor."""
+
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+from dataclasses import asdict, dataclass
+from importlib.util import find_spec
+from pathlib import Path
+
+import uvicorn
+
+logger = logging.getLogger("axv_gw.serve")
+
+APP = "app.main:app"
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def available_cpus(cgroup_root: Path = CGROUP_ROOT) -> int:
+    """
+    CPUs this process may actually use: the affinity mask, capped by the
+    cgroup CPU quota (v2 cpu.max, v1 cpu.cfs_quota_us) rounded up.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - no sched_getaffinity (macOS)
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_quota(cgroup_root)
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(cpus, 1)
+
+
+def _cgroup_quota(root: Path) -> float | None:
+    try:
+        # cgroup v2: "<quota> <period>" albo "max <period>"
+        quota, period = (root / "cpu.max").read_text().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+@dataclass
+class ServeOptions:
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    loop: str = "asyncio"
+    http: str = "h11"
+    backlog: int = 2048
+    keepalive_s: int = 65
+    reuse_port: bool = False
+    max_requests: int = 0
+    max_rss_mb: int = 0
+    graceful_timeout_s: int = 30
+    log_level: str = "info"
+
+    @classmethod
+    def from_settings(cls, settings, **overrides) -> ServeOptions:
+        """Resolve Settings (+ CLI overrides, None = not given) into concrete options."""
+        opts = {
+            "host": settings.host,
+            "port": settings.port,
+            "workers": settings.workers,
+            "backlog": settings.backlog,
+            "keepalive_s": settings.keepalive_timeout_s,
+            "reuse_port": settings.reuse_port,
+            "max_requests": settings.max_requests,
+            "max_rss_mb": settings.max_rss_mb,
+            "graceful_timeout_s": settings.graceful_timeout_s,
+            "log_level": settings.log_level,
+        }
+        opts.update({k: v for k, v in overrides.items() if v is not None})
+        if opts["workers"] <= 0:
+            opts["workers"] = available_cpus()
+        # SO_REUSEPORT tylko tam, gdzie jest (Linux, BSD)
+        opts["reuse_port"] = opts["reuse_port"] and hasattr(socket, "SO_REUSEPORT")
+        resolved = cls(
+            loop="uvloop" if find_spec("uvloop") else "asyncio",
+            http="httptools" if find_spec("httptools") else "h11",
+            **opts,
+        )
+        resolved.check_process_state(settings)
+        return resolved
+
+    def check_process_state(self, settings) -> None:
+        """
+        Refuse layouts where two processes would own the same on-disk state.
+
+        The hook queue's segment log (sequence numbers, recovery, GC) and the
+        history snapshot belong to one process. Workers do not share them,
+        and a recycling handover runs the old and new worker side by side.
+        Raises ValueError.
+        """
+        if settings.hooks_ingest_mode == "queue" and self.supervised:
+            raise ValueError(
+                "hooks_ingest_mode=queue needs one worker process without recycling "
+                f"(single owner of {settings.hooks_queue_dir}): use --workers 1, "
+                "no --max-requests/--max-rss-mb"
+            )
+        if settings.history_path and self.workers > 1:
+            raise ValueError(
+                f"history_path ({settings.history_path}) is written by one process: "
+                "use --workers 1 or leave it empty (in-memory history per worker)"
+            )
+
+    @property
+    def supervised(self) -> bool:
+        # Recykling wymaga kogoś, kto podniesie workera z powrotem.
+        return self.workers > 1 or self.max_requests > 0 or self.max_rss_mb > 0
+
+
+def bind_socket(opts: ServeOptions, reuse_port: bool = False) -> socket.socket:
+    family = socket.AF_INET6 if ":" in opts.host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((opts.host, opts.port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux /proc), 0 when unknown."""
+    try:
+        resident = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+    return resident * os.sysconf("SC_PAGE_SIZE")
+
+
+class RecyclingServer(uvicorn.Server):
+    """
+    uvicorn.Server that asks to be retired after ~max_requests requests or
+    above max_rss_mb, instead of exiting on its own.
+
+    `retire` is set and the worker keeps serving; the supervisor starts a
+    replacement, waits for its `ready` and only then sends SIGTERM, so
+    capacity never drops to zero while workers recycle.
+    """
+
+    RSS_CHECK_TICKS = 50  # on_tick runs every 0.1 s → check every ~5 s
+
+    def __init__(self, config: uvicorn.Config, opts: ServeOptions, ready=None, retire=None):
+        super().__init__(config)
+        self.max_requests = 0
+        if opts.max_requests > 0:
+            # Rozrzut ±10%, żeby workery nie wymieniały się wszystkie naraz.
+            jitter = opts.max_requests // 10
+            self.max_requests = opts.max_requests + random.randint(-jitter, jitter)
+        self.max_rss = opts.max_rss_mb * 1024 * 1024
+        self.ready = ready
+        self.retire = retire
+
+    async def startup(self, sockets: list[socket.socket] | None = None) -> None:
+        await super().startup(sockets=sockets)
+        if self.ready is not None and not self.should_exit:
+            self.ready.set()
+
+    async def on_tick(self, counter: int) -> bool:
+        if await super().on_tick(counter):
+            return True
+        if self.retire is None or self.retire.is_set():
+            return False
+
+        reason = None
+        if self.max_requests and self.server_state.total_requests >= self.max_requests:
+            reason = f"{self.server_state.total_requests} requests"
+        elif self.max_rss and counter % self.RSS_CHECK_TICKS == 0:
+            rss = rss_bytes()
+            if rss > self.max_rss:
+                reason = f"RSS {rss >> 20} MiB > {self.max_rss >> 20} MiB"
+        if reason:
+            logger.info(f"Worker {os.getpid()} asks to be recycled ({reason})")
+            self.retire.set()
+        return False
+
+
+def uvicorn_config(opts: ServeOptions) -> uvicorn.Config:
+    return uvicorn.Config(
+        APP,
+        host=opts.host,
+        port=opts.port,
+        loop=opts.loop,
+        http=opts.http,
+        backlog=opts.backlog,
+        timeout_keep_alive=opts.keepalive_s,
+        timeout_graceful_shutdown=opts.graceful_timeout_s,
+        log_level=opts.log_level,
+        # RequestLoggingMiddleware loguje już każde żądanie (JSON)
+        access_log=False,
+        proxy_headers=True,
+    )
+
+
+def run_worker(
+    opts: ServeOptions, sockets: list[socket.socket] | None = None, ready=None, retire=None
+) -> None:
+    """Body of one worker process (also used directly for a single worker)."""
+    if hasattr(signal, "SIGHUP"):
+        # SIGHUP = reload configu (ConfigWatcher); bez pliku nie może zabić workera
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    if sockets is None:
+        sockets = [bind_socket(opts, reuse_port=opts.reuse_port)]
+    RecyclingServer(uvicorn_config(opts), opts, ready, retire).run(sockets=sockets)
+
+
+class _Worker:
+    __slots__ = ("proc", "started", "ready", "retire", "stopping_since")
+
+    def __init__(self, ctx, opts: ServeOptions, sockets: list[socket.socket]):
+        self.ready = ctx.Event()
+        self.retire = ctx.Event()
+        self.proc = ctx.Process(
+            target=run_worker,
+            args=(opts, sockets or None, self.ready, self.retire),
+            name="axv-gw-worker",
+        )
+        self.proc.start()
+        self.started = time.monotonic()
+        self.stopping_since: float | None = None
+
+    def stop(self) -> None:
+        if self.stopping_since is None and self.proc.is_alive():
+            self.proc.terminate()  # SIGTERM → uvicorn graceful shutdown
+        self.stopping_since = self.stopping_since or time.monotonic()
+
+
+class Supervisor:
+    """
+    Keeps `workers` processes running.
+
+    - SO_REUSEPORT: every worker binds its own listening socket and the
+      kernel spreads connections between them; otherwise the supervisor binds
+      once and the workers share the inherited socket
+    - recycling (max requests / RSS) is a handover: the replacement starts
+      first and the old worker is stopped once the new one is ready, one
+      worker at a time
+    - a worker that dies is replaced; fast crash loops are slowed down
+    - SIGHUP is forwarded to the workers (runtime config reload),
+      SIGTERM/SIGINT stop them gracefully
+    """
+
+    POLL_S = 0.2
+    MIN_UPTIME_S = 1.0
+
+    def __init__(self, opts: ServeOptions):
+        self.opts = opts
+        self.ctx = multiprocessing.get_context("spawn")
+        self.sockets: list[socket.socket] = []
+        self.workers: list[_Worker] = []
+        # (retiring worker, its replacement) — at most one handover at a time
+        self.handover: tuple[_Worker, _Worker] | None = None
+        self.retired: list[_Worker] = []
+        self.should_exit = False
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self.ctx, self.opts, self.sockets)
+
+    def _handle_exit(self, sig, frame) -> None:
+        self.should_exit = True
+
+    def _forward(self, sig, frame) -> None:
+        for w in self.workers:
+            if w.proc.is_alive() and w.proc.pid:
+                os.kill(w.proc.pid, sig)
+
+    def run(self) -> None:
+        if not self.opts.reuse_port:
+            self.sockets = [bind_socket(self.opts)]
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self._forward)
+
+        logger.info(
+            f"axv-gw serving on {self.opts.host}:{self.opts.port} with "
+            f"{self.opts.workers} workers ({self.opts.loop}/{self.opts.http}, "
+            f"reuse_port={self.opts.reuse_port})"
+        )
+        self.workers = [self._spawn() for _ in range(self.opts.workers)]
+        try:
+            while not self.should_exit:
+                time.sleep(self.POLL_S)
+                self._tick()
+        finally:
+            self._shutdown()
+
+    def _tick(self) -> None:
+        # 1. dead workers (crash, OOM kill) are replaced right away
+        for i, w in enumerate(self.workers):
+            if w.proc.is_alive():
+                continue
+            w.proc.join()
+            uptime = time.monotonic() - w.started
+            logger.warning(f"Worker {w.proc.pid} died ({w.proc.exitcode}) after {uptime:.0f}s")
+            if uptime < self.MIN_UPTIME_S:
+                time.sleep(self.MIN_UPTIME_S)
+            self.workers[i] = self._spawn()
+            if self.handover and self.handover[0] is w:
+                self.handover[1].proc.terminate()
+                self.retired.append(self.handover[1])
+                self.handover = None
+
+        # 2. handover: stop the old worker once its replacement serves
+        if self.handover is not None:
+            old, new = self.handover
+            if new.ready.is_set():
+                self.workers[self.workers.index(old)] = new
+                old.stop()
+                self.retired.append(old)
+                self.handover = None
+                logger.info(f"Worker {old.proc.pid} recycled, replaced by {new.proc.pid}")
+            elif not new.proc.is_alive():
+                self.handover = None  # retried on the next tick
+        else:
+            for w in self.workers:
+                if w.retire.is_set():
+                    self.handover = (w, self._spawn())
+                    break
+
+        # 3. reap retired workers, kill the ones stuck past the graceful timeout
+        kill_after = self.opts.graceful_timeout_s + 5
+        for w in list(self.retired):
+            if not w.proc.is_alive():
+                w.proc.join()
+                self.retired.remove(w)
+            elif time.monotonic() - (w.stopping_since or w.started) > kill_after:
+                w.proc.kill()
+
+    def _shutdown(self) -> None:
+        everyone = self.workers + self.retired + (list(self.handover) if self.handover else [])
+        for w in everyone:
+            w.stop()
+        deadline = time.monotonic() + self.opts.graceful_timeout_s + 5
+        for w in everyone:
+            w.proc.join(max(deadline - time.monotonic(), 0))
+            if w.proc.is_alive():
+                w.proc.kill()
+                w.proc.join()
+        for sock in self.sockets:
+            sock.close()
+
+
+def serve(opts: ServeOptions) -> None:
+    logger.info(f"Serve options: {asdict(opts)}")
+    if opts.supervised:
+        Supervisor(opts).run()
+    else:
+        run_worker(opts)
@@ -0,0 +1,74 @@
+"""Startup pre-warming and the startup-time budget report."""
+
+import asyncio
+import json
+import logging
+
+import anyio
+from fastapi import FastAPI
+from prometheus_client import Gauge
+
+import app as app_pkg
+from app import config
+from app.routers import front
+
+logger = logging.getLogger(__name__)
+
+startup_seconds = Gauge("axv_gw_startup_seconds", "Worker startup time by phase", ["phase"])
+startup_over_budget = Gauge(
+    "axv_gw_startup_over_budget", "Whether startup exceeded the budget (1=yes, 0=no)"
+)
+
+
+async def prewarm(app: FastAPI) -> dict[str, bool]:
+    """
+    Warm caches before the worker accepts traffic.
+
+    Blocking work (stub file read) runs in a thread so the loop monitor and
+    other lifespan tasks are not stalled.
+
+    Returns:
+        Mapping of warmed component -> success.
+    """
+    # anyio imports its asyncio backend on first use, which otherwise lands
+    # on the first request going through BaseHTTPMiddleware.
+    await anyio.sleep(0)
+    results = {"front_status": await asyncio.to_thread(front.warm_cache)}
+    app.state.prewarmed = results
+    return results
+
+
+def report(imported_at: float, ready_at: float, prewarm_s: float) -> dict:
+    """
+    Log and export the startup timings.
+
+    Args:
+        imported_at: perf_counter() when app.main finished importing
+        ready_at: perf_counter() when the lifespan startup completed
+        prewarm_s: seconds spent in prewarm()
+
+    Returns:
+        The logged report.
+    """
+    import_s = imported_at - app_pkg.IMPORT_STARTED_AT
+    ready_s = ready_at - app_pkg.IMPORT_STARTED_AT
+    over = ready_s * 1000 > config.settings.startup_budget_ms
+
+    startup_seconds.labels(phase="import").set(import_s)
+    startup_seconds.labels(phase="prewarm").set(prewarm_s)
+    startup_seconds.labels(phase="ready").set(ready_s)
+    startup_over_budget.set(1 if over else 0)
+
+    data = {
+        "event": "startup",
+        "import_ms": round(import_s * 1000, 1),
+        "prewarm_ms": round(prewarm_s * 1000, 1),
+        "ready_ms": round(ready_s * 1000, 1),
+        "budget_ms": config.settings.startup_budget_ms,
+        "over_budget": over,
+    }
+    if over:
+        logger.warning(json.dumps(data))
+    else:
+        logger.info(json.dumps(data))
+    return data
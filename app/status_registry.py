@@ -0,0 +1,204 @@
+"""Keyed front-status documents (site × locale) with per-key TTL and memory budget."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from prometheus_client import Counter, Gauge
+
+from app.config import Settings
+from app.responses import encode_model
+from app.schemas.status import FrontStatusV1
+
+logger = logging.getLogger(__name__)
+
+registry_requests = Counter(
+    "axv_gw_front_registry_requests_total",
+    "Keyed front status lookups by result (hit/miss/coalesced/stale)",
+    ["result"],
+)
+registry_evictions = Counter(
+    "axv_gw_front_registry_evictions_total", "Documents evicted to stay within the memory budget"
+)
+registry_bytes = Gauge("axv_gw_front_registry_bytes", "Memory held by keyed status documents")
+registry_entries = Gauge("axv_gw_front_registry_entries", "Keyed status documents in memory")
+
+# Nazwy z żądania trafiają do ścieżki pliku — tylko bezpieczne tokeny
+SITE_RE = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+LOCALE_RE = re.compile(r"^[a-z]{2,3}(-[a-z0-9]{2,8})?$")
+ENTRY_OVERHEAD = 512
+STALE_RETRY_S = 5.0
+MISSING_SITES = 1024  # LRU nieznanych site'ów (skany losowych nazw)
+
+
+class UnknownDocumentError(LookupError):
+    """No document for this site (or no usable locale)."""
+
+
+@dataclass
+class Entry:
+    body: bytes
+    locale: str
+    expires_at: float
+    size: int
+
+
+class StatusRegistry:
+    """
+    Status documents under `<root>/<site>/<locale>.json`, each validated once
+    and kept as its encoded FrontStatusV1 body.
+
+    - Locale: requested tag → its language (`pl-pl` → `pl`) → default locale,
+      resolved against the site's directory listing (refreshed with the TTL,
+      read in a thread), so only files that exist become keys. Sites without
+      documents are remembered in an LRU of MISSING_SITES names.
+    - TTL: per document (`cacheTtlSeconds` field), else AXV_GW_CACHE_TTL_SECONDS.
+    - Concurrent misses of one key share a single load (single-flight).
+    - LRU eviction above `max_bytes`; a failed reload keeps serving the stale
+      body and retries after a few seconds.
+    """
+
+    def __init__(self, root: str | Path, default_locale: str = "en", max_bytes: int = 16 << 20):
+        self.root = Path(root) if root else None
+        self.default_locale = default_locale.lower()
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[tuple[str, str], Entry] = OrderedDict()
+        self.size = 0
+        self.inflight: dict[tuple[str, str], asyncio.Task] = {}
+        self._locales: dict[str, tuple[frozenset[str], float]] = {}
+        self._missing: OrderedDict[str, float] = OrderedDict()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> StatusRegistry:
+        return cls(
+            settings.front_sites_dir,
+            settings.front_default_locale,
+            int(settings.front_registry_max_mb * (1 << 20)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self._locales.clear()
+        self._missing.clear()
+        self.size = 0
+        registry_entries.set(0)
+        registry_bytes.set(0)
+
+    # --- resolution ---
+
+    def _list(self, site: str) -> frozenset[str]:
+        return frozenset(p.stem.lower() for p in (self.root / site).glob("*.json"))
+
+    async def _site_locales(self, site: str, ttl_s: float) -> frozenset[str]:
+        now = time.monotonic()
+        cached = self._locales.get(site)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        missing_until = self._missing.get(site)
+        if missing_until is not None and missing_until > now:
+            self._missing.move_to_end(site)
+            return frozenset()
+
+        locales = await asyncio.to_thread(self._list, site)
+        if locales:
+            self._locales[site] = (locales, now + ttl_s)
+            self._missing.pop(site, None)
+        else:
+            # Brak dokumentów też pamiętamy (do TTL), najdawniej pytane wypadają
+            self._locales.pop(site, None)
+            self._missing[site] = now + ttl_s
+            self._missing.move_to_end(site)
+            while len(self._missing) > MISSING_SITES:
+                self._missing.popitem(last=False)
+        return locales
+
+    async def resolve(self, site: str, locale: str | None, ttl_s: float) -> tuple[str, str]:
+        site = site.lower()
+        if self.root is None or not SITE_RE.match(site):
+            raise UnknownDocumentError(site)
+        available = await self._site_locales(site, ttl_s)
+        candidates = []
+        if locale and LOCALE_RE.match(locale := locale.lower()):
+            candidates += [locale, locale.split("-")[0]]
+        candidates.append(self.default_locale)
+        for candidate in candidates:
+            if candidate in available:
+                return site, candidate
+        raise UnknownDocumentError(f"{site}/{locale or self.default_locale}")
+
+    # --- lookup ---
+
+    async def get(self, site: str, locale: str | None, ttl_s: float) -> Entry:
+        key = await self.resolve(site, locale, ttl_s)
+        entry = self.entries.get(key)
+        now = time.monotonic()
+        if entry is not None and entry.expires_at > now:
+            self.entries.move_to_end(key)
+            registry_requests.labels(result="hit").inc()
+            return entry
+
+        task = self.inflight.get(key)
+        if task is None:
+            registry_requests.labels(result="miss").inc()
+            task = asyncio.create_task(self._load(key, entry, ttl_s))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            registry_requests.labels(result="coalesced").inc()
+        # shield: anulowany klient nie przerywa ładowania dla pozostałych
+        return await asyncio.shield(task)
+
+    def _read(self, key: tuple[str, str]) -> dict:
+        site, locale = key
+        with open(self.root / site / f"{locale}.json", encoding="utf-8") as f:
+            return json.load(f)
+
+    async def _load(self, key: tuple[str, str], stale: Entry | None, ttl_s: float) -> Entry:
+        try:
+            data = await asyncio.to_thread(self._read, key)
+            body = encode_model(FrontStatusV1(**data))
+        except Exception as e:
+            if stale is None:
+                if isinstance(e, FileNotFoundError):  # zniknął po odczycie katalogu
+                    raise UnknownDocumentError(f"{key[0]}/{key[1]}") from e
+                logger.error(f"Status document {key[0]}/{key[1]} failed to load: {e}")
+                raise
+            logger.warning(f"Status document {key[0]}/{key[1]} reload failed, serving stale: {e}")
+            registry_requests.labels(result="stale").inc()
+            stale.expires_at = time.monotonic() + min(ttl_s, STALE_RETRY_S)
+            return stale
+
+        ttl = data.get("cacheTtlSeconds", ttl_s)
+        entry = Entry(
+            body=body,
+            locale=key[1],
+            expires_at=time.monotonic() + float(ttl),
+            size=len(body) + ENTRY_OVERHEAD,
+        )
+        self._put(key, entry)
+        return entry
+
+    def _put(self, key: tuple[str, str], entry: Entry) -> None:
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= old.size
+        self.entries[key] = entry
+        self.size += entry.size
+        # Najdawniej używane wylatują pierwsze; świeżo wczytany zostaje zawsze
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= evicted.size
+            registry_evictions.inc()
+        registry_entries.set(len(self.entries))
+        registry_bytes.set(self.size)
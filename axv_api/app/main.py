@@ -1,24 +1,28 @@
 from time import time
 
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
 
-app = FastAPI()
+router = APIRouter()
 
 
-@app.get("/axv/healthz")
+@router.get("/axv/healthz")
 def healthz():
     return {"ok": True}
 
 
-@app.get("/axv/readyz")
+@router.get("/axv/readyz")
 def readyz():
     return {"ok": True}
 
 
-@app.get("/axv/status")
+@router.get("/axv/status")
 def status():
     return {
         "now": int(time()),
         "ok": True,
         "status": {"api": "ok", "version": "stub-2025-11-09"},
     }
+
+
+app = FastAPI()
+app.include_router(router)
@@ -0,0 +1,238 @@
+"""
+Upstream simulator: the axv_api routes behind a fault-injection layer.
+
+    uvicorn axv_api.app.simulator:app --port 8001
+
+Matching requests (prefixes in `paths`, default all of /axv/) get latency
+drawn from a distribution, errors, dropped connections, slow bodies and
+service-state overrides, set at runtime through the admin API:
+
+    GET    /_sim/faults          current faults
+    PUT    /_sim/faults          replace (missing fields = healthy defaults)
+    PATCH  /_sim/faults          update the given fields only
+    DELETE /_sim/faults          back to healthy
+    GET    /_sim/stats           counters per outcome; DELETE resets them
+
+ENV: AXV_SIM_FAULTS (JSON, initial faults), AXV_SIM_SEED (reproducible runs).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import random
+from collections import Counter
+from datetime import UTC, datetime
+from typing import Literal
+
+from fastapi import APIRouter, FastAPI, HTTPException
+from pydantic import BaseModel, Field, ValidationError
+
+from axv_api.app.main import router as api_router
+
+ADMIN_PREFIX = "/_sim"
+
+SERVICES = [
+    ("k8s-cluster", "Kubernetes Cluster"),
+    ("n8n-automation", "n8n Automation"),
+    ("axv-pulse", "AXV Pulse"),
+    ("axv-taskboard", "AXV Task Board"),
+    ("cli-brat", "CLI-brat Agent"),
+]
+
+
+class Faults(BaseModel):
+    """Injected behaviour; the defaults are a healthy upstream."""
+
+    paths: list[str] = Field(["/axv/"], description="path prefixes the faults apply to")
+    latency: Literal["fixed", "uniform", "exponential", "lognormal"] = "fixed"
+    latency_ms: float = Field(0, ge=0, description="fixed value / mean / median (lognormal)")
+    latency_sigma: float = Field(1.0, gt=0, description="lognormal shape; 1.0 ≈ p99 at 10×")
+    tail_rate: float = Field(0, ge=0, le=1, description="share of requests with tail_ms added")
+    tail_ms: float = Field(0, ge=0)
+    latency_max_ms: float = Field(30000, ge=0)
+    error_rate: float = Field(0, ge=0, le=1)
+    error_status: int = Field(503, ge=400, le=599)
+    reset_rate: float = Field(0, ge=0, le=1, description="headers sent, then connection closed")
+    slow_body_rate: float = Field(0, ge=0, le=1)
+    slow_body_ms: float = Field(0, ge=0, description="time to trickle the whole body")
+    slow_body_chunks: int = Field(10, ge=1, le=1000)
+    states: dict[str, Literal["ok", "warn", "down", "unknown"]] = Field(
+        {}, description="service id → state in /axv/front/status"
+    )
+
+
+class Simulator:
+    """Fault state shared by the injection layer, the admin API and the routes."""
+
+    def __init__(self, faults: Faults | None = None, seed: int | None = None):
+        self.faults = faults or Faults()
+        self.rng = random.Random(seed)
+        self.stats: Counter[str] = Counter()
+
+    @classmethod
+    def from_env(cls) -> Simulator:
+        raw = os.getenv("AXV_SIM_FAULTS")
+        seed = os.getenv("AXV_SIM_SEED")
+        return cls(
+            Faults(**json.loads(raw)) if raw else None,
+            int(seed) if seed else None,
+        )
+
+    def matches(self, path: str) -> bool:
+        return not path.startswith(ADMIN_PREFIX) and path.startswith(tuple(self.faults.paths))
+
+    def delay_s(self) -> float:
+        f = self.faults
+        rng = self.rng
+        if f.latency == "fixed":
+            ms = f.latency_ms
+        elif f.latency == "uniform":
+            ms = rng.uniform(0, 2 * f.latency_ms)
+        elif not f.latency_ms:
+            ms = 0.0
+        elif f.latency == "exponential":
+            ms = rng.expovariate(1 / f.latency_ms)
+        else:
+            ms = rng.lognormvariate(math.log(f.latency_ms), f.latency_sigma)
+        if f.tail_rate and rng.random() < f.tail_rate:
+            ms += f.tail_ms
+        return min(ms, f.latency_max_ms) / 1000
+
+    def roll(self, rate: float) -> bool:
+        return rate > 0 and self.rng.random() < rate
+
+
+class FaultInjectionMiddleware:
+    """
+    Pure ASGI, so a "reset" can stop mid-response: the real headers go out,
+    the body never does, and the server closes the connection (the client
+    sees an incomplete response / connection reset).
+    """
+
+    def __init__(self, app, sim: Simulator):
+        self.app = app
+        self.sim = sim
+
+    async def __call__(self, scope, receive, send) -> None:
+        sim = self.sim
+        if scope["type"] != "http" or not sim.matches(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        f = sim.faults
+        sim.stats["requests"] += 1
+        delay = sim.delay_s()
+        if delay > 0:
+            sim.stats["delayed"] += 1
+            await asyncio.sleep(delay)
+
+        if sim.roll(f.error_rate):
+            sim.stats["errors"] += 1
+            body = b'{"ok":false,"error":"injected"}'
+            await send(_start(f.error_status, [(b"content-type", b"application/json")], body))
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        reset = sim.roll(f.reset_rate)
+        slow = not reset and f.slow_body_ms > 0 and sim.roll(f.slow_body_rate)
+        if not reset and not slow:
+            await self.app(scope, receive, send)
+            return
+
+        # Odpowiedź zbierana w całości, żeby znać jej rozmiar (chunki, content-length)
+        start: dict = {}
+        chunks: list[bytes] = []
+
+        async def capture(message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        body = b"".join(chunks)
+        headers = [(k, v) for k, v in start["headers"] if k.lower() != b"content-length"]
+        await send(_start(start["status"], headers, body))
+
+        if reset:
+            sim.stats["resets"] += 1
+            return  # bez body — serwer zamyka połączenie
+
+        sim.stats["slow_bodies"] += 1
+        n = min(f.slow_body_chunks, max(len(body), 1))
+        step = math.ceil(len(body) / n) if body else 0
+        for i in range(n):
+            await asyncio.sleep(f.slow_body_ms / 1000 / n)
+            part = body[i * step : (i + 1) * step]
+            await send({"type": "http.response.body", "body": part, "more_body": i < n - 1})
+
+
+def _start(status: int, headers: list, body: bytes) -> dict:
+    headers = [*headers, (b"content-length", str(len(body)).encode())]
+    return {"type": "http.response.start", "status": status, "headers": headers}
+
+
+def build_admin_router(sim: Simulator) -> APIRouter:
+    router = APIRouter(prefix=ADMIN_PREFIX)
+
+    @router.get("/faults")
+    def get_faults() -> Faults:
+        return sim.faults
+
+    @router.put("/faults")
+    def put_faults(faults: Faults) -> Faults:
+        sim.faults = faults
+        return sim.faults
+
+    @router.patch("/faults")
+    def patch_faults(changes: dict) -> Faults:
+        try:
+            sim.faults = Faults(**{**sim.faults.model_dump(), **changes})
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        return sim.faults
+
+    @router.delete("/faults")
+    def reset_faults() -> Faults:
+        sim.faults = Faults()
+        return sim.faults
+
+    @router.get("/stats")
+    def get_stats() -> dict:
+        return dict(sim.stats)
+
+    @router.delete("/stats")
+    def reset_stats() -> dict:
+        sim.stats.clear()
+        return {}
+
+    return router
+
+
+def create_app(sim: Simulator | None = None) -> FastAPI:
+    sim = sim or Simulator.from_env()
+    app = FastAPI(title="axv-api simulator")
+    app.state.sim = sim
+    app.include_router(api_router)
+    app.include_router(build_admin_router(sim))
+
+    @app.get("/axv/front/status")
+    def front_status():
+        """FrontStatusV1 document for the gateway's upstream source."""
+        states = sim.faults.states
+        return {
+            "updatedAt": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+            "services": [
+                {"id": sid, "label": label, "state": states.get(sid, "ok")}
+                for sid, label in SERVICES
+            ],
+        }
+
+    app.add_middleware(FaultInjectionMiddleware, sim=sim)
+    return app
+
+
+app = create_app()
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from axv_gw.metrics import (
+    event_loop_blocked,
+    event_loop_lag_last_seconds,
+    event_loop_lag_seconds,
+    event_loop_tasks,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """
+    Background monitor of event loop health.
+    ENV:
+      LOOP_MONITOR (1/0, domyślnie 1)
+      LOOP_MONITOR_INTERVAL_MS (domyślnie 250) – co ile próbkujemy opóźnienie
+      LOOP_LAG_THRESHOLD_MS (domyślnie 100) – powyżej: log + gw_event_loop_blocked_total
+      LOOP_LAG_DUMP_STACKS (1/0, domyślnie 1) – watchdog loguje stos zablokowanej pętli
+
+    The sampler task sleeps for `interval` and measures how late it wakes up.
+    A sampler cannot see *what* blocked the loop (it only runs afterwards), so
+    a watchdog thread watches the sampler's heartbeat and, while the loop is
+    still stuck, logs the stack of the loop thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_ms: int | None = None,
+        threshold_ms: int | None = None,
+        dump_stacks: bool | None = None,
+    ):
+        self.enabled = os.getenv("LOOP_MONITOR", "1") != "0"
+        self.interval = (
+            int(
+                os.getenv(
+                    "LOOP_MONITOR_INTERVAL_MS",
+                    str(interval_ms if interval_ms is not None else 250),
+                )
+            )
+            / 1000.0
+        )
+        self.threshold = (
+            int(
+                os.getenv(
+                    "LOOP_LAG_THRESHOLD_MS",
+                    str(threshold_ms if threshold_ms is not None else 100),
+                )
+            )
+            / 1000.0
+        )
+        self.dump_stacks = (
+            os.getenv("LOOP_LAG_DUMP_STACKS", "1" if dump_stacks is None or dump_stacks else "0")
+            != "0"
+        )
+
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop_thread_id: int | None = None
+        self._heartbeat = time.monotonic()
+
+    async def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._sample(), name="axv-gw-loop-monitor")
+        if self.dump_stacks:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="axv-gw-loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 4)
+            self._watchdog = None
+
+    async def _sample(self) -> None:
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - t0 - self.interval, 0.0)
+            self._heartbeat = time.monotonic()
+
+            event_loop_lag_seconds.observe(lag)
+            event_loop_lag_last_seconds.set(lag)
+            event_loop_tasks.set(len(asyncio.all_tasks()))
+
+            if lag > self.threshold:
+                event_loop_blocked.inc()
+                logger.warning(
+                    json.dumps(
+                        {
+                            "event": "event_loop_lag",
+                            "lag_ms": int(lag * 1000),
+                            "threshold_ms": int(self.threshold * 1000),
+                        }
+                    )
+                )
+
+    def _watch(self) -> None:
+        # Jedno zrzucenie stosu na jedno zablokowanie (heartbeat się nie zmienia).
+        dumped_for = None
+        while not self._stop.wait(self.interval):
+            beat = self._heartbeat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled <= self.threshold or dumped_for == beat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            dumped_for = beat
+            logger.warning(
+                "event loop blocked for %d ms, loop thread stack:\n%s",
+                int(stalled * 1000),
+                "".join(traceback.format_stack(frame)),
+            )
@@ -1,4 +1,5 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.routing import Match
 
 rate_limit_dropped = Counter(
     "gw_rate_limit_dropped_total",
@@ -6,6 +7,11 @@ rate_limit_dropped = Counter(
     ["path"],
 )
 
+rate_limit_buckets = Gauge(
+    "gw_rate_limit_buckets",
+    "(client_ip, path) windows held by the rate limiter",
+)
+
 hmac_bad_ts = Counter(
     "gw_hmac_bad_ts_total",
     "Requests rejected due to timestamp skew",
@@ -29,3 +35,173 @@ hooks_duration_ms = Histogram(
     "Duration of /hooks/* requests in milliseconds",
     buckets=[5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000],
 )
+
+event_loop_lag_seconds = Histogram(
+    "gw_event_loop_lag_seconds",
+    "Event loop scheduling delay (sleep overshoot) in seconds",
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5],
+)
+
+event_loop_lag_last_seconds = Gauge(
+    "gw_event_loop_lag_last_seconds",
+    "Most recent event loop scheduling delay in seconds",
+)
+
+event_loop_blocked = Counter(
+    "gw_event_loop_blocked_total",
+    "Times the event loop lag exceeded LOOP_LAG_THRESHOLD_MS",
+)
+
+event_loop_tasks = Gauge(
+    "gw_event_loop_tasks",
+    "Pending asyncio tasks on the event loop",
+)
+
+inflight_requests = Gauge(
+    "gw_inflight_requests",
+    "HTTP requests currently being processed",
+)
+
+hooks_queue_depth = Gauge(
+    "gw_hooks_queue_depth",
+    "Hook events accepted (202) but not yet handled",
+)
+
+hooks_queue_lag_seconds = Histogram(
+    "gw_hooks_queue_lag_seconds",
+    "Time from 202 Accepted to the hook handler finishing",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60],
+)
+
+hooks_queue_events = Counter(
+    "gw_hooks_queue_events_total",
+    "Hook events by ingestion queue outcome",
+    ["outcome"],
+)
+
+hooks_queue_fsync_seconds = Histogram(
+    "gw_hooks_queue_fsync_seconds",
+    "Duration of batched fsyncs of the hook segment log",
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25],
+)
+
+hooks_batch_events = Counter(
+    "gw_hooks_batch_events_total",
+    "Events received through /hooks/batch by per-event status code",
+    ["status"],
+)
+
+forward_duration_seconds = Histogram(
+    "gw_forward_duration_seconds",
+    "Duration of hook forwarding attempts per target",
+    ["target"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+)
+
+forward_deliveries = Counter(
+    "gw_forward_deliveries_total",
+    "Hook forwarding attempts per target by outcome",
+    ["target", "outcome"],
+)
+
+forward_pending = Gauge(
+    "gw_forward_pending",
+    "Hook deliveries queued, in flight or waiting for a retry per target",
+    ["target"],
+)
+
+config_reloads = Counter(
+    "gw_config_reloads_total",
+    "Runtime config reload attempts by result",
+    ["result"],
+)
+
+config_version = Gauge(
+    "gw_config_version",
+    "Version of the active runtime config snapshot (0 = none loaded)",
+)
+
+proxy_requests = Counter(
+    "gw_proxy_requests_total",
+    "Proxied requests per upstream prefix by status (502/504 = upstream error)",
+    ["upstream", "status"],
+)
+
+proxy_upstream_seconds = Histogram(
+    "gw_proxy_upstream_seconds",
+    "Time until the upstream response headers arrived",
+    ["upstream"],
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+)
+
+response_cache_requests = Counter(
+    "gw_response_cache_requests_total",
+    "Response cache lookups per configured route by result (hit/miss/coalesced/bypass)",
+    ["route", "result"],
+)
+
+response_cache_evictions = Counter(
+    "gw_response_cache_evictions_total",
+    "Response cache entries dropped by reason (expired/capacity/replaced)",
+    ["reason"],
+)
+
+response_cache_entries = Gauge(
+    "gw_response_cache_entries",
+    "Responses currently held by the response cache",
+)
+
+response_cache_bytes = Gauge(
+    "gw_response_cache_bytes",
+    "Approximate memory held by the response cache (budget: RESPONSE_CACHE_MAX_MB)",
+)
+
+admission_limit = Gauge(
+    "gw_admission_limit",
+    "Current adaptive concurrency limit (AIMD on observed latency)",
+)
+
+admission_inflight = Gauge(
+    "gw_admission_inflight",
+    "Requests admitted and not yet answered (priority paths excluded)",
+)
+
+admission_queue_seconds = Histogram(
+    "gw_admission_queue_seconds",
+    "Time admitted requests waited for a concurrency slot",
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1],
+)
+
+admission_shed = Counter(
+    "gw_admission_shed_total",
+    "Requests rejected with 503 by admission control by reason (queue_full/queue_timeout)",
+    ["reason"],
+)
+
+fast_lane_requests = Counter(
+    "gw_fast_lane_requests_total",
+    "Probe / status requests answered by the fast lane (not in the access log)",
+    ["path"],
+)
+
+
+# Etykieta `path` = szablon trasy; surowa ścieżka to nowa seria na każdy skanowany URL
+OTHER_PATH = "other"
+
+
+def route_label(scope) -> str:
+    """
+    Bounded `path` label: the template of the matched route ("/hooks/ping",
+    "/front/sites/{site}/status"), else "other". After routing FastAPI leaves
+    the route in the scope; before it (middleware rejections) the app's
+    routes are matched here.
+    """
+    route = scope.get("route")
+    if route is None:
+        router = getattr(scope.get("app"), "router", None)
+        for candidate in getattr(router, "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match is Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or OTHER_PATH
@@ -0,0 +1,235 @@
+import asyncio
+import os
+import time
+from collections import deque
+
+from axv_gw.metrics import (
+    admission_inflight,
+    admission_limit,
+    admission_queue_seconds,
+    admission_shed,
+    route_label,
+)
+
+
+class OverloadedError(Exception):
+    """Request shed by the limiter; `reason` is queue_full or queue_timeout."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit adapted with AIMD from observed latency.
+
+    The no-load latency (`baseline`) is kept per route — the minimum seen
+    over the last two windows — so a healthy but slow route (proxied upstream
+    at 200 ms) does not look like congestion next to a 1 ms one. Each sample
+    is divided by its route's baseline; the limit only moves while at least
+    half of it is in use: then a smoothed ratio (EWMA) above `tolerance`, or
+    a smoothed latency above `target_s` when set, means requests queue
+    somewhere (loop, upstream, DB) → limit × `backoff`, at most once per
+    smoothed RTT; otherwise the limit grows by ~1 per limit's worth of
+    completions (+1/limit each). The absolute target (off by default) covers
+    a baseline learned while already overloaded, but only fits when every
+    limited route is expected to answer faster than it.
+
+    Requests over the limit wait in a FIFO queue of `max_queue` slots for at
+    most `queue_timeout_s`; beyond that they are shed (OverloadedError).
+    """
+
+    def __init__(
+        self,
+        initial: int = 50,
+        min_limit: int = 8,
+        max_limit: int = 1000,
+        max_queue: int = 100,
+        queue_timeout_s: float = 0.5,
+        tolerance: float = 2.0,
+        target_s: float = 0.0,
+        backoff: float = 0.9,
+        window_s: float = 10.0,
+        min_latency_s: float = 0.002,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.tolerance = tolerance
+        self.target_s = target_s  # 0 = tylko gradient względem baseline
+        self.backoff = backoff
+        self.window_s = window_s
+        self.min_latency_s = min_latency_s  # szum pomiaru przy bardzo szybkich trasach
+
+        self.inflight = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.ewma: float | None = None
+        self.ewma_ratio: float | None = None
+        # route → [min z poprzedniego okna, min z bieżącego okna]
+        self._mins: dict[str, list[float]] = {}
+        self._window_start = time.monotonic()
+        self._last_decrease = 0.0
+        admission_limit.set(int(self.limit))
+
+    def baseline(self, route: str = "") -> float:
+        mins = self._mins.get(route)
+        return max(min(mins) if mins else float("inf"), self.min_latency_s)
+
+    async def acquire(self) -> None:
+        if self.inflight < int(self.limit) and not self.waiters:
+            self._enter()
+            return
+        if len(self.waiters) >= self.max_queue:
+            raise OverloadedError("queue_full")
+
+        t0 = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout_s)
+        except BaseException as exc:
+            granted = waiter.done() and not waiter.cancelled()
+            if not granted:
+                self.waiters.remove(waiter)
+                if isinstance(exc, TimeoutError):
+                    raise OverloadedError("queue_timeout") from None
+                raise
+            if not isinstance(exc, TimeoutError):
+                # Slot przyszedł razem z anulowaniem — oddaj go następnemu
+                self.release(None)
+                raise
+        admission_queue_seconds.observe(time.monotonic() - t0)
+
+    def _enter(self) -> None:
+        self.inflight += 1
+        admission_inflight.set(self.inflight)
+
+    def release(self, latency_s: float | None, route: str = "") -> None:
+        """Free a slot; `latency_s` (None = no sample) of `route` feeds the limit."""
+        inflight = self.inflight
+        self.inflight -= 1
+        if latency_s is not None:
+            self._sample(latency_s, inflight, route)
+        # Slot przechodzi bezpośrednio na pierwszego czekającego (FIFO)
+        while self.waiters and self.inflight < int(self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.inflight += 1
+        admission_inflight.set(self.inflight)
+
+    def _sample(self, latency_s: float, inflight: int, route: str) -> None:
+        now = time.monotonic()
+        if now - self._window_start >= self.window_s:
+            for mins in self._mins.values():
+                mins[0], mins[1] = mins[1], float("inf")
+            self._window_start = now
+        mins = self._mins.setdefault(route, [float("inf"), float("inf")])
+        mins[1] = min(mins[1], latency_s)
+        ratio = latency_s / self.baseline(route)
+        self.ewma = latency_s if self.ewma is None else 0.9 * self.ewma + 0.1 * latency_s
+        self.ewma_ratio = ratio if self.ewma_ratio is None else 0.9 * self.ewma_ratio + 0.1 * ratio
+
+        # Przy małym wykorzystaniu limitu wolne żądanie to wolna trasa, nie kolejka
+        if inflight * 2 < self.limit:
+            return
+        congested = self.ewma_ratio > self.tolerance or (
+            self.target_s > 0 and self.ewma > self.target_s
+        )
+        if congested:
+            if now - self._last_decrease >= self.ewma:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        admission_limit.set(int(self.limit))
+
+
+def _env(key: str, default: float) -> float:
+    return float(os.getenv(key, str(default)))
+
+
+class AdmissionControlMiddleware:
+    """
+    Kontrola przyjęć: adaptacyjny limit równoległych żądań (AIMD wg opóźnień).
+    Nadmiar czeka chwilę w kolejce, potem 503 {"ok":false,"error":"overloaded"}
+    + Retry-After — zanim zapłaci za rate limit, HMAC i handler.
+    Czyste ASGI (bez BaseHTTPMiddleware): odrzucenie musi kosztować dużo mniej
+    niż obsłużenie żądania, inaczej przeciążenie zjada goodput. Slot jest zajęty
+    do wysłania całego body (także streamingu); opóźnienie = czas do nagłówków.
+    ENV:
+      ADMISSION_CONTROL (1/0, domyślnie 1)
+      ADMISSION_INITIAL_LIMIT (50), ADMISSION_MIN_LIMIT (8), ADMISSION_MAX_LIMIT (1000)
+      ADMISSION_MAX_QUEUE (100), ADMISSION_QUEUE_TIMEOUT_MS (500)
+      ADMISSION_LATENCY_TOLERANCE (2.0 × opóźnienie bez obciążenia danej trasy)
+      ADMISSION_TARGET_LATENCY_MS (0 = wyłączone; powyżej limit też spada — tylko
+        gdy każda limitowana trasa, także proxy, odpowiada szybciej)
+      ADMISSION_PRIORITY_PATHS (/healthz,/metrics) — poza limitem, nigdy nie odrzucane
+    """
+
+    SHED_BODY = b'{"ok":false,"error":"overloaded"}'
+
+    def __init__(
+        self,
+        app,
+        limiter: AdaptiveLimiter | None = None,
+        priority_paths: str | None = None,
+        retry_after_s: int = 1,
+    ):
+        self.app = app
+        self.enabled = os.getenv("ADMISSION_CONTROL", "1") != "0"
+        self.limiter = limiter or AdaptiveLimiter(
+            initial=int(_env("ADMISSION_INITIAL_LIMIT", 50)),
+            min_limit=int(_env("ADMISSION_MIN_LIMIT", 8)),
+            max_limit=int(_env("ADMISSION_MAX_LIMIT", 1000)),
+            max_queue=int(_env("ADMISSION_MAX_QUEUE", 100)),
+            queue_timeout_s=_env("ADMISSION_QUEUE_TIMEOUT_MS", 500) / 1000,
+            tolerance=_env("ADMISSION_LATENCY_TOLERANCE", 2.0),
+            target_s=_env("ADMISSION_TARGET_LATENCY_MS", 0) / 1000,
+        )
+        paths = (
+            priority_paths
+            if priority_paths is not None
+            else os.getenv("ADMISSION_PRIORITY_PATHS", "/healthz,/metrics")
+        )
+        self.priority_paths = frozenset(p.strip() for p in paths.split(",") if p.strip())
+        self.shed_start = {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(self.SHED_BODY)).encode()),
+                (b"retry-after", str(retry_after_s).encode()),
+            ],
+        }
+        self.shed_body = {"type": "http.response.body", "body": self.SHED_BODY}
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not self.enabled or scope["path"] in self.priority_paths:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.limiter.acquire()
+        except OverloadedError as e:
+            admission_shed.labels(reason=e.reason).inc()
+            await send(self.shed_start)
+            await send(self.shed_body)
+            return
+
+        t0 = time.monotonic()
+        latency = None
+
+        async def send_timed(message) -> None:
+            nonlocal latency
+            if message["type"] == "http.response.start":
+                latency = time.monotonic() - t0
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            self.limiter.release(latency, route_label(scope) if latency is not None else "")
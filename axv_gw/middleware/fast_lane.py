@@ -0,0 +1,63 @@
+import os
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+
+from axv_gw.metrics import fast_lane_requests
+
+
+@dataclass(frozen=True)
+class Precomputed:
+    """A complete response kept as ready-to-send ASGI messages."""
+
+    status: int
+    headers: tuple[tuple[bytes, bytes], ...]
+    body: bytes = b""
+    start: dict = field(init=False, repr=False, compare=False)
+    body_message: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        headers = [*self.headers, (b"content-length", str(len(self.body)).encode())]
+        start = {"type": "http.response.start", "status": self.status, "headers": headers}
+        object.__setattr__(self, "start", start)
+        object.__setattr__(self, "body_message", {"type": "http.response.body", "body": self.body})
+
+    @classmethod
+    def json(cls, body: bytes, status: int = 200, headers=()) -> "Precomputed":
+        return cls(status, ((b"content-type", b"application/json"), *headers), body)
+
+
+# Handler dostaje scope i zwraca gotową odpowiedź — bez Request, bez middleware
+Handler = Callable[[dict], Precomputed]
+EMPTY_BODY = {"type": "http.response.body", "body": b""}
+
+
+class FastLaneMiddleware:
+    """
+    Szybki pas dla sond (liveness/readiness, /status, HEAD /metrics).
+    Najbardziej zewnętrzna warstwa ASGI: zarejestrowane (metoda, ścieżka)
+    dostają odpowiedź z gotowych bajtów, zanim ruszy reszta stosu — bez
+    admission control, rate limitu, logu dostępowego i routingu FastAPI.
+    GET obsługuje też HEAD (te same nagłówki, bez body).
+    ENV: FAST_LANE (1/0, domyślnie 1); 0 = wszystko idzie zwykłą ścieżką.
+    """
+
+    def __init__(self, app, routes: Mapping[tuple[str, str], Handler] | None = None):
+        self.app = app
+        self.enabled = os.getenv("FAST_LANE", "1") != "0"
+        self.routes = dict(routes or {})
+        for (method, path), handler in list(self.routes.items()):
+            if method == "GET":
+                self.routes.setdefault(("HEAD", path), handler)
+        self.counters = {key: fast_lane_requests.labels(path=key[1]) for key in self.routes}
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and self.enabled:
+            key = (scope["method"], scope["path"])
+            handler = self.routes.get(key)
+            if handler is not None:
+                self.counters[key].inc()
+                response = handler(scope)
+                await send(response.start)
+                await send(EMPTY_BODY if key[0] == "HEAD" else response.body_message)
+                return
+        await self.app(scope, receive, send)
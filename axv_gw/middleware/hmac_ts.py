@@ -5,7 +5,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
-from axv_gw.metrics import hmac_bad_ts
+from axv_gw import runtime_config
+from axv_gw.metrics import hmac_bad_ts, route_label
 
 
 class HMACTimeSkewMiddleware(BaseHTTPMiddleware):
@@ -35,14 +36,15 @@ class HMACTimeSkewMiddleware(BaseHTTPMiddleware):
         try:
             ts_i = int(ts)
         except Exception:
-            hmac_bad_ts.labels(path=path).inc()
+            hmac_bad_ts.labels(path=route_label(request.scope)).inc()
             return JSONResponse(
                 {"ok": False, "error": "bad timestamp"}, status_code=401
             )
 
         now = int(time.time())
-        if abs(now - ts_i) > self.max_skew:
-            hmac_bad_ts.labels(path=path).inc()
+        max_skew = runtime_config.current().get_int("HMAC_MAX_SKEW_S", self.max_skew)
+        if abs(now - ts_i) > max_skew:
+            hmac_bad_ts.labels(path=route_label(request.scope)).inc()
             return JSONResponse(
                 {"ok": False, "error": "bad timestamp"}, status_code=401
             )
@@ -3,7 +3,7 @@ import time
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
-from axv_gw.metrics import hooks_duration_ms, hooks_ok
+from axv_gw.metrics import hooks_duration_ms, hooks_ok, route_label
 
 
 class HookMetricsMiddleware(BaseHTTPMiddleware):
@@ -20,5 +20,5 @@ class HookMetricsMiddleware(BaseHTTPMiddleware):
 
         hooks_duration_ms.observe(dt_ms)
         if resp.status_code < 400:
-            hooks_ok.labels(path).inc()
+            hooks_ok.labels(route_label(request.scope)).inc()
         return resp
@@ -7,7 +7,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
-from axv_gw.metrics import rate_limit_dropped
+from axv_gw import runtime_config
+from axv_gw.metrics import rate_limit_buckets, rate_limit_dropped, route_label
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -15,15 +16,24 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     Sliding-window 60s rate limit per (client_ip, path).
     ENV:
       RATE_LIMIT_DEFAULT (int/min), RATE_LIMIT_HOOKS (int/min for /hooks/*)
+      RATE_LIMIT_HOOK_EVENTS (events/min for /hooks/batch — liczymy zdarzenia,
+      nie requesty: każdy request kosztuje 1 z góry, także źle podpisany,
+      a route dolicza resztę przez consume() po sparsowaniu batcha)
     429 JSON + Retry-After.
+    Limity można zmieniać w locie (RUNTIME_CONFIG_FILE); stan okien zostaje.
+    Okna bez wpisów młodszych niż `window` są sprzątane raz na okno — inaczej
+    każda para (IP, ścieżka) zostawałaby w pamięci na zawsze.
     """
 
+    BATCH_PATH = "/hooks/batch"
+
     def __init__(
         self,
         app,
         default_limit: int | None = None,
         hooks_limit: int | None = None,
         window_seconds: int = 60,
+        events_limit: int | None = None,
     ):
         super().__init__(app)
         self.window = window_seconds
@@ -38,8 +48,15 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 "RATE_LIMIT_HOOKS", str(hooks_limit if hooks_limit is not None else 5)
             )
         )
+        self.events_limit = int(
+            os.getenv(
+                "RATE_LIMIT_HOOK_EVENTS",
+                str(events_limit if events_limit is not None else 600),
+            )
+        )
         self.buckets: dict[tuple[str, str], deque[float]] = defaultdict(deque)
         self.lock = asyncio.Lock()
+        self._next_sweep = time.monotonic() + self.window
 
     def _client_ip(self, request: Request) -> str:
         xff = request.headers.get("x-forwarded-for")
@@ -55,32 +72,80 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             else "unknown"
         )
 
+    def limit_for(self, path: str) -> int:
+        cfg = runtime_config.current()
+        if path == self.BATCH_PATH:
+            return cfg.get_int("RATE_LIMIT_HOOK_EVENTS", self.events_limit)
+        if path.startswith("/hooks/"):
+            return cfg.get_int("RATE_LIMIT_HOOKS", self.hooks_limit)
+        return cfg.get_int("RATE_LIMIT_DEFAULT", self.default_limit)
+
+    def _sweep(self, now: float) -> None:
+        """Drop buckets whose newest entry left the window (O(buckets), once per window)."""
+        cutoff = now - self.window
+        stale = [key for key, dq in self.buckets.items() if not dq or dq[-1] <= cutoff]
+        for key in stale:
+            del self.buckets[key]
+        self._next_sweep = now + self.window
+        rate_limit_buckets.set(len(self.buckets))
+
+    def _take(self, key: tuple[str, str], limit: int, cost: int, now: float) -> int | None:
+        """Prune the window and take `cost` slots. Returns retry_after (s) if over limit."""
+        if now >= self._next_sweep:
+            self._sweep(now)
+        dq = self.buckets[key]
+        cutoff = now - self.window
+        while dq and dq[0] <= cutoff:
+            dq.popleft()
+
+        if len(dq) + max(cost, 1) > limit:
+            # Slot zwalnia się, gdy wygaśnie wpis nr (len + cost - limit)
+            idx = min(max(len(dq) + cost - limit - 1, 0), len(dq) - 1) if dq else -1
+            oldest = dq[idx] if idx >= 0 else now
+            return max(int(oldest + self.window - now) + 1, 1)
+        dq.extend([now] * cost)
+        return None
+
+    @staticmethod
+    def _reject(request: Request, retry_after: int) -> JSONResponse:
+        rate_limit_dropped.labels(path=route_label(request.scope)).inc()
+        return JSONResponse(
+            {
+                "ok": False,
+                "error": "rate_limited",
+                "retry_after_s": retry_after,
+            },
+            status_code=429,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def consume(self, request: Request, cost: int) -> JSONResponse | None:
+        """
+        Charge `cost` more units to the request's (client_ip, path) bucket.
+        Used by /hooks/batch once the number of events is known (the
+        request itself already paid one in dispatch).
+        Returns a 429 response when over the limit, else None.
+        """
+        path = request.url.path
+        key = (self._client_ip(request), path)
+        async with self.lock:
+            retry_after = self._take(key, self.limit_for(path), cost, time.monotonic())
+        return self._reject(request, retry_after) if retry_after is not None else None
+
     async def dispatch(self, request: Request, call_next):
         path = request.url.path
         client_ip = self._client_ip(request)
-        limit = self.hooks_limit if path.startswith("/hooks/") else self.default_limit
+        limit = self.limit_for(path)
+        cost = 1
 
         now = time.monotonic()
         key = (client_ip, path)
 
         async with self.lock:
-            dq = self.buckets[key]
-            cutoff = now - self.window
-            while dq and dq[0] <= cutoff:
-                dq.popleft()
-
-            if len(dq) >= limit:
-                retry_after = max(int(dq[0] + self.window - now) + 1, 1)
-                rate_limit_dropped.labels(path=path).inc()
-                return JSONResponse(
-                    {
-                        "ok": False,
-                        "error": "rate_limited",
-                        "retry_after_s": retry_after,
-                    },
-                    status_code=429,
-                    headers={"Retry-After": str(retry_after)},
-                )
-            dq.append(now)
+            retry_after = self._take(key, limit, cost, now)
+        if retry_after is not None:
+            return self._reject(request, retry_after)
 
+        if path == self.BATCH_PATH:
+            request.state.rate_limiter = self
         return await call_next(request)
@@ -0,0 +1,278 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from axv_gw.metrics import (
+    response_cache_bytes,
+    response_cache_entries,
+    response_cache_evictions,
+    response_cache_requests,
+)
+
+# Nagłówki odpowiedzi, których nie zapisujemy (per-request albo liczone od nowa)
+SKIP_HEADERS = frozenset({b"content-length", b"x-request-id", b"date", b"age", b"x-cache"})
+ENTRY_OVERHEAD = 256  # klucz, nagłówki i obiekty Pythona — przybliżenie
+
+
+@dataclass(frozen=True)
+class CacheRoute:
+    """`/status=5` (exact path) or `/axv/*=30` (prefix), TTL in seconds."""
+
+    pattern: str
+    ttl_s: float
+
+    def matches(self, path: str) -> bool:
+        if self.pattern.endswith("/*"):
+            prefix = self.pattern[:-2]
+            return path == prefix or path.startswith(prefix + "/")
+        return path == self.pattern
+
+
+@dataclass
+class CacheEntry:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    stored_at: float
+    expires_at: float
+    size: int
+
+
+def parse_routes(spec: str) -> list[CacheRoute]:
+    """RESPONSE_CACHE_ROUTES: comma-separated `path=ttl_s`; longest pattern first."""
+    routes = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        pattern, sep, ttl = item.rpartition("=")
+        if not sep or not pattern.startswith("/"):
+            raise ValueError(f"RESPONSE_CACHE_ROUTES: expected /path=ttl_s, got {item!r}")
+        routes.append(CacheRoute(pattern, float(ttl)))
+    return sorted(routes, key=lambda r: len(r.pattern), reverse=True)
+
+
+def normalise_query(query: str) -> str:
+    # ?b=2&a=1 i ?a=1&b=2 to ten sam wpis
+    return urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Opt-in cache odpowiedzi dla GET na wybranych trasach.
+    ENV:
+      RESPONSE_CACHE_ROUTES  np. "/status=2,/axv/*=10" (ścieżka lub prefiks /*, TTL w s)
+      RESPONSE_CACHE_MAX_MB  budżet pamięci (LRU po bajtach, domyślnie 32)
+      RESPONSE_CACHE_MAX_ENTRY_KB  większe odpowiedzi idą strumieniem, bez cache (1024)
+    Klucz: metoda, ścieżka, znormalizowane query i wartości nagłówków z `Vary`.
+    Zapisywane są tylko 200 bez Set-Cookie / no-store / private; żądania
+    z Authorization albo Cache-Control: no-cache omijają cache. Równoległe
+    missy tego samego klucza czekają na jedno wywołanie (coalescing).
+    Odpowiedź dostaje X-Cache: HIT / MISS i Age.
+    """
+
+    def __init__(
+        self,
+        app,
+        routes: str | None = None,
+        max_mb: float | None = None,
+        max_entry_kb: int | None = None,
+    ):
+        super().__init__(app)
+        self.routes = parse_routes(
+            routes if routes is not None else os.getenv("RESPONSE_CACHE_ROUTES", "")
+        )
+        self.max_bytes = int(
+            float(max_mb if max_mb is not None else os.getenv("RESPONSE_CACHE_MAX_MB", "32"))
+            * 1024
+            * 1024
+        )
+        self.max_entry_bytes = 1024 * int(
+            max_entry_kb
+            if max_entry_kb is not None
+            else os.getenv("RESPONSE_CACHE_MAX_ENTRY_KB", "1024")
+        )
+        self.entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self.size = 0
+        # (metoda, ścieżka, query) -> nazwy nagłówków z Vary ostatniej odpowiedzi
+        self.vary: dict[tuple[str, str, str], tuple[str, ...]] = {}
+        self.variants: dict[tuple[str, str, str], int] = {}
+        # klucz -> (wynik lidera, nagłówki żądania lidera)
+        self.inflight: dict[tuple, tuple[asyncio.Future, Headers]] = {}
+
+    def _route_for(self, path: str) -> CacheRoute | None:
+        for route in self.routes:
+            if route.matches(path):
+                return route
+        return None
+
+    def _key(self, request: Request, base: tuple[str, str, str]) -> tuple:
+        names = self.vary.get(base, ())
+        return (*base, tuple(request.headers.get(name, "") for name in names))
+
+    @staticmethod
+    def _vary_names(headers: list[tuple[bytes, bytes]]) -> tuple[str, ...]:
+        vary = dict(headers).get(b"vary", b"").decode("latin-1")
+        return tuple(sorted({name.strip().lower() for name in vary.split(",") if name.strip()}))
+
+    def _same_variant(self, entry: CacheEntry, request: Request, leader: Headers) -> bool:
+        # Przed pierwszym zapisem (albo po wygaśnięciu wszystkich wariantów) klucz
+        # nie zawiera wartości z Vary — porównujemy je z żądaniem lidera
+        return all(
+            request.headers.get(name, "") == leader.get(name, "")
+            for name in self._vary_names(entry.headers)
+        )
+
+    def _bypass(self, request: Request) -> bool:
+        cc = request.headers.get("cache-control", "").lower()
+        return "authorization" in request.headers or "no-cache" in cc or "no-store" in cc
+
+    async def dispatch(self, request: Request, call_next):
+        route = self._route_for(request.url.path) if request.method == "GET" else None
+        if route is None:
+            return await call_next(request)
+        if self._bypass(request):
+            response_cache_requests.labels(route=route.pattern, result="bypass").inc()
+            return await call_next(request)
+
+        base = ("GET", request.url.path, normalise_query(request.url.query))
+        key = self._key(request, base)
+        now = time.monotonic()
+        entry = self._lookup(key, now)
+        if entry is not None:
+            response_cache_requests.labels(route=route.pattern, result="hit").inc()
+            return self._from_entry(entry, now, "HIT")
+
+        pending = self.inflight.get(key)
+        if pending is not None:
+            future, leader = pending
+            entry = await asyncio.shield(future)
+            if entry is not None and self._same_variant(entry, request, leader):
+                response_cache_requests.labels(route=route.pattern, result="coalesced").inc()
+                return self._from_entry(entry, time.monotonic(), "HIT")
+            # Lider nie dostał odpowiedzi do zapisania albo to inny wariant — każdy pyta sam
+            response_cache_requests.labels(route=route.pattern, result="miss").inc()
+            return await call_next(request)
+
+        response_cache_requests.labels(route=route.pattern, result="miss").inc()
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = (future, request.headers)
+        entry = None
+        try:
+            response = await call_next(request)
+            entry, response = await self._capture(response)
+            if entry is not None:
+                entry.expires_at = entry.stored_at + route.ttl_s
+                self._store(request, base, entry)
+        finally:
+            del self.inflight[key]
+            future.set_result(entry)
+        if entry is not None:
+            return self._from_entry(entry, entry.stored_at, "MISS")
+        return response
+
+    async def _capture(self, response: Response) -> tuple[CacheEntry | None, Response]:
+        """Read a cacheable response into memory; anything else is passed through."""
+        cc = response.headers.get("cache-control", "").lower()
+        if (
+            response.status_code != 200
+            or "set-cookie" in response.headers
+            or "no-store" in cc
+            or "private" in cc
+            or response.headers.get("vary", "").strip() == "*"
+        ):
+            return None, response
+
+        chunks: list[bytes] = []
+        size = 0
+        iterator = response.body_iterator
+        async for chunk in iterator:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(response.charset)
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > self.max_entry_bytes:
+                return None, self._resume(response, chunks, iterator)
+
+        headers = [(k, v) for k, v in response.raw_headers if k not in SKIP_HEADERS]
+        body = b"".join(chunks)
+        entry = CacheEntry(
+            status=response.status_code,
+            headers=headers,
+            body=body,
+            stored_at=time.monotonic(),
+            expires_at=0.0,
+            size=len(body) + sum(len(k) + len(v) for k, v in headers) + ENTRY_OVERHEAD,
+        )
+        return entry, response
+
+    @staticmethod
+    def _resume(response: Response, head: list[bytes], rest) -> Response:
+        # Za duże na cache: oddajemy to co już przeczytane + resztę strumieniem
+        async def body():
+            for chunk in head:
+                yield chunk
+            async for chunk in rest:
+                yield chunk
+
+        resumed = StreamingResponse(body(), status_code=response.status_code)
+        resumed.raw_headers = response.raw_headers
+        resumed.background = response.background
+        return resumed
+
+    def _lookup(self, key: tuple, now: float) -> CacheEntry | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._evict(key, "expired")
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def _store(self, request: Request, base: tuple[str, str, str], entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        self.vary[base] = self._vary_names(entry.headers)
+        key = self._key(request, base)
+        if key in self.entries:
+            self._evict(key, "replaced")
+        self.entries[key] = entry
+        self.size += entry.size
+        self.variants[base] = self.variants.get(base, 0) + 1
+        while self.size > self.max_bytes:
+            self._evict(next(iter(self.entries)), "capacity")
+        response_cache_entries.set(len(self.entries))
+        response_cache_bytes.set(self.size)
+
+    def _evict(self, key: tuple, reason: str) -> None:
+        entry = self.entries.pop(key)
+        self.size -= entry.size
+        base = key[:3]
+        self.variants[base] -= 1
+        if not self.variants[base]:
+            del self.variants[base]
+            if reason != "replaced":  # zaraz wraca wpis z tym samym Vary
+                self.vary.pop(base, None)
+        response_cache_evictions.labels(reason=reason).inc()
+        response_cache_entries.set(len(self.entries))
+        response_cache_bytes.set(self.size)
+
+    @staticmethod
+    def _from_entry(entry: CacheEntry, now: float, state: str) -> Response:
+        response = Response(entry.body, status_code=entry.status)
+        response.raw_headers = [
+            *entry.headers,
+            (b"content-length", str(len(entry.body)).encode()),
+            (b"age", str(int(now - entry.stored_at)).encode()),
+            (b"x-cache", state.encode()),
+        ]
+        return response
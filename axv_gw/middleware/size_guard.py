@@ -4,18 +4,26 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+from axv_gw import runtime_config
+
 
 class RequestSizeGuardMiddleware(BaseHTTPMiddleware):
     """
     Blokuje zbyt duże body dla metod modyfikujących (POST/PUT/PATCH).
     ENV: MAX_BODY_KB (domyślnie 64). Używa nagłówka Content-Length.
+    ENV: MAX_BATCH_BODY_KB (domyślnie 1024) dla /hooks/batch — route pilnuje
+    go też przy streamingu (chunked, bez Content-Length).
     Gdy > limit -> 413 + JSON {"ok":false,"error":"body_too_large","limit_kb":N}.
+    Oba limity nadpisuje w locie RUNTIME_CONFIG_FILE.
     """
 
-    def __init__(self, app, default_kb: int = 64):
+    BATCH_PATH = "/hooks/batch"
+
+    def __init__(self, app, default_kb: int = 64, batch_kb: int = 1024):
         super().__init__(app)
         self.limit_kb = int(os.getenv("MAX_BODY_KB", str(default_kb)))
         self.limit_bytes = self.limit_kb * 1024
+        self.batch_limit_kb = int(os.getenv("MAX_BATCH_BODY_KB", str(batch_kb)))
 
     async def dispatch(self, request: Request, call_next):
         if request.method.upper() in ("POST", "PUT", "PATCH"):
@@ -24,9 +32,14 @@ class RequestSizeGuardMiddleware(BaseHTTPMiddleware):
                 clen = int(cl) if cl is not None else None
             except ValueError:
                 clen = None
-            if clen is not None and clen > self.limit_bytes:
+            cfg = runtime_config.current()
+            if request.url.path == self.BATCH_PATH:
+                limit_kb = cfg.get_int("MAX_BATCH_BODY_KB", self.batch_limit_kb)
+            else:
+                limit_kb = cfg.get_int("MAX_BODY_KB", self.limit_kb)
+            if clen is not None and clen > limit_kb * 1024:
                 return JSONResponse(
-                    {"ok": False, "error": "body_too_large", "limit_kb": self.limit_kb},
+                    {"ok": False, "error": "body_too_large", "limit_kb": limit_kb},
                     status_code=413,
                 )
         return await call_next(request)
@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import os
+import signal
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+
+from axv_gw.metrics import config_reloads, config_version
+
+logger = logging.getLogger(__name__)
+
+# Wartości liczbowe czytane przez middleware (zmienne ENV o tych samych nazwach
+# to wartości startowe; plik runtime je nadpisuje).
+INT_KEYS = frozenset(
+    {
+        "RATE_LIMIT_DEFAULT",
+        "RATE_LIMIT_HOOKS",
+        "RATE_LIMIT_HOOK_EVENTS",
+        "HMAC_MAX_SKEW_S",
+        "MAX_BODY_KB",
+        "MAX_BATCH_BODY_KB",
+    }
+)
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """
+    Immutable snapshot of the runtime overrides file.
+
+    `values` holds every KEY=VALUE of the file, `ints` the middleware knobs
+    (INT_KEYS) already parsed. A key missing from the file means "use the
+    value the component was built with" (environment / constructor default).
+    """
+
+    values: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    ints: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+    version: int = 0
+    loaded_at: float = 0.0
+
+    def get_int(self, key: str, default: int) -> int:
+        return self.ints.get(key, default)
+
+
+# Prepare hooks run before a new snapshot is published; they may raise
+# ValueError to reject it and return a commit callback applied after the swap.
+Prepare = Callable[[RuntimeConfig, RuntimeConfig], Callable[[], None] | None]
+
+_current = RuntimeConfig()
+_subscribers: list[Prepare] = []
+_lock = threading.Lock()
+
+
+def current() -> RuntimeConfig:
+    """The active snapshot. Read it once per request, never cache it."""
+    return _current
+
+
+def env_int(key: str, default: int) -> int:
+    """Runtime override, else environment variable, else `default`."""
+    return _current.get_int(key, int(os.getenv(key, str(default))))
+
+
+def config_path() -> Path | None:
+    path = os.getenv("RUNTIME_CONFIG_FILE", "")
+    return Path(path) if path else None
+
+
+def subscribe(prepare: Prepare) -> Prepare:
+    _subscribers.append(prepare)
+    return prepare
+
+
+def parse(text: str) -> dict[str, str]:
+    """dotenv-style KEY=VALUE lines; '#' comments, optional quotes."""
+    values = {}
+    for n, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        key, sep, value = line.removeprefix("export ").partition("=")
+        key, value = key.strip(), value.strip()
+        if not sep or not key:
+            raise ValueError(f"line {n}: expected KEY=VALUE")
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        values[key] = value
+    return values
+
+
+def build(values: Mapping[str, str], version: int) -> RuntimeConfig:
+    ints = {}
+    for key in INT_KEYS & values.keys():
+        try:
+            ints[key] = int(values[key])
+        except ValueError:
+            raise ValueError(f"{key} must be an integer, got {values[key]!r}") from None
+        if ints[key] < 0:
+            raise ValueError(f"{key} must be >= 0")
+    return RuntimeConfig(
+        values=MappingProxyType(dict(values)),
+        ints=MappingProxyType(ints),
+        version=version,
+        loaded_at=time.time(),
+    )
+
+
+def apply(values: Mapping[str, str]) -> bool:
+    """
+    Validate and publish a new snapshot.
+
+    All subscribers prepare first; if any rejects the values nothing changes.
+    Then the reference is swapped (readers see either the old or the new
+    snapshot, never a mix) and the commit callbacks carry state over.
+    """
+    global _current
+    with _lock:
+        old = _current
+        if dict(values) == dict(old.values) and old.version:
+            config_reloads.labels(result="unchanged").inc()
+            return False
+        try:
+            new = build(values, old.version + 1)
+            commits = [c for prepare in _subscribers if (c := prepare(old, new))]
+        except ValueError as e:
+            logger.error(f"Runtime config rejected, keeping version {old.version}: {e}")
+            config_reloads.labels(result="error").inc()
+            return False
+        _current = new
+        for commit in commits:
+            try:
+                commit()
+            except Exception:
+                logger.exception("Runtime config commit failed")
+        config_version.set(new.version)
+        config_reloads.labels(result="ok").inc()
+        logger.info(f"Runtime config version {new.version} active ({len(values)} keys)")
+        return True
+
+
+def reload() -> bool:
+    """Re-read RUNTIME_CONFIG_FILE (no file configured = nothing to do)."""
+    path = config_path()
+    if path is None:
+        return False
+    try:
+        values = parse(path.read_text()) if path.exists() else {}
+    except (OSError, ValueError) as e:
+        logger.error(f"Cannot read runtime config {path}: {e}")
+        config_reloads.labels(result="error").inc()
+        return False
+    return apply(values)
+
+
+class ConfigWatcher:
+    """
+    Triggers reload() on SIGHUP and when the file's mtime/size changes.
+    ENV:
+      RUNTIME_CONFIG_FILE – plik KEY=VALUE (puste = wyłączone)
+      RUNTIME_CONFIG_WATCH_S (domyślnie 5; 0 = tylko SIGHUP)
+    """
+
+    def __init__(self, *, watch_s: float | None = None):
+        self.path = config_path()
+        self.watch_s = float(
+            os.getenv("RUNTIME_CONFIG_WATCH_S", str(watch_s if watch_s is not None else 5))
+        )
+        self._task: asyncio.Task | None = None
+        self._sighup = False
+        self._stamp = self._stat()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat() if self.path else None
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size) if st else None
+
+    async def start(self) -> None:
+        if self.path is None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGHUP, reload)
+            self._sighup = True
+        except (ValueError, RuntimeError, NotImplementedError):
+            # Nie w głównym wątku (np. TestClient) albo brak SIGHUP na platformie
+            pass
+        if self.watch_s > 0:
+            self._task = asyncio.create_task(self._watch(), name="axv-gw-config-watch")
+
+    async def stop(self) -> None:
+        if self._sighup:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+            self._sighup = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.watch_s)
+            stamp = self._stat()
+            if stamp != self._stamp:
+                self._stamp = stamp
+                reload()
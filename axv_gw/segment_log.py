@@ -0,0 +1,283 @@
+import asyncio
+import fcntl
+import logging
+import os
+import struct
+import time
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+
+from axv_gw.metrics import hooks_queue_fsync_seconds
+
+logger = logging.getLogger(__name__)
+
+# Ramka rekordu: długość payloadu, numer sekwencyjny, crc32 payloadu.
+HEADER = struct.Struct("<IQI")
+SEGMENT_SUFFIX = ".seg"
+CHECKPOINT_NAME = "checkpoint"
+LOCK_NAME = "lock"
+
+
+class SegmentLog:
+    """
+    Append-only, segmented record log with fsync batching (group commit).
+
+    - append() writes the frame immediately and resolves once a batched fsync
+      covering it has completed (after `fsync_interval` or `fsync_batch`
+      pending appends, whichever comes first)
+    - ack(seq) marks a record processed; the contiguous acked prefix is the
+      committed watermark, persisted to `checkpoint` after each fsync and
+      every `checkpoint_interval` seconds while idle
+    - open() recovers after a crash: truncates a torn tail, returns records
+      above the watermark (at-least-once) and deletes fully committed segments
+    - one process owns the directory (flock on `lock`, released on close());
+      open() fails fast when another one holds it
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        segment_bytes: int = 8 * 1024 * 1024,
+        fsync_interval: float = 0.005,
+        fsync_batch: int = 256,
+        checkpoint_interval: float = 1.0,
+    ):
+        self.dir = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.checkpoint_interval = checkpoint_interval
+
+        self.next_seq = 1
+        self.committed = 0
+        self._acked: set[int] = set()
+        self._checkpointed = 0
+
+        # (first_seq, path) of every live segment, the last one being written
+        self._segments: list[tuple[int, Path]] = []
+        self._fd: int | None = None
+        self._lock_fd: int | None = None
+        self._seg_size = 0
+        self._unsynced_fds: list[int] = []
+
+        self._waiters: list[asyncio.Future] = []
+        self._pending = asyncio.Event()
+        self._flush_now = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+
+    @property
+    def depth(self) -> int:
+        """Records appended but not yet committed."""
+        return self.next_seq - 1 - self.committed
+
+    # --- recovery ----------------------------------------------------------
+
+    def open(self) -> list[tuple[int, bytes]]:
+        """Recover state from disk. Returns uncommitted (seq, payload) records."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock()
+        self.committed = self._read_checkpoint()
+        self._checkpointed = self.committed
+
+        pending: list[tuple[int, bytes]] = []
+        max_seq = self.committed
+        paths = sorted(self.dir.glob(f"*{SEGMENT_SUFFIX}"))
+        for i, path in enumerate(paths):
+            records, good_size = self._read_segment(path)
+            if good_size < path.stat().st_size:
+                # Niedokończony zapis (crash w trakcie append) — ucinamy ogon.
+                logger.warning(f"Truncating torn tail of {path.name} at {good_size} bytes")
+                os.truncate(path, good_size)
+            first = records[0][0] if records else None
+            for seq, payload in records:
+                max_seq = max(max_seq, seq)
+                if seq > self.committed:
+                    pending.append((seq, payload))
+            if first is None:
+                path.unlink()
+                continue
+            self._segments.append((first, path))
+
+        self.next_seq = max_seq + 1
+        self._gc_segments()
+        self._open_segment()
+        return pending
+
+    def _lock(self) -> None:
+        # Dwa procesy na jednym katalogu = zdublowane seq, nazwy segmentów i GC
+        fd = os.open(self.dir / LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            raise RuntimeError(f"segment log {self.dir} is in use by another process") from None
+        self._lock_fd = fd
+
+    def _read_checkpoint(self) -> int:
+        try:
+            return int((self.dir / CHECKPOINT_NAME).read_text().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    @staticmethod
+    def _read_segment(path: Path) -> tuple[list[tuple[int, bytes]], int]:
+        data = path.read_bytes()
+        records = []
+        off = 0
+        while off + HEADER.size <= len(data):
+            length, seq, crc = HEADER.unpack_from(data, off)
+            end = off + HEADER.size + length
+            if end > len(data):
+                break
+            payload = data[off + HEADER.size : end]
+            if zlib.crc32(payload) != crc:
+                break
+            records.append((seq, payload))
+            off = end
+        return records, off
+
+    # --- writing -----------------------------------------------------------
+
+    def _open_segment(self) -> None:
+        path = self.dir / f"{self.next_seq:020d}{SEGMENT_SUFFIX}"
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._seg_size = os.fstat(self._fd).st_size
+        if not self._segments or self._segments[-1][1] != path:
+            self._segments.append((self.next_seq, path))
+
+    def _rotate(self) -> None:
+        # Stary fd zostaje do najbliższego fsync — tam są jeszcze niezsynchronizowane dane.
+        self._unsynced_fds.append(self._fd)
+        self._fd = None
+        self._open_segment()
+
+    def start(self) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop(), name="axv-gw-segment-flush")
+
+    async def append(self, payload: bytes, on_written: Callable[[int], None] | None = None) -> int:
+        """
+        Append one record; returns its sequence number once it is durable.
+
+        `on_written(seq)` runs as soon as the frame is in the file, before the
+        fsync wait: the record is on disk from that point on, so the caller
+        must register it for delivery even if the wait is cancelled or the
+        fsync fails — otherwise its seq is never acked and the watermark stops.
+        """
+        if self._fd is None:
+            raise RuntimeError("segment log is not open")
+        if self._seg_size >= self.segment_bytes:
+            self._rotate()
+
+        seq = self.next_seq
+        frame = HEADER.pack(len(payload), seq, zlib.crc32(payload)) + payload
+        view = memoryview(frame)
+        while view:
+            view = view[os.write(self._fd, view) :]
+        self.next_seq += 1
+        self._seg_size += len(frame)
+        if on_written is not None:
+            on_written(seq)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        self._pending.set()
+        if len(self._waiters) >= self.fsync_batch:
+            self._flush_now.set()
+        await fut
+        return seq
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._pending.wait(), self.checkpoint_interval)
+            except TimeoutError:
+                # Bez appendów: acki z tego czasu też trafiają do checkpointu i GC.
+                self._write_checkpoint()
+                self._gc_segments()
+                continue
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.fsync_interval)
+            except TimeoutError:
+                pass
+            await self.flush()
+
+    async def flush(self) -> None:
+        """fsync everything written so far and wake the waiting appends."""
+        self._pending.clear()
+        self._flush_now.clear()
+        waiters, self._waiters = self._waiters, []
+        fds, self._unsynced_fds = self._unsynced_fds, []
+        current = self._fd
+
+        t0 = time.perf_counter()
+        try:
+            await asyncio.to_thread(_fsync_all, [*fds, *([current] if current else [])])
+        except OSError as e:
+            logger.error(f"Segment log fsync failed: {e}")
+            for w in waiters:
+                if not w.done():
+                    w.set_exception(e)
+            return
+        finally:
+            for fd in fds:
+                os.close(fd)
+        hooks_queue_fsync_seconds.observe(time.perf_counter() - t0)
+
+        for w in waiters:
+            if not w.done():
+                w.set_result(None)
+        self._write_checkpoint()
+        self._gc_segments()
+
+    # --- consuming ---------------------------------------------------------
+
+    def ack(self, seq: int) -> None:
+        """Mark `seq` processed; advances the committed watermark when contiguous."""
+        if seq <= self.committed:
+            return
+        self._acked.add(seq)
+        while self.committed + 1 in self._acked:
+            self._acked.discard(self.committed + 1)
+            self.committed += 1
+
+    def _write_checkpoint(self) -> None:
+        if self.committed == self._checkpointed:
+            return
+        # Bez fsync: utrata checkpointu = ponowne dostarczenie (at-least-once).
+        tmp = self.dir / f"{CHECKPOINT_NAME}.tmp"
+        tmp.write_text(str(self.committed))
+        os.replace(tmp, self.dir / CHECKPOINT_NAME)
+        self._checkpointed = self.committed
+
+    def _gc_segments(self) -> None:
+        # Segment i jest w pełni zatwierdzony, gdy następny zaczyna się <= committed + 1.
+        while len(self._segments) > 1 and self._segments[1][0] - 1 <= self._checkpointed:
+            _, path = self._segments.pop(0)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        if self._fd is not None:
+            await self.flush()
+            os.close(self._fd)
+            self._fd = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)  # zwalnia flock
+            self._lock_fd = None
+
+
+def _fsync_all(fds: list[int]) -> None:
+    for fd in fds:
+        os.fsync(fd)
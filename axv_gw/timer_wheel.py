@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import math
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class Timer:
+    """Handle returned by TimerWheel.schedule(); cancel() is O(1)."""
+
+    __slots__ = ("callback", "args", "rounds", "cancelled")
+
+    def __init__(self, callback: Callable[..., Any], args: tuple, rounds: int):
+        self.callback = callback
+        self.args = args
+        self.rounds = rounds
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel: any number of pending timers driven by one task.
+
+    - schedule(delay, cb, *args) is O(1): the timer goes into slot
+      (cursor + ticks) % slots with the number of full turns left
+    - every `tick` seconds the driver advances the cursor and fires the due
+      timers of that slot; callbacks run on the event loop and must not block
+    - resolution is one tick (timers fire up to `tick` late, never early by
+      more than that); the driver sleeps while the wheel is empty
+    """
+
+    def __init__(self, tick: float = 0.05, slots: int = 512):
+        self.tick = tick
+        self._slots: list[list[Timer]] = [[] for _ in range(slots)]
+        self._cursor = 0
+        self._count = 0
+        self._wakeup = asyncio.Event()
+        self._driver: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        """Scheduled timers (cancelled ones count until their slot comes up)."""
+        return self._count
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        ticks = max(1, math.ceil(delay / self.tick))
+        n = len(self._slots)
+        timer = Timer(callback, args, (ticks - 1) // n)
+        self._slots[(self._cursor + ticks) % n].append(timer)
+        self._count += 1
+        self._wakeup.set()
+        return timer
+
+    def advance(self) -> int:
+        """Move the cursor one tick and fire what is due. Returns timers fired."""
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        bucket = self._slots[self._cursor]
+        if not bucket:
+            return 0
+
+        keep: list[Timer] = []
+        due: list[Timer] = []
+        for t in bucket:
+            if t.cancelled:
+                self._count -= 1
+            elif t.rounds:
+                t.rounds -= 1
+                keep.append(t)
+            else:
+                due.append(t)
+        self._slots[self._cursor] = keep
+        self._count -= len(due)
+
+        for t in due:
+            try:
+                t.callback(*t.args)
+            except Exception:
+                logger.exception("Timer callback failed")
+        return len(due)
+
+    def start(self) -> None:
+        if self._driver is None:
+            self._driver = asyncio.create_task(self._drive(), name="axv-gw-timer-wheel")
+
+    async def stop(self) -> None:
+        if self._driver is not None:
+            self._driver.cancel()
+            try:
+                await self._driver
+            except asyncio.CancelledError:
+                pass
+            self._driver = None
+
+    async def _drive(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.tick
+        while True:
+            if not self._count:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                next_tick = loop.time() + self.tick
+            await asyncio.sleep(max(next_tick - loop.time(), 0))
+            # Po przycięciu pętli nadrabiamy wszystkie zaległe ticki naraz.
+            now = loop.time()
+            while next_tick <= now:
+                self.advance()
+                next_tick += self.tick
@@ -0,0 +1 @@
+"""In-process performance benchmarks for the gateway."""
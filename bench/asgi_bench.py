@@ -0,0 +1,441 @@
+"""
+In-process ASGI benchmark suite with regression gates.
+
+Drives ``app.main:create_app()`` directly through the ASGI interface (no
+sockets, no HTTP client) so the numbers reflect the gateway's own middleware
+and handler cost.
+
+Usage:
+    python -m bench.asgi_bench                       # run all, compare to baseline
+    python -m bench.asgi_bench -s healthz,metrics -n 5000
+    python -m bench.asgi_bench --save-baseline       # overwrite bench/baseline.json
+    python -m bench.asgi_bench --threshold 0.15      # fail on >15% regression
+
+Exit code 1 when any scenario regresses past the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+os.environ.setdefault("AXV_HMAC_SECRET", "bench-secret")
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+# Metrics compared against the baseline: name -> True if "higher is better".
+GATED_METRICS = {"rps": True, "p99_ms": False, "alloc_peak_kib": False, "ttf200_ms": False}
+
+# Measured in fresh subprocesses by bench.coldstart, not through run_scenario().
+COLD_START = "cold_start"
+
+
+# --- raw ASGI driver ---------------------------------------------------------
+
+
+@dataclass
+class ASGIResponse:
+    status: int = 0
+    headers: list[tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+
+
+async def asgi_request(
+    app,
+    method: str,
+    path: str,
+    *,
+    headers: dict[str, str] | None = None,
+    body: bytes = b"",
+    query_string: bytes = b"",
+    client: tuple[str, int] = ("127.0.0.1", 50000),
+) -> ASGIResponse:
+    """Send one HTTP request through an ASGI app and collect the response."""
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    if body and not any(k == b"content-length" for k, _ in raw_headers):
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string,
+        "root_path": "",
+        "headers": raw_headers,
+        "client": client,
+        "server": ("bench", 80),
+    }
+    response = ASGIResponse()
+    chunks: list[bytes] = []
+    done = asyncio.Event()
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response.status = message["status"]
+            response.headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(scope, receive, send)
+    done.set()
+    response.body = b"".join(chunks)
+    return response
+
+
+# --- scenarios ---------------------------------------------------------------
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+
+@dataclass
+class Scenario:
+    name: str
+    make_request: Callable[[int], Request]
+    expect_status: int = 200
+    # Called before every measured request (e.g. to invalidate a cache).
+    before_each: Callable[[], None] | None = None
+    # Called once before warmup, with the app (e.g. to exhaust a rate limit).
+    prepare: Callable[[object], object] | None = None
+
+
+def client_ip(i: int) -> str:
+    """Unique client IP per request so the rate limiter never rejects."""
+    return f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+
+def sign(ts: str, body: bytes) -> str:
+    secret = os.environ["AXV_HMAC_SECRET"].encode()
+    return "sha256=" + hmac.new(secret, ts.encode() + b"." + body, hashlib.sha256).hexdigest()
+
+
+def hook_body(size: int) -> bytes:
+    """JSON object padded to roughly `size` bytes."""
+    head = b'{"source":"bench","ping":true,"pad":"'
+    tail = b'"}'
+    return head + b"x" * max(size - len(head) - len(tail), 0) + tail
+
+
+def _get(path: str) -> Callable[[int], Request]:
+    return lambda i: Request("GET", path, {"X-Forwarded-For": client_ip(i)})
+
+
+def _signed_ping(size: int) -> Callable[[int], Request]:
+    body = hook_body(size)
+
+    def make(i: int) -> Request:
+        ts = str(int(time.time()))
+        return Request(
+            "POST",
+            "/hooks/ping",
+            {
+                "X-Forwarded-For": client_ip(i),
+                "Content-Type": "application/json",
+                "X-AXV-Timestamp": ts,
+                "X-AXV-Signature": sign(ts, body),
+            },
+            body,
+        )
+
+    return make
+
+
+def _invalidate_front_cache() -> None:
+    import app.routers.front as front
+
+    front._cache = None
+    front._cache_timestamp = None
+
+
+REJECT_IP = "203.0.113.250"
+
+
+async def _exhaust_rate_limit(app) -> None:
+    headers = {"X-Forwarded-For": REJECT_IP}
+    for _ in range(10_000):
+        r = await asgi_request(app, "GET", "/front/status", headers=headers)
+        if r.status == 429:
+            return
+    raise RuntimeError("rate limit never triggered")
+
+
+SCENARIOS: dict[str, Scenario] = {
+    s.name: s
+    for s in [
+        Scenario("healthz", _get("/healthz")),
+        Scenario("front_status_hit", _get("/front/status")),
+        Scenario("front_status_miss", _get("/front/status"), before_each=_invalidate_front_cache),
+        Scenario("hooks_ping_256b", _signed_ping(256)),
+        Scenario("hooks_ping_4kib", _signed_ping(4 * 1024)),
+        Scenario("hooks_ping_32kib", _signed_ping(32 * 1024)),
+        Scenario(
+            "rate_limit_reject",
+            lambda i: Request("GET", "/front/status", {"X-Forwarded-For": REJECT_IP}),
+            expect_status=429,
+            prepare=_exhaust_rate_limit,
+        ),
+        Scenario("metrics", _get("/metrics")),
+    ]
+}
+
+
+# --- runner ------------------------------------------------------------------
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+async def _one(app, scenario: Scenario, i: int) -> int:
+    if scenario.before_each is not None:
+        scenario.before_each()
+    req = scenario.make_request(i)
+    r = await asgi_request(app, req.method, req.path, headers=req.headers, body=req.body)
+    if r.status != scenario.expect_status:
+        raise RuntimeError(
+            f"{scenario.name}: expected {scenario.expect_status}, got {r.status}: {r.body[:200]!r}"
+        )
+    return r.status
+
+
+async def run_scenario(
+    app,
+    scenario: Scenario,
+    *,
+    requests: int = 2000,
+    warmup: int = 200,
+    concurrency: int = 1,
+    alloc_samples: int = 200,
+    seq_start: int = 0,
+) -> dict:
+    """Run one scenario and return its measurements."""
+    if scenario.prepare is not None:
+        await scenario.prepare(app)
+
+    seq = seq_start
+    for _ in range(warmup):
+        await _one(app, scenario, seq)
+        seq += 1
+
+    latencies: list[float] = []
+    next_i = seq
+
+    async def worker(count: int):
+        nonlocal next_i
+        for _ in range(count):
+            i = next_i
+            next_i += 1
+            t0 = time.perf_counter_ns()
+            await _one(app, scenario, i)
+            latencies.append((time.perf_counter_ns() - t0) / 1e6)
+
+    per_worker = [requests // concurrency] * concurrency
+    per_worker[0] += requests - sum(per_worker)
+    t_start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in per_worker))
+    elapsed = time.perf_counter() - t_start
+
+    # Separate pass so tracing overhead does not skew latency numbers.
+    peaks: list[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(alloc_samples, requests)):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            await _one(app, scenario, next_i)
+            next_i += 1
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "rps": round(requests / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 4),
+        "p50_ms": round(percentile(latencies, 0.50), 4),
+        "p90_ms": round(percentile(latencies, 0.90), 4),
+        "p99_ms": round(percentile(latencies, 0.99), 4),
+        "max_ms": round(latencies[-1], 4),
+        "alloc_peak_kib": round(statistics.fmean(peaks) / 1024, 2) if peaks else 0.0,
+        "_next_seq": next_i,
+    }
+
+
+async def run_suite(
+    names: list[str],
+    *,
+    requests: int,
+    warmup: int,
+    concurrency: int,
+    alloc_samples: int = 200,
+) -> dict[str, dict]:
+    from app.main import create_app
+
+    app = create_app()
+    results: dict[str, dict] = {}
+    seq = 0
+    for name in names:
+        if name == COLD_START:
+            from bench.coldstart import measure
+
+            results[name] = await asyncio.to_thread(measure, 3)
+            continue
+        res = await run_scenario(
+            app,
+            SCENARIOS[name],
+            requests=requests,
+            warmup=warmup,
+            concurrency=concurrency,
+            alloc_samples=alloc_samples,
+            seq_start=seq,
+        )
+        seq = res.pop("_next_seq")
+        results[name] = res
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """Return human-readable regressions of `results` against `baseline`."""
+    regressions: list[str] = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric, higher_is_better in GATED_METRICS.items():
+            old, new = base.get(metric), res.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append(
+                    f"{name}.{metric}: {old} -> {new} ({change:+.1%}, limit {threshold:.0%})"
+                )
+    return regressions
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text()).get("scenarios", {})
+
+
+def save_baseline(path: Path, results: dict[str, dict]) -> None:
+    doc = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": int(time.time()),
+        },
+        "scenarios": results,
+    }
+    path.write_text(json.dumps(doc, indent=2, sort_keys=True) + "\n")
+
+
+def _quiet_logging() -> None:
+    # Access logs still get formatted, but go nowhere.
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(logging.StreamHandler(open(os.devnull, "w")))
+
+
+def _print_table(results: dict[str, dict]) -> None:
+    cols = ["rps", "p50_ms", "p90_ms", "p99_ms", "alloc_peak_kib", "ttf200_ms"]
+    print(f"{'scenario':<22}" + "".join(f"{c:>16}" for c in cols))
+    for name, res in results.items():
+        print(f"{name:<22}" + "".join(f"{res.get(c, '-'):>16}" for c in cols))
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("-s", "--scenarios", default=",".join([*SCENARIOS, COLD_START]))
+    p.add_argument("-n", "--requests", type=int, default=2000)
+    p.add_argument("-w", "--warmup", type=int, default=200)
+    p.add_argument("-c", "--concurrency", type=int, default=1)
+    p.add_argument("--alloc-samples", type=int, default=200)
+    p.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    p.add_argument("--save-baseline", action="store_true")
+    p.add_argument(
+        "--threshold",
+        type=float,
+        default=float(os.getenv("BENCH_REGRESSION_THRESHOLD", DEFAULT_THRESHOLD)),
+        help="allowed relative regression (0.25 = 25%%)",
+    )
+    p.add_argument("--json", type=Path, help="write results to this file")
+    args = p.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS and n != COLD_START]
+    if unknown:
+        p.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    _quiet_logging()
+    results = asyncio.run(
+        run_suite(
+            names,
+            requests=args.requests,
+            warmup=args.warmup,
+            concurrency=args.concurrency,
+            alloc_samples=args.alloc_samples,
+        )
+    )
+    _print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Cold-start benchmark: import-time report and time-to-first-200.
+
+Each run spawns a fresh interpreter that imports ``app.main``, runs the app
+lifespan (pre-warming included) and sends the first ``GET /front/status``
+through ASGI. Time-to-first-200 is measured from process spawn, so it
+includes interpreter startup.
+
+Usage:
+    python -m bench.coldstart                  # 5 runs, median, top imports
+    python -m bench.coldstart --budget-ms 1500 # exit 1 when over budget
+    python -m bench.coldstart --top 30         # longer import-time report
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 2000
+
+
+def _child() -> None:
+    t0 = time.perf_counter()
+    import logging
+
+    logging.disable(logging.INFO)
+    from app.main import create_app
+    from bench.asgi_bench import asgi_request
+
+    app = create_app()
+    t_import = time.perf_counter()
+
+    async def first_request() -> tuple[float, int]:
+        async with app.router.lifespan_context(app):
+            t_ready = time.perf_counter()
+            r = await asgi_request(app, "GET", "/front/status")
+            return t_ready, r.status
+
+    t_ready, status = asyncio.run(first_request())
+    t_200 = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "wall_200": time.time(),
+                "status": status,
+                "import_ms": (t_import - t0) * 1000,
+                "startup_ms": (t_ready - t_import) * 1000,
+                "first_request_ms": (t_200 - t_ready) * 1000,
+            }
+        )
+    )
+
+
+def _spawn(extra_args: list[str] | None = None) -> subprocess.CompletedProcess:
+    env = dict(os.environ, LOOP_MONITOR="0", PYTHONDONTWRITEBYTECODE="0")
+    return subprocess.run(
+        [sys.executable, *(extra_args or []), "-m", "bench.coldstart", "--child"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure(runs: int = 5) -> dict:
+    """Median cold-start timings over `runs` fresh processes."""
+    samples = []
+    for _ in range(runs):
+        spawned = time.time()
+        out = _spawn()
+        data = json.loads(out.stdout.strip().splitlines()[-1])
+        if data["status"] != 200:
+            raise RuntimeError(f"first request returned {data['status']}")
+        data["ttf200_ms"] = (data.pop("wall_200") - spawned) * 1000
+        samples.append(data)
+
+    keys = ["ttf200_ms", "import_ms", "startup_ms", "first_request_ms"]
+    return {k: round(statistics.median(s[k] for s in samples), 1) for k in keys} | {"runs": runs}
+
+
+def import_report(top: int = 20) -> list[tuple[str, float, float]]:
+    """
+    Top imports by cumulative time from ``python -X importtime``.
+
+    Returns:
+        (module, self_ms, cumulative_ms) rows, slowest first.
+    """
+    err = _spawn(["-X", "importtime"]).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cum_us, name = line[len("import time:") :].split("|")
+            rows.append((name.rstrip(), int(self_us) / 1000, int(cum_us) / 1000))
+        except ValueError:
+            continue  # header line
+    rows.sort(key=lambda r: r[2], reverse=True)
+    return rows[:top]
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Gateway cold-start benchmark")
+    p.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    p.add_argument("-r", "--runs", type=int, default=5)
+    p.add_argument("--top", type=int, default=20, help="rows in the import-time report")
+    p.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("AXV_GW_STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS)),
+    )
+    args = p.parse_args(argv)
+
+    if args.child:
+        _child()
+        return 0
+
+    print(f"{'module':<60}{'self_ms':>10}{'cum_ms':>10}")
+    for name, self_ms, cum_ms in import_report(args.top):
+        print(f"{name:<60}{self_ms:>10.1f}{cum_ms:>10.1f}")
+
+    res = measure(args.runs)
+    print()
+    for k, v in res.items():
+        print(f"{k:>18}: {v}")
+    if res["ttf200_ms"] > args.budget_ms:
+        print(f"\nOVER BUDGET: ttf200 {res['ttf200_ms']} ms > {args.budget_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
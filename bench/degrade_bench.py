@@ -0,0 +1,155 @@
+"""
+Gateway behaviour while its upstream degrades (slow, failing, resetting).
+
+Starts the upstream simulator (``axv_api.app.simulator``) and the gateway
+(``axv-gw serve --workers 1``) with /axv proxied to it and the default
+/front/status document fetched from it (AXV_GW_FRONT_STATUS_URL, 1 s TTL).
+Each phase sets the simulator's faults through its admin API, then loads
+/front/status (cached, stale fallback) and /axv/status (proxied, no cache)
+separately. Reported per phase: gateway p50/p99 and errors for both, the
+share of /front/status responses served stale, and how many upstream
+fetches those requests cost.
+
+Usage:
+    python -m bench.degrade_bench                     # all phases, 5 s each
+    python -m bench.degrade_bench --phase healthy --phase down -d 10
+    python -m bench.degrade_bench --json degrade.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import urllib.request
+from pathlib import Path
+
+from prometheus_client.parser import text_string_to_metric_families
+
+from bench.http_bench import HOST, _free_port, load, running
+
+# Faults per phase (simulator Faults fields; missing = healthy)
+PHASES: dict[str, dict] = {
+    "healthy": {},
+    "slow": {"latency": "lognormal", "latency_ms": 50, "latency_sigma": 1.0},
+    "tail": {"latency_ms": 5, "tail_rate": 0.02, "tail_ms": 2000},
+    "errors": {"error_rate": 0.3},
+    "resets": {"reset_rate": 0.2},
+    "slow_body": {"slow_body_rate": 0.5, "slow_body_ms": 1500},
+    "down": {"error_rate": 1.0},
+}
+
+STALE = "axv_gw_front_status_stale_total"
+FRONT_REQUESTS = "axv_gw_front_status_requests_total"
+
+
+def _http(method: str, url: str, body: dict | None = None) -> dict | str:
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(
+        url, data=data, method=method, headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        text = response.read().decode()
+    return json.loads(text) if response.headers.get_content_type() == "application/json" else text
+
+
+def _counters(gw_port: int) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    text = _http("GET", f"http://{HOST}:{gw_port}/metrics")
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name in (STALE, FRONT_REQUESTS):
+                totals[sample.name] = totals.get(sample.name, 0.0) + sample.value
+    return totals
+
+
+def run(
+    phases: list[str], *, concurrency: int, clients: int, warmup: float, duration: float
+) -> list[dict]:
+    sim_port, gw_port = _free_port(), _free_port()
+    sim = f"http://{HOST}:{sim_port}"
+    sim_cmd = [
+        sys.executable, "-m", "uvicorn", "axv_api.app.simulator:app",
+        "--host", HOST, "--port", str(sim_port), "--log-level", "critical",
+    ]  # fmt: skip
+    gw_cmd = [
+        sys.executable, "-m", "app.cli", "serve",
+        "--host", HOST, "--port", str(gw_port), "--workers", "1",
+    ]  # fmt: skip
+    gw_env = {
+        "AXV_GW_PROXY_ROUTES": json.dumps({"/axv": {"url": sim, "timeout_s": 1.0}}),
+        "AXV_GW_FRONT_STATUS_URL": f"{sim}/axv/front/status",
+        "AXV_GW_CACHE_TTL_SECONDS": "1",
+        "AXV_GW_REQUEST_TIMEOUT_SECONDS": "1",
+        "AXV_GW_LOG_LEVEL": "critical",
+        "AXV_SIM_SEED": "1",
+    }
+    opts = {"concurrency": concurrency, "clients": clients, "warmup": warmup, "duration": duration}
+
+    results = []
+    with running(sim_cmd, sim_port, env=gw_env, ready_path="/axv/healthz"):
+        with running(gw_cmd, gw_port, env=gw_env):
+            for name in phases:
+                _http("PUT", f"{sim}/_sim/faults", PHASES[name])
+                _http("DELETE", f"{sim}/_sim/stats")
+                before = _counters(gw_port)
+                front = load(gw_port, ["/front/status"], **opts)
+                after = _counters(gw_port)
+                fetches = _http("GET", f"{sim}/_sim/stats").get("requests", 0)
+                proxied = load(gw_port, ["/axv/status"], **opts)
+
+                served = after.get(FRONT_REQUESTS, 0) - before.get(FRONT_REQUESTS, 0)
+                stale = after.get(STALE, 0) - before.get(STALE, 0)
+                results.append(
+                    {
+                        "phase": name,
+                        "faults": PHASES[name],
+                        "front": front,
+                        "proxied": proxied,
+                        "stale_rate": round(stale / served, 4) if served else 0.0,
+                        "upstream_fetches": fetches,
+                    }
+                )
+            _http("DELETE", f"{sim}/_sim/faults")
+    return results
+
+
+def _print_table(results: list[dict]) -> None:
+    print(
+        f"{'phase':<10} {'front p50':>9} {'p99 ms':>8} {'err':>5} {'stale %':>8} "
+        f"{'fetches':>7} | {'proxy p50':>9} {'p99 ms':>8} {'err':>6}"
+    )
+    for r in results:
+        f, p = r["front"], r["proxied"]
+        print(
+            f"{r['phase']:<10} {f['p50_ms']:>9.2f} {f['p99_ms']:>8.2f} {f['errors']:>5} "
+            f"{r['stale_rate'] * 100:>8.2f} {r['upstream_fetches']:>7} | "
+            f"{p['p50_ms']:>9.2f} {p['p99_ms']:>8.2f} {p['errors']:>6}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--phase", action="append", choices=list(PHASES), help="default: all")
+    p.add_argument("-d", "--duration", type=float, default=5.0)
+    p.add_argument("--warmup", type=float, default=1.0)
+    p.add_argument("-c", "--concurrency", type=int, default=32)
+    p.add_argument("--clients", type=int, default=2)
+    p.add_argument("--json", type=Path, help="write results to this file")
+    args = p.parse_args(argv)
+
+    results = run(
+        args.phase or list(PHASES),
+        concurrency=args.concurrency,
+        clients=args.clients,
+        warmup=args.warmup,
+        duration=args.duration,
+    )
+    _print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+HTTP load benchmark of the real server process (sockets, workers, event loop).
+
+Starts the gateway as a subprocess for every configuration, waits for
+/healthz and drives it with keep-alive HTTP/1.1 connections from several
+client processes (a minimal asyncio client, so the load generator is not
+the bottleneck it would be with a full HTTP library).
+
+Configurations:
+    plain   python -m uvicorn app.main:app      (the old Dockerfile command)
+    serve   axv-gw serve --workers N            (uvloop/httptools, per-core workers)
+
+Usage:
+    python -m bench.http_bench                               # plain vs serve, /healthz
+    python -m bench.http_bench -p /front/status -d 20 -c 128
+    python -m bench.http_bench --configs serve --workers 4 --json out.json
+
+Rate limits are raised for the server under test; request logging stays on
+as in production.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HOST = "127.0.0.1"
+
+
+def _command(config: str, port: int, workers: int) -> list[str]:
+    if config == "plain":
+        return [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--host", HOST, "--port", str(port),
+        ]  # fmt: skip
+    if config == "serve":
+        return [
+            sys.executable, "-m", "app.cli", "serve",
+            "--host", HOST, "--port", str(port), "--workers", str(workers),
+        ]  # fmt: skip
+    raise ValueError(f"unknown config {config!r}")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def running(
+    cmd: list[str],
+    port: int,
+    timeout: float = 30.0,
+    env: dict | None = None,
+    ready_path: str = "/healthz",
+):
+    env = {
+        **os.environ,
+        "RATE_LIMIT_DEFAULT": "1000000000",
+        "RATE_LIMIT_HOOKS": "1000000000",
+        "LOOP_LAG_DUMP_STACKS": "0",
+        **(env or {}),
+    }
+    proc = subprocess.Popen(
+        cmd, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with {proc.returncode}: {' '.join(cmd)}")
+            try:
+                status, _ = asyncio.run(_one_request(port, ready_path))
+                if status == 200:
+                    break
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("server did not become ready")
+            time.sleep(0.1)
+        yield proc
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=40)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, float]:
+    """(status, Retry-After seconds or 0)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head[9:12])
+    length = 0
+    retry_after = 0.0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-length":
+            length = int(value)
+        elif name == b"retry-after":
+            retry_after = float(value)
+    if length:
+        await reader.readexactly(length)
+    return status, retry_after
+
+
+async def _one_request(port: int, path: str) -> tuple[int, float]:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        t0 = time.perf_counter()
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode())
+        status, _ = await _read_response(reader)
+        return status, time.perf_counter() - t0
+    finally:
+        writer.close()
+
+
+async def _connection(port, paths, warm_until, deadline, latencies, counts, backoff) -> None:
+    requests = [f"GET {p} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode() for p in paths]
+    i = 0
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(HOST, port)
+        except OSError:
+            counts["errors"] += 1
+            await asyncio.sleep(0.01)
+            continue
+        try:
+            while (now := time.perf_counter()) < deadline:
+                writer.write(requests[i % len(requests)])
+                i += 1
+                status, retry_after = await _read_response(reader)
+                if now >= warm_until:
+                    latencies.append(time.perf_counter() - now)
+                    counts["ok" if status < 400 else "errors"] += 1
+                if backoff and retry_after:
+                    # Well-behaved client: honours Retry-After (503/429)
+                    await asyncio.sleep(min(retry_after, max(0.0, deadline - time.perf_counter())))
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            counts["errors"] += 1
+        finally:
+            writer.close()
+
+
+def _client_process(
+    port: int, paths: list[str], conns: int, warmup: float, duration: float, backoff: bool
+):
+    async def run():
+        warm_until = time.perf_counter() + warmup
+        deadline = warm_until + duration
+        latencies: list[float] = []
+        counts = {"ok": 0, "errors": 0}
+        await asyncio.gather(
+            *(
+                _connection(port, paths, warm_until, deadline, latencies, counts, backoff)
+                for _ in range(conns)
+            )
+        )
+        return counts, latencies
+
+    return asyncio.run(run())
+
+
+def load(
+    port: int,
+    paths: list[str],
+    *,
+    concurrency: int,
+    clients: int,
+    warmup: float,
+    duration: float,
+    backoff: bool = False,
+) -> dict:
+    clients = max(1, min(clients, concurrency))
+    per_client = [concurrency // clients + (i < concurrency % clients) for i in range(clients)]
+    with ProcessPoolExecutor(clients) as pool:
+        futures = [
+            pool.submit(_client_process, port, paths, n, warmup, duration, backoff)
+            for n in per_client
+        ]
+        parts = [f.result() for f in futures]
+
+    latencies = sorted(x for _, lat in parts for x in lat)
+    ok = sum(c["ok"] for c, _ in parts)
+    errors = sum(c["errors"] for c, _ in parts)
+
+    def pct(q: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+
+    return {
+        "rps": round(ok / duration, 1),
+        "p50_ms": round(pct(0.50), 2),
+        "p99_ms": round(pct(0.99), 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0,
+        "requests": ok,
+        "errors": errors,
+    }
+
+
+def _print_table(results: list[dict]) -> None:
+    print(f"{'config':<8} {'workers':>7} {'rps':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for r in results:
+        print(
+            f"{r['config']:<8} {r['workers']:>7} {r['rps']:>10.1f} "
+            f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['errors']:>7}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--configs", default="plain,serve")
+    p.add_argument("-p", "--path", action="append", help="request path(s), round-robin")
+    p.add_argument("-d", "--duration", type=float, default=10.0)
+    p.add_argument("--warmup", type=float, default=1.0)
+    p.add_argument("-c", "--concurrency", type=int, default=64, help="open connections")
+    p.add_argument("--clients", type=int, default=2, help="load generator processes")
+    p.add_argument("--workers", type=int, default=0, help="serve workers (0 = auto)")
+    p.add_argument(
+        "--honor-retry-after",
+        action="store_true",
+        help="clients pause for Retry-After after 503/429 (overload runs)",
+    )
+    p.add_argument("--json", type=Path, help="write results to this file")
+    args = p.parse_args(argv)
+
+    paths = args.path or ["/healthz"]
+    results = []
+    for config in [c.strip() for c in args.configs.split(",") if c.strip()]:
+        port = _free_port()
+        workers = 1 if config == "plain" else args.workers
+        with running(_command(config, port, workers), port):
+            stats = load(
+                port,
+                paths,
+                concurrency=args.concurrency,
+                clients=args.clients,
+                warmup=args.warmup,
+                duration=args.duration,
+                backoff=args.honor_retry_after,
+            )
+        results.append({"config": config, "workers": workers or "auto", "paths": paths, **stats})
+
+    _print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+    return 0 if all(r["requests"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
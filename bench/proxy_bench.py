@@ -0,0 +1,86 @@
+"""
+Reverse-proxy overhead: the same upstream called directly and through the gateway.
+
+Starts ``axv_api`` (uvicorn) and the gateway (``axv-gw serve --workers 1``
+with AXV_GW_PROXY_ROUTES pointing /axv at it), then drives the same path on
+both with bench.http_bench's keep-alive load generator. The difference is
+what the gateway adds per proxied request (middleware stack + one pooled
+upstream hop).
+
+Usage:
+    python -m bench.proxy_bench                      # /axv/status, 10 s, 32 connections
+    python -m bench.proxy_bench -d 20 -c 64 --json proxy.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from bench.http_bench import HOST, _free_port, load, running
+
+
+def run(path: str, *, concurrency: int, clients: int, warmup: float, duration: float) -> dict:
+    api_port, gw_port = _free_port(), _free_port()
+    api_cmd = [
+        sys.executable, "-m", "uvicorn", "axv_api.app.main:app",
+        "--host", HOST, "--port", str(api_port), "--log-level", "warning",
+    ]  # fmt: skip
+    gw_cmd = [
+        sys.executable, "-m", "app.cli", "serve",
+        "--host", HOST, "--port", str(gw_port), "--workers", "1",
+    ]  # fmt: skip
+    gw_env = {"AXV_GW_PROXY_ROUTES": json.dumps({"/axv": f"http://{HOST}:{api_port}"})}
+    opts = {"concurrency": concurrency, "clients": clients, "warmup": warmup, "duration": duration}
+
+    with running(api_cmd, api_port, ready_path="/axv/healthz"):
+        direct = load(api_port, [path], **opts)
+        with running(gw_cmd, gw_port, env=gw_env):
+            proxied = load(gw_port, [path], **opts)
+
+    return {
+        "path": path,
+        "direct": direct,
+        "proxied": proxied,
+        "overhead_p50_ms": round(proxied["p50_ms"] - direct["p50_ms"], 2),
+        "overhead_p99_ms": round(proxied["p99_ms"] - direct["p99_ms"], 2),
+        "rps_ratio": round(proxied["rps"] / direct["rps"], 3) if direct["rps"] else 0,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("-p", "--path", default="/axv/status")
+    p.add_argument("-d", "--duration", type=float, default=10.0)
+    p.add_argument("--warmup", type=float, default=1.0)
+    p.add_argument("-c", "--concurrency", type=int, default=32)
+    p.add_argument("--clients", type=int, default=2)
+    p.add_argument("--json", type=Path, help="write results to this file")
+    args = p.parse_args(argv)
+
+    result = run(
+        args.path,
+        concurrency=args.concurrency,
+        clients=args.clients,
+        warmup=args.warmup,
+        duration=args.duration,
+    )
+    print(f"{'':<8} {'rps':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name in ("direct", "proxied"):
+        r = result[name]
+        print(
+            f"{name:<8} {r['rps']:>10.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['errors']:>7}"
+        )
+    print(
+        f"overhead: p50 +{result['overhead_p50_ms']} ms, p99 +{result['overhead_p99_ms']} ms, "
+        f"throughput x{result['rps_ratio']}"
+    )
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2) + "\n")
+    return 0 if result["proxied"]["requests"] and not result["proxied"]["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Replay a traffic capture (AXV_GW_CAPTURE_PATH JSONL) against a gateway.
+
+Requests are fired on the original inter-arrival schedule, optionally
+compressed by ``--speed``, through a pooled ``httpx.AsyncClient``.
+``/hooks/*`` requests are re-signed with a fresh timestamp so they pass
+HMACTimeSkewMiddleware and hmac_verify (secret from AXV_HMAC_SECRET or
+``--secret``).
+
+Usage:
+    python -m bench.replay capture.jsonl --target http://127.0.0.1:8000
+    python -m bench.replay capture.jsonl --target http://gw:8000 --speed 4 --pool 200
+    python -m bench.replay capture.jsonl --speed 0      # as fast as the pool allows
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections
+import hashlib
+import hmac
+import os
+import sys
+import time
+
+import httpx
+
+from app.capture import load_capture, record_body
+from bench.asgi_bench import percentile
+
+
+def resign(headers: dict[str, str], body: bytes, secret: bytes) -> dict[str, str]:
+    """Replace timestamp/signature headers with fresh ones for `body`."""
+    ts = str(int(time.time()))
+    sig = hmac.new(secret, ts.encode() + b"." + body, hashlib.sha256).hexdigest()
+    out = {
+        k: v
+        for k, v in headers.items()
+        if k.lower()
+        not in ("x-axv-timestamp", "x-signature-timestamp", "x-axv-signature", "x-signature")
+    }
+    out["X-AXV-Timestamp"] = ts
+    out["X-AXV-Signature"] = f"sha256={sig}"
+    return out
+
+
+def build_request(entry: dict, secret: bytes, keep_client_ip: bool = True) -> tuple:
+    """(method, url path+query, headers, body, synthetic) for a captured record."""
+    headers = dict(entry.get("headers", {}))
+    if not keep_client_ip:
+        headers.pop("x-forwarded-for", None)
+    body = record_body(entry)
+    synthetic = body is None
+    if synthetic:
+        # Only a digest was captured: send a placeholder of the right kind.
+        body = b"{}" if "json" in headers.get("content-type", "") else b""
+    path = entry["path"] + (f"?{entry['query']}" if entry.get("query") else "")
+    if entry["path"].startswith("/hooks/") and secret:
+        headers = resign(headers, body, secret)
+    return entry["method"], path, headers, body, synthetic
+
+
+async def replay(
+    records: list[dict],
+    client: httpx.AsyncClient,
+    *,
+    speed: float = 1.0,
+    pool: int = 100,
+    secret: bytes = b"",
+    keep_client_ip: bool = True,
+) -> dict:
+    """Fire `records` through `client` and return a summary."""
+    sem = asyncio.Semaphore(pool)
+    statuses: collections.Counter = collections.Counter()
+    latencies: list[float] = []
+    sched_lag: list[float] = []
+    synthetic_bodies = 0
+    errors = 0
+
+    t0_capture = records[0]["t"] if records else 0.0
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+
+    async def fire(entry: dict, due: float):
+        nonlocal synthetic_bodies, errors
+        async with sem:
+            sched_lag.append(max(loop.time() - due, 0.0) * 1000)
+            # Build (and sign) right before sending so the timestamp is fresh.
+            method, path, headers, body, synthetic = build_request(entry, secret, keep_client_ip)
+            synthetic_bodies += synthetic
+            start = time.perf_counter()
+            try:
+                r = await client.request(method, path, headers=headers, content=body)
+                statuses[r.status_code] += 1
+            except httpx.HTTPError:
+                errors += 1
+                statuses["error"] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    tasks = []
+    for entry in records:
+        offset = (entry["t"] - t0_capture) / speed if speed > 0 else 0.0
+        due = t0 + offset
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(entry, due)))
+    await asyncio.gather(*tasks)
+
+    elapsed = loop.time() - t0
+    latencies.sort()
+    sched_lag.sort()
+    return {
+        "requests": len(records),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(records) / elapsed, 1) if elapsed > 0 else 0.0,
+        "statuses": {str(k): v for k, v in sorted(statuses.items(), key=str)},
+        "errors": errors,
+        "synthetic_bodies": synthetic_bodies,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "schedule_lag_p99_ms": round(percentile(sched_lag, 0.99), 3),
+    }
+
+
+async def _main(args) -> dict:
+    records = load_capture(args.capture)
+    limits = httpx.Limits(max_connections=args.pool, max_keepalive_connections=args.pool)
+    async with httpx.AsyncClient(
+        base_url=args.target, limits=limits, timeout=args.timeout
+    ) as client:
+        return await replay(
+            records,
+            client,
+            speed=args.speed,
+            pool=args.pool,
+            secret=(args.secret or os.getenv("AXV_HMAC_SECRET") or "").encode(),
+            keep_client_ip=not args.drop_client_ip,
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Replay captured gateway traffic")
+    p.add_argument("capture", help="JSONL file written by AXV_GW_CAPTURE_PATH")
+    p.add_argument("--target", default="http://127.0.0.1:8000")
+    p.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="time compression (2 = twice as fast, 0 = no waits)",
+    )
+    p.add_argument("--pool", type=int, default=100, help="max concurrent connections")
+    p.add_argument("--timeout", type=float, default=10.0)
+    p.add_argument("--secret", help="HMAC secret for re-signing (default: AXV_HMAC_SECRET)")
+    p.add_argument(
+        "--drop-client-ip",
+        action="store_true",
+        help="do not forward captured X-Forwarded-For (all traffic from one IP)",
+    )
+    args = p.parse_args(argv)
+
+    summary = asyncio.run(_main(args))
+    for k, v in summary.items():
+        print(f"{k:>22}: {v}")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""
+Soak test: millions of requests through create_app() with memory-growth checks.
+
+Drives the gateway in-process (bench.asgi_bench's ASGI driver) with a mix of
+probes, cached front status, history, signed hooks, hooks with bad
+timestamps, unknown paths and rate-limited clients, rotating client IPs and
+paths so every per-client / per-path structure sees a constant stream of
+new keys. After a warmup, every `--interval` requests it takes a
+tracemalloc snapshot and an RSS sample, then reports:
+
+  - traced memory and RSS over the measured phase: least-squares trend (KiB
+    per 1M requests) and the growth it implies over the run
+  - the allocation sites (file:line) whose size grew in most intervals
+
+The app runs its real lifespan (pre-warm, loop monitor, readiness).
+tracemalloc slows the gateway ~4-5x (~250 req/s on one core); --rss-only
+skips it for multi-million runs and checks RSS alone.
+
+Usage:
+    python -m bench.soak                               # 1M requests
+    python -m bench.soak -n 5000000 --interval 250000 --json soak.json
+    python -m bench.soak -n 200000 --max-growth-kib 512
+    python -m bench.soak -n 10000000 --rss-only --interval 1000000
+
+Exit code 1 when the traced-memory trend implies more than --max-growth-kib
+over the measured requests, or the RSS trend more than --max-rss-growth-mb.
+The trend, not first vs last sample: per-window structures (rate limiter)
+fill and drain in a sawtooth. Keep --warmup above one rate-limit window
+(60 s) so the first sample already holds a full window.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+os.environ.setdefault("AXV_HMAC_SECRET", "bench-secret")
+
+from bench.asgi_bench import Request, _signed_ping, asgi_request, client_ip  # noqa: E402
+
+# Rozmiar puli adresów: każdy trafia do limitera wiele razy, ale ciągle dochodzą nowe
+DEFAULT_IPS = 50_000
+HOT_IP = "203.0.113.251"  # jeden klient ponad limitem → stały strumień 429
+TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),  # próbki samego soaka
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def _mix(ips: int) -> list[Callable[[int], Request]]:
+    """One slot per request in turn; weights = number of slots."""
+    ping = _signed_ping(256)
+
+    def get(path: Callable[[int], str]) -> Callable[[int], Request]:
+        return lambda i: Request("GET", path(i), {"X-Forwarded-For": client_ip(i % ips)})
+
+    def bad_timestamp(i: int) -> Request:
+        headers = {"X-Forwarded-For": client_ip(i % ips), "X-AXV-Timestamp": "0"}
+        return Request("POST", f"/hooks/scan-{i}", headers, b"{}")
+
+    return [
+        get(lambda i: "/healthz"),
+        get(lambda i: "/healthz"),
+        get(lambda i: "/front/status"),
+        get(lambda i: "/front/status"),
+        get(lambda i: "/front/status"),
+        get(lambda i: "/status"),
+        get(lambda i: "/readyz"),
+        get(lambda i: "/front/status/history?range=1h"),
+        get(lambda i: f"/front/sites/site-{i % 1000}/status"),
+        get(lambda i: f"/scan/{i}"),
+        get(lambda i: f"/static/{i}.js"),
+        lambda i: ping(i % ips),
+        bad_timestamp,
+        lambda i: Request("GET", "/front/status", {"X-Forwarded-For": HOT_IP}),
+    ]
+
+
+def _rss_kib() -> float:
+    from app.serve import rss_bytes
+
+    return rss_bytes() / 1024
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Run the app's ASGI lifespan (startup on enter, shutdown on exit)."""
+    inbox: asyncio.Queue = asyncio.Queue()
+    outbox: asyncio.Queue = asyncio.Queue()
+    scope = {"type": "lifespan", "asgi": {"version": "3.0", "spec_version": "2.3"}}
+    task = asyncio.create_task(app(scope, inbox.get, outbox.put))
+    await inbox.put({"type": "lifespan.startup"})
+    message = await outbox.get()
+    if message["type"] != "lifespan.startup.complete":
+        raise RuntimeError(f"startup failed: {message}")
+    try:
+        yield
+    finally:
+        await inbox.put({"type": "lifespan.shutdown"})
+        await outbox.get()
+        await task
+
+
+def _sample(done: int, t0: float) -> tuple[dict, dict[str, int]]:
+    gc.collect()
+    sites: dict[str, int] = {}
+    if tracemalloc.is_tracing():
+        snapshot = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+        sites = {
+            f"{s.traceback[0].filename}:{s.traceback[0].lineno}": s.size
+            for s in snapshot.statistics("lineno")
+        }
+    point = {
+        "requests": done,
+        "elapsed_s": round(time.perf_counter() - t0, 1),
+        "traced_kib": round(sum(sites.values()) / 1024, 1),
+        "rss_kib": round(_rss_kib(), 1),
+    }
+    return point, sites
+
+
+def growing_sites(samples: list[dict[str, int]], *, top: int, min_share: float) -> list[dict]:
+    """
+    Sites whose size grew in at least `min_share` of the intervals and ended
+    above their first sample, by net growth.
+    """
+    intervals = len(samples) - 1
+    if intervals < 1:
+        return []
+    first, last = samples[0], samples[-1]
+    growing = []
+    for site, size in last.items():
+        sizes = [s.get(site, 0) for s in samples]
+        ups = sum(b > a for a, b in zip(sizes, sizes[1:], strict=False))
+        net = size - first.get(site, 0)
+        if net > 0 and ups >= min_share * intervals:
+            growing.append(
+                {"site": site, "growth_kib": round(net / 1024, 1), "grew_in": f"{ups}/{intervals}"}
+            )
+    growing.sort(key=lambda g: g["growth_kib"], reverse=True)
+    return growing[:top]
+
+
+def _per_million(points: list[dict], key: str) -> float:
+    """Least-squares slope of `key` in KiB per 1M requests."""
+    xs = [p["requests"] for p in points]
+    ys = [p[key] for p in points]
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mx, my = sum(xs) / n, sum(ys) / n
+    var = sum((x - mx) ** 2 for x in xs)
+    if not var:
+        return 0.0
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys, strict=True)) / var
+    return round(slope * 1_000_000, 1)
+
+
+async def soak(
+    *,
+    requests: int,
+    warmup: int,
+    interval: int,
+    concurrency: int,
+    ips: int,
+    frames: int = 1,
+    trace: bool = True,
+    top: int = 10,
+    min_share: float = 0.75,
+    progress: Callable[[dict], None] | None = None,
+) -> dict:
+    from app.main import create_app
+
+    app = create_app()
+    mix = _mix(ips)
+    statuses: dict[int, int] = {}
+    next_i = 0
+
+    async def worker(count: int) -> None:
+        nonlocal next_i
+        for _ in range(count):
+            i = next_i
+            next_i += 1
+            req = mix[i % len(mix)](i)
+            path, _, query = req.path.partition("?")
+            r = await asgi_request(
+                app,
+                req.method,
+                path,
+                headers=req.headers,
+                body=req.body,
+                query_string=query.encode(),
+            )
+            statuses[r.status] = statuses.get(r.status, 0) + 1
+
+    async def run(count: int) -> None:
+        per_worker = [count // concurrency] * concurrency
+        per_worker[0] += count - sum(per_worker)
+        await asyncio.gather(*(worker(n) for n in per_worker))
+
+    t0 = time.perf_counter()
+    if trace:
+        tracemalloc.start(frames)
+    try:
+        async with lifespan(app):
+            await run(warmup)
+            points, samples = [], []
+            point, sites = _sample(0, t0)
+            points.append(point)
+            samples.append(sites)
+            done = 0
+            while done < requests:
+                step = min(interval, requests - done)
+                await run(step)
+                done += step
+                point, sites = _sample(done, t0)
+                points.append(point)
+                samples.append(sites)
+                if progress is not None:
+                    progress(point)
+    finally:
+        tracemalloc.stop()
+
+    elapsed = time.perf_counter() - t0
+    traced_trend = _per_million(points, "traced_kib")
+    rss_trend = _per_million(points, "rss_kib")
+    return {
+        "requests": requests,
+        "warmup": warmup,
+        "rps": round((requests + warmup) / elapsed, 1),
+        "statuses": dict(sorted(statuses.items())),
+        "traced_kib_per_1m": traced_trend,
+        "rss_kib_per_1m": rss_trend,
+        "traced_growth_kib": round(traced_trend * requests / 1_000_000, 1),
+        "rss_growth_kib": round(rss_trend * requests / 1_000_000, 1),
+        "growing": growing_sites(samples, top=top, min_share=min_share),
+        "samples": points,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("-n", "--requests", type=int, default=1_000_000, help="measured requests")
+    p.add_argument("--warmup", type=int, default=50_000)
+    p.add_argument("--interval", type=int, default=100_000, help="requests between samples")
+    p.add_argument("-c", "--concurrency", type=int, default=16)
+    p.add_argument("--ips", type=int, default=DEFAULT_IPS, help="client IP pool size")
+    p.add_argument("--frames", type=int, default=1, help="tracemalloc traceback depth")
+    p.add_argument("--rss-only", action="store_true", help="no tracemalloc (faster)")
+    p.add_argument("--top", type=int, default=10, help="growing sites to report")
+    p.add_argument("--max-growth-kib", type=float, default=1024)
+    p.add_argument("--max-rss-growth-mb", type=float, default=64)
+    p.add_argument("--json", type=Path, help="write results to this file")
+    args = p.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)  # log dostępowy to I/O, nie pamięć
+    result = asyncio.run(
+        soak(
+            requests=args.requests,
+            warmup=args.warmup,
+            interval=args.interval,
+            concurrency=args.concurrency,
+            ips=args.ips,
+            frames=args.frames,
+            trace=not args.rss_only,
+            top=args.top,
+            progress=lambda s: print(
+                f"{s['requests']:>10} req  {s['elapsed_s']:>7.1f} s  "
+                f"traced {s['traced_kib']:>10.1f} KiB  rss {s['rss_kib']:>10.1f} KiB",
+                flush=True,
+            ),
+        )
+    )
+
+    print(f"\n{result['rps']:.0f} req/s, statuses {result['statuses']}")
+    for name in ("traced", "rss"):
+        print(
+            f"{name + ':':<7} {result[f'{name}_kib_per_1m']:+.1f} KiB per 1M requests "
+            f"(trend {result[f'{name}_growth_kib']:+.1f} KiB over the run)"
+        )
+    if result["growing"]:
+        print("\ngrowing allocation sites:")
+        for g in result["growing"]:
+            print(f"  {g['growth_kib']:>+10.1f} KiB  {g['grew_in']:>7}  {g['site']}")
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2) + "\n")
+
+    failed = []
+    if not args.rss_only and result["traced_growth_kib"] > args.max_growth_kib:
+        failed.append(f"traced memory trend {result['traced_growth_kib']} KiB")
+    if result["rss_growth_kib"] > args.max_rss_growth_mb * 1024:
+        failed.append(f"RSS trend {result['rss_growth_kib']} KiB")
+    for reason in failed:
+        print(f"FAIL: {reason}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from axv_gw.middleware.admission import (
+    AdaptiveLimiter,
+    AdmissionControlMiddleware,
+    OverloadedError,
+)
+
+
+async def test_limiter_queues_then_sheds():
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_queue=1, queue_timeout_s=0.05)
+    await limiter.acquire()
+    await limiter.acquire()
+
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(OverloadedError) as full:
+        await limiter.acquire()
+    assert full.value.reason == "queue_full"
+
+    limiter.release(None)  # slot przechodzi na czekającego
+    await queued
+    assert limiter.inflight == 2 and not limiter.waiters
+
+    with pytest.raises(OverloadedError) as timeout:
+        await limiter.acquire()
+    assert timeout.value.reason == "queue_timeout"
+    assert not limiter.waiters
+
+
+def test_limit_grows_when_fast_and_shrinks_when_latency_rises():
+    limiter = AdaptiveLimiter(initial=10, min_limit=2, max_limit=20)
+    limiter.inflight = 10
+    for _ in range(50):
+        limiter.inflight += 1
+        limiter.release(0.005)
+    grown = limiter.limit
+    assert grown > 12
+
+    limiter.inflight = int(grown)
+    for _ in range(20):
+        limiter._last_decrease = 0.0  # bez czekania jednego RTT między spadkami
+        limiter.inflight += 1
+        limiter.release(0.2)  # 40× wolniej niż baseline
+    assert limiter.limit < grown * 0.5
+
+    # Małe wykorzystanie limitu: wolna trasa nie zmienia limitu
+    before = limiter.limit
+    limiter.inflight = 1
+    limiter.release(1.0)
+    assert limiter.limit == before
+
+
+def test_healthy_slow_route_does_not_shrink_limit_of_fast_ones():
+    limiter = AdaptiveLimiter(initial=20, min_limit=8, max_limit=100)
+    limiter.inflight = 20
+    for i in range(200):
+        limiter.inflight += 1
+        # Szybkie trasy lokalne obok zdrowego upstreamu odpowiadającego w 200 ms
+        if i % 2:
+            limiter.release(0.2 + (i % 7) / 1000, "/axv")
+        else:
+            limiter.release(0.002 + (i % 5) / 1000, "/front/status")
+    assert limiter.limit > 20
+
+    # Ten sam upstream zaczyna kolejkować: 5× wolniej niż jego baseline
+    grown = limiter.limit
+    for _ in range(30):
+        limiter._last_decrease = 0.0
+        limiter.inflight += 1
+        limiter.release(1.0, "/axv")
+    assert limiter.limit < grown * 0.5
+
+
+async def test_middleware_sheds_with_retry_after_and_keeps_priority_lane():
+    gate = asyncio.Event()
+    app = FastAPI()
+    limiter = AdaptiveLimiter(initial=1, min_limit=1, max_queue=0)
+    app.add_middleware(AdmissionControlMiddleware, limiter=limiter)
+
+    @app.get("/work")
+    async def work():
+        await gate.wait()
+        return {"ok": True}
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"ok": True}
+
+    transport = httpx.ASGITransport(app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gw") as client:
+        busy = asyncio.create_task(client.get("/work"))
+        while not limiter.inflight:
+            await asyncio.sleep(0.01)
+        shed = await client.get("/work")
+        assert shed.status_code == 503 and shed.headers["retry-after"] == "1"
+        assert shed.json() == {"ok": False, "error": "overloaded"}
+        assert (await client.get("/healthz")).status_code == 200
+        gate.set()
+        assert (await busy).status_code == 200
+    assert limiter.inflight == 0
@@ -0,0 +1,131 @@
+import hashlib
+import hmac
+import json
+import os
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.batch import BatchParser
+from app.main import create_app
+from app.routers import hooks
+from axv_gw.middleware.rate_limit import RateLimitMiddleware
+
+os.environ.setdefault("AXV_HMAC_SECRET", "test123")
+
+
+def _signed(body: bytes, ip: str, content_type="application/x-ndjson") -> dict:
+    ts = str(int(time.time()))
+    secret = os.environ["AXV_HMAC_SECRET"].encode()
+    sig = hmac.new(secret, ts.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return {
+        "X-AXV-Timestamp": ts,
+        "X-AXV-Signature": f"sha256={sig}",
+        "X-Forwarded-For": ip,
+        "Content-Type": content_type,
+    }
+
+
+def _ndjson(*events) -> bytes:
+    return b"".join((e if isinstance(e, bytes) else json.dumps(e).encode()) + b"\n" for e in events)
+
+
+def test_parser_handles_lines_split_across_chunks():
+    body = _ndjson(*({"hook": "ping", "id": i, "payload": {"n": i}} for i in range(3)))
+    parser = BatchParser(max_events=10)
+    for i in range(len(body)):
+        parser.feed(body[i : i + 1])
+    events = parser.close()
+    assert [e.payload["n"] for e in events] == [0, 1, 2]
+
+
+def test_ndjson_batch_returns_per_event_results():
+    body = _ndjson(
+        {"hook": "ping", "id": "a", "payload": {"x": 1}},
+        {"hook": "nope", "id": "b", "payload": {}},
+        b"{not json",
+        {"hook": "ping", "id": "d", "payload": {"x": 2}},
+    )
+    client = TestClient(create_app())
+    r = client.post("/hooks/batch", content=body, headers=_signed(body, "192.0.2.51"))
+
+    assert r.status_code == 200
+    res = r.json()
+    assert res["ok"] is False and res["count"] == 4
+    assert [e["status"] for e in res["results"]] == [200, 404, 422, 200]
+    assert [e["id"] for e in res["results"]] == ["a", "b", None, "d"]
+
+
+def test_json_array_batch():
+    body = json.dumps([{"hook": "ping", "payload": {"i": i}} for i in range(5)]).encode()
+    client = TestClient(create_app())
+    r = client.post(
+        "/hooks/batch", content=body, headers=_signed(body, "192.0.2.52", "application/json")
+    )
+    assert r.status_code == 200
+    assert r.json()["ok"] is True and r.json()["count"] == 5
+
+
+def test_batch_with_bad_signature_dispatches_nothing(monkeypatch):
+    called = []
+
+    async def spy(payload):
+        called.append(payload)
+
+    monkeypatch.setitem(hooks.HOOK_HANDLERS, "spy", spy)
+    body = _ndjson({"hook": "spy", "payload": {}})
+    headers = _signed(body, "192.0.2.53") | {"X-AXV-Signature": "sha256=deadbeef"}
+
+    r = TestClient(create_app()).post("/hooks/batch", content=body, headers=headers)
+    assert r.status_code == 401
+    assert called == []
+
+
+def test_batch_rate_limit_counts_events(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_HOOK_EVENTS", "5")
+    app = FastAPI()
+    app.include_router(hooks.batch_router)
+    app.add_middleware(RateLimitMiddleware)
+    client = TestClient(app)
+
+    body = _ndjson(*({"hook": "ping", "payload": {"n": i}} for i in range(3)))
+    r = client.post("/hooks/batch", content=body, headers=_signed(body, "7.7.7.7"))
+    assert r.status_code == 200
+
+    r = client.post("/hooks/batch", content=body, headers=_signed(body, "7.7.7.7"))
+    assert r.status_code == 429
+    assert r.json()["error"] == "rate_limited" and int(r.headers["Retry-After"]) >= 1
+
+
+def test_batch_rate_limit_charges_badly_signed_requests(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_HOOK_EVENTS", "5")
+    app = FastAPI()
+    app.include_router(hooks.batch_router)
+    app.add_middleware(RateLimitMiddleware)
+    client = TestClient(app)
+
+    body = _ndjson({"hook": "ping", "payload": {}})
+    headers = _signed(body, "7.7.7.8") | {"X-AXV-Signature": "sha256=deadbeef"}
+    statuses = [
+        client.post("/hooks/batch", content=body, headers=headers).status_code for _ in range(7)
+    ]
+    assert statuses == [401] * 5 + [429] * 2
+
+
+def test_batch_checks_signature_before_event_limits(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_HOOK_EVENTS", "4")
+    app = FastAPI()
+    app.include_router(hooks.batch_router)
+    app.add_middleware(RateLimitMiddleware)
+    client = TestClient(app)
+
+    body = _ndjson(*({"hook": "ping", "payload": {"n": i}} for i in range(6)))
+    headers = _signed(body, "7.7.7.9")
+    bad = headers | {"X-AXV-Signature": "sha256=deadbeef"}
+    assert client.post("/hooks/batch", content=body, headers=bad).status_code == 401
+
+    # Powyżej limitu zdarzeń na minutę: nigdy by nie przeszedł, więc 413, nie 429
+    r = client.post("/hooks/batch", content=body, headers=headers)
+    assert r.status_code == 413
+    assert r.json() == {"ok": False, "error": "too_many_events", "limit": 4}
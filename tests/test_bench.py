@@ -0,0 +1,37 @@
+from app.main import create_app
+from bench.asgi_bench import SCENARIOS, asgi_request, compare, run_scenario
+
+
+async def test_asgi_driver_reaches_gateway_without_sockets():
+    r = await asgi_request(create_app(), "GET", "/healthz")
+    assert r.status == 200
+    assert r.body == b'{"ok":true}'
+
+
+async def test_run_scenario_reports_latency_and_allocations():
+    res = await run_scenario(
+        create_app(), SCENARIOS["hooks_ping_256b"], requests=20, warmup=2, alloc_samples=5
+    )
+    assert res["rps"] > 0
+    assert 0 < res["p50_ms"] <= res["p99_ms"] <= res["max_ms"]
+    assert res["alloc_peak_kib"] > 0
+
+
+async def test_rate_limit_reject_scenario_hits_the_limiter():
+    # Ścieżka spoza fast lane — inaczej limiter nigdy nie odpowie 429
+    res = await run_scenario(
+        create_app(), SCENARIOS["rate_limit_reject"], requests=20, warmup=2, alloc_samples=5
+    )
+    assert res["requests"] == 20 and res["rps"] > 0
+
+
+def test_compare_flags_regressions_past_threshold():
+    baseline = {"healthz": {"rps": 1000.0, "p99_ms": 1.0, "alloc_peak_kib": 50.0}}
+
+    ok = {"healthz": {"rps": 900.0, "p99_ms": 1.1, "alloc_peak_kib": 55.0}}
+    assert compare(ok, baseline, threshold=0.2) == []
+
+    slow = {"healthz": {"rps": 700.0, "p99_ms": 1.5, "alloc_peak_kib": 50.0}}
+    regressions = compare(slow, baseline, threshold=0.2)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("healthz.rps")
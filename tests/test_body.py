@@ -0,0 +1,74 @@
+import hashlib
+import hmac
+import os
+import time
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+from fastapi.testclient import TestClient
+
+import app.body as body_module
+from app.body import RequestBody
+from app.main import create_app
+
+os.environ.setdefault("AXV_HMAC_SECRET", "test123")
+
+
+def _signed(body: bytes, ip: str) -> dict:
+    ts = str(int(time.time()))
+    secret = os.environ["AXV_HMAC_SECRET"].encode()
+    sig = hmac.new(secret, ts.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return {
+        "X-AXV-Timestamp": ts,
+        "X-AXV-Signature": f"sha256={sig}",
+        "X-Forwarded-For": ip,
+        "Content-Type": "application/json",
+    }
+
+
+def test_json_is_parsed_at_most_once(monkeypatch):
+    calls = []
+    real = body_module.json.loads
+    monkeypatch.setattr(body_module, "orjson", None)
+    monkeypatch.setattr(body_module.json, "loads", lambda *a, **k: calls.append(1) or real(*a, **k))
+
+    ctx = RequestBody(b'{"a": 1}')
+    assert ctx.json() == {"a": 1}
+    assert ctx.json_object() is ctx.json()
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("raw", [b"{not json", b'{"x": NaN}'])
+def test_invalid_json_is_a_validation_error(raw):
+    with pytest.raises(RequestValidationError):
+        RequestBody(raw).json()
+
+
+def test_hooks_ping_passes_original_bytes_through():
+    client = TestClient(create_app())
+    body = b'{ "source": "pytest",\n  "nested": {"list": [1, 2.50, "\\u017c"]} }'
+
+    r = client.post("/hooks/ping", content=body, headers=_signed(body, "192.0.2.31"))
+
+    assert r.status_code == 200
+    assert r.content == b'{"ok":true,"data":' + body + b"}"
+    assert r.json()["data"]["nested"]["list"][2] == "ż"
+
+
+@pytest.mark.parametrize("body", [b"[1, 2]", b"{broken"])
+def test_hooks_ping_rejects_non_object_payload(body):
+    client = TestClient(create_app())
+    r = client.post("/hooks/ping", content=body, headers=_signed(body, "192.0.2.32"))
+    assert r.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b'\xef\xbb\xbf{"a":1}', '{"a":1}'.encode("utf-16"), '{"a":1}'.encode("utf-32-le")],
+)
+def test_hooks_ping_rejects_non_utf8_payload_without_orjson(monkeypatch, body):
+    # bez [fast] (domyślny obraz Dockera): stdlib sam wykryłby BOM / UTF-16 / UTF-32
+    monkeypatch.setattr(body_module, "orjson", None)
+    client = TestClient(create_app())
+    r = client.post("/hooks/ping", content=body, headers=_signed(body, "192.0.2.33"))
+    assert r.status_code == 422
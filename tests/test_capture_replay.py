@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.testclient import TestClient
+
+from app.capture import TrafficRecorder, load_capture
+from app.main import create_app
+from app.middleware import RequestLoggingMiddleware
+from bench.replay import replay
+
+
+def _app(recorder):
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware, recorder=recorder)
+
+    @app.post("/hooks/ping")
+    async def ping(request: Request):
+        return {"ok": True, "data": await request.json()}
+
+    @app.get("/status")
+    def status():
+        return {"ok": True}
+
+    return app
+
+
+def test_capture_records_sampled_requests_with_body(tmp_path):
+    path = tmp_path / "capture.jsonl"
+    recorder = TrafficRecorder(path, capture_bodies=True)
+    c = TestClient(_app(recorder))
+
+    body = json.dumps({"ping": True})
+    r = c.post("/hooks/ping", content=body, headers={"Content-Type": "application/json"})
+    assert r.json()["data"] == {"ping": True}  # body still readable downstream
+    c.get("/status?x=1", headers={"X-Forwarded-For": "1.2.3.4"})
+    recorder.close()
+
+    records = load_capture(path)
+    assert [r["path"] for r in records] == ["/hooks/ping", "/status"]
+    assert records[0]["body"] == body
+    assert records[0]["body_sha256"] == hashlib.sha256(body.encode()).hexdigest()
+    assert records[1]["query"] == "x=1"
+    assert records[1]["headers"]["x-forwarded-for"] == "1.2.3.4"
+    assert records[1]["status"] == 200
+
+
+def test_capture_without_bodies_keeps_digest_only(tmp_path):
+    path = tmp_path / "capture.jsonl"
+    recorder = TrafficRecorder(path)
+    TestClient(_app(recorder)).post("/hooks/ping", content=b'{"a":1}')
+    recorder.close()
+
+    (rec,) = load_capture(path)
+    assert "body" not in rec and rec["body_len"] == 7
+
+
+def test_capture_writes_off_the_request_path(tmp_path):
+    path = tmp_path / "capture.jsonl"
+    recorder = TrafficRecorder(path, max_pending=2)
+    disk = threading.Event()
+    slow_write = recorder._write
+
+    def blocked(lines):
+        disk.wait()  # dysk stoi: record() i tak nie czeka
+        slow_write(lines)
+
+    recorder._write = blocked
+    meta = {"method": "GET", "query": "", "headers": {}, "body": b"", "status": 200}
+    t0 = time.perf_counter()
+    for i in range(5):
+        recorder.record(t=time.time(), path=f"/r/{i}", duration_ms=1.0, **meta)
+    assert time.perf_counter() - t0 < 0.5
+    disk.set()
+    recorder.close()
+
+    records = load_capture(path)
+    assert recorder.dropped == 5 - len(records) and len(records) >= 2
+
+
+async def test_replay_resigns_hooks_with_fresh_timestamp():
+    stale = time.time() - 3600  # signatures from an hour ago would be rejected
+    body = json.dumps({"source": "capture", "ping": True})
+    records = [
+        {
+            "t": stale + i * 0.01,
+            "method": "POST",
+            "path": "/hooks/ping",
+            "query": "",
+            "headers": {
+                "content-type": "application/json",
+                "x-forwarded-for": f"198.51.100.{i}",
+            },
+            "body": body,
+            "body_len": len(body),
+        }
+        for i in range(3)
+    ]
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://gw") as client:
+        summary = await replay(
+            records, client, speed=0, secret=os.environ["AXV_HMAC_SECRET"].encode()
+        )
+
+    assert summary["statuses"] == {"200": 3}
+    assert summary["synthetic_bodies"] == 0
@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.forwarder import HookForwarder
+from app.main import create_app
+from axv_gw.timer_wheel import TimerWheel
+
+os.environ.setdefault("AXV_HMAC_SECRET", "test123")
+
+
+class StandIn:
+    """Local downstream: records requests, answers with queued statuses (then 200)."""
+
+    def __init__(self, statuses=(), delay=0.0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.requests = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stand_in.lock:
+                    stand_in.inflight += 1
+                    stand_in.max_inflight = max(stand_in.max_inflight, stand_in.inflight)
+                    status = stand_in.statuses.pop(0) if stand_in.statuses else 200
+                time.sleep(stand_in.delay)
+                with stand_in.lock:
+                    stand_in.inflight -= 1
+                    stand_in.requests.append((dict(self.headers), body))
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def make(*args, **kwargs):
+        servers.append(StandIn(*args, **kwargs))
+        return servers[-1]
+
+    yield make
+    for s in servers:
+        s.server.shutdown()
+        s.server.server_close()
+
+
+def test_timer_wheel_fires_due_timers_across_rounds():
+    wheel = TimerWheel(tick=0.01, slots=8)
+    fired = []
+    wheel.schedule(0.03, fired.append, "short")
+    wheel.schedule(0.2, fired.append, "long")  # 20 ticks: two full turns + 4
+    wheel.schedule(0.05, fired.append, "cancelled").cancel()
+
+    for _ in range(3):
+        wheel.advance()
+    assert fired == ["short"]
+    for _ in range(16):
+        wheel.advance()
+    assert fired == ["short"]
+    wheel.advance()
+    assert fired == ["short", "long"] and len(wheel) == 0
+
+
+async def test_forwarder_resigns_and_retries_until_delivered(stand_in):
+    target = stand_in(statuses=[503, 500])
+    fwd = HookForwarder(
+        {"ping": [target.url]}, "fwd-secret", backoff_base_s=0.01, wheel=TimerWheel(tick=0.005)
+    )
+    fwd.start()
+    assert fwd.submit("ping", b'{"a":1}', "req-1") == 1
+    assert fwd.submit("unrouted", b"{}") == 0
+    await fwd.drain()
+    await fwd.stop()
+
+    assert [h["X-AXV-Delivery-Attempt"] for h, _ in target.requests] == ["1", "2", "3"]
+    headers, body = target.requests[-1]
+    expected = hmac.new(
+        b"fwd-secret", headers["X-AXV-Timestamp"].encode() + b"." + body, hashlib.sha256
+    ).hexdigest()
+    assert body == b'{"a":1}'
+    assert headers["X-AXV-Signature"] == f"sha256={expected}"
+    assert headers["X-Request-ID"] == "req-1" and headers["X-AXV-Hook"] == "ping"
+
+
+async def test_forwarder_limits_concurrency_and_gives_up_on_4xx(stand_in):
+    slow = stand_in(delay=0.05)
+    broken = stand_in(statuses=[400])
+    fwd = HookForwarder({"ping": [slow.url, broken.url]}, "s", concurrency=2)
+    fwd.start()
+    for i in range(6):
+        fwd.submit("ping", b'{"n":%d}' % i)
+    await fwd.drain()
+    await fwd.stop()
+
+    assert len(slow.requests) == 6 and slow.max_inflight <= 2
+    # 400 is not retried; the remaining five get the default 200
+    assert len(broken.requests) == 6
+
+
+async def test_forwarder_fails_invalid_target_url_and_keeps_working(stand_in):
+    target = stand_in()
+    fwd = HookForwarder({"ping": ["http://[::1/hook", target.url]}, "s", concurrency=1)
+    fwd.start()
+    for i in range(3):
+        fwd.submit("ping", b'{"n":%d}' % i)
+    await asyncio.wait_for(fwd.drain(), timeout=5)
+    await fwd.stop()
+
+    assert fwd.pending == 0 and len(target.requests) == 3
+
+
+def test_hooks_ping_is_forwarded(stand_in):
+    target = stand_in()
+    body = b'{"source":"pytest-forward"}'
+    ts = str(int(time.time()))
+    sig = hmac.new(
+        os.environ["AXV_HMAC_SECRET"].encode(), ts.encode() + b"." + body, hashlib.sha256
+    ).hexdigest()
+    headers = {
+        "X-AXV-Timestamp": ts,
+        "X-AXV-Signature": f"sha256={sig}",
+        "X-Forwarded-For": "192.0.2.51",
+    }
+    with patch("app.config.settings.hooks_forward", {"ping": [target.url]}):
+        with TestClient(create_app()) as client:
+            assert client.post("/hooks/ping", content=body, headers=headers).status_code == 200
+            client.portal.call(client.app.state.forwarder.drain)
+
+    ((fwd_headers, fwd_body),) = target.requests
+    assert fwd_body == body
+    assert fwd_headers["X-Request-ID"]
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import history
+from app.history import HistoryStore, parse_duration
+from app.main import create_app
+
+HOUR = 3600
+DAY = 86400
+
+
+def _doc(**states) -> dict:
+    return {"services": [{"id": sid, "state": st} for sid, st in states.items()]}
+
+
+def test_hourly_rollups_serve_long_ranges_and_transitions():
+    store = HistoryStore(capacity=64, hours=24 * 100)
+    t0 = 1_700_000_000 // DAY * DAY
+    for minute in range(0, 3 * DAY // 60, 10):  # 3 dni, próbka co 10 min
+        ts = t0 + minute * 60
+        state = "down" if DAY + HOUR <= ts - t0 < DAY + 2 * HOUR else "ok"
+        store.record(_doc(api=state), latency_s=0.01, ts=ts)
+
+    (api,) = store.query(t0, t0 + 3 * DAY, DAY)
+    assert (api["ok"], api["down"]) == ([144, 138, 144], [0, 6, 0])
+    assert api["uptime"] == [1.0, round(138 / 144, 4), 1.0]
+    assert api["latency_avg_ms"] == [10.0, 10.0, 10.0]
+    assert [state for _, state in api["transitions"]] == ["ok", "down", "ok"]
+    assert api["state"] == "ok"
+    # Surowy bufor (64 próbki) trzyma tylko końcówkę; krótkie kubełki z niego
+    (recent,) = store.query(t0 + 3 * DAY - HOUR, t0 + 3 * DAY, 600)
+    assert recent["ok"] == [1] * 6
+
+
+def test_snapshot_roundtrip_and_corruption(tmp_path):
+    path = tmp_path / "history.bin"
+    store = HistoryStore(capacity=16, transitions=8, hours=48)
+    now = time.time()
+    for i in range(20):  # ring przepełniony
+        store.record(_doc(api="ok" if i % 5 else "warn", db="down"), 0.002, now - 20 + i)
+    store.snapshot(path)
+
+    restored = HistoryStore(capacity=16, transitions=8, hours=48)
+    assert restored.load(path)
+    assert restored.query(now - 60, now, 60) == store.query(now - 60, now, 60)
+
+    assert not HistoryStore(capacity=32, transitions=8, hours=48).load(path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert not HistoryStore(capacity=16, transitions=8, hours=48).load(path)
+
+
+async def test_snapshot_replaces_file_atomically(tmp_path):
+    path = tmp_path / "history.bin"
+    store = HistoryStore(capacity=16, transitions=8, hours=48)
+    store.record(_doc(api="ok"), 0.002)
+    store.snapshot(path)
+    before = path.read_bytes()
+
+    with patch("app.history.os.fsync", side_effect=OSError("EIO")):
+        store.record(_doc(api="down"), 0.002)
+        with pytest.raises(OSError):
+            await store.snapshot_async(path)
+    assert path.read_bytes() == before  # stary snapshot nietknięty
+    assert [p.name for p in tmp_path.iterdir()] == ["history.bin"]
+
+    # Nowe serwisy w trakcie zapisu w wątku: układ pobrany wcześniej, na pętli
+    task = asyncio.create_task(store.snapshot_async(path))
+    await asyncio.sleep(0)
+    for i in range(50):
+        store.record(_doc(**{f"svc-{i}": "ok"}), 0.002)
+    await task
+    restored = HistoryStore(capacity=16, transitions=8, hours=48)
+    assert restored.load(path) and list(restored.services) == ["api"]
+
+    # Wiersze dopisane po pobraniu układu nie trafiają do snapshotu
+    now = time.time()
+    expected = store.query(now - 60, now + 60, 60)
+    layout = store._layout()
+    for _ in range(20):
+        store.record(_doc(api="warn"), 0.002)
+    history.write_snapshot(path, *layout)
+    restored = HistoryStore(capacity=16, transitions=8, hours=48)
+    assert restored.load(path) and restored.query(now - 60, now + 60, 60) == expected
+
+
+def test_history_endpoint(tmp_path):
+    assert parse_duration("90d") == 90 * DAY and parse_duration("15m") == 900
+    store = HistoryStore()
+    now = time.time()
+    for i in range(90 * 24):  # 90 dni, próbka co godzinę
+        store.record(_doc(api="ok", web="warn"), 0.005, now - 90 * DAY + i * HOUR)
+
+    client = TestClient(create_app())
+    with patch.object(history, "store", store):
+        t0 = time.perf_counter()
+        r = client.get("/front/status/history", params={"range": "90d", "service": "api"})
+        elapsed = time.perf_counter() - t0
+        body = r.json()
+        assert r.status_code == 200 and body["bucket_s"] == DAY
+        (api,) = body["services"]
+        assert sum(api["ok"]) == 90 * 24 and set(api["uptime"]) <= {1.0, None}
+        assert elapsed < 0.5
+
+        short = client.get("/front/status/history", params={"range": "1h"}).json()
+        assert short["bucket_s"] == 60
+        assert client.get("/front/status/history", params={"range": "soon"}).status_code == 422
+        assert (
+            client.get("/front/status/history", params={"range": "90d", "bucket": "1s"})
+        ).status_code == 422
@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.ingest import HookQueue
+from app.main import create_app
+from axv_gw.segment_log import SegmentLog
+
+os.environ.setdefault("AXV_HMAC_SECRET", "test123")
+
+
+async def test_segment_log_recovers_uncommitted_records(tmp_path):
+    log = SegmentLog(tmp_path, fsync_interval=0.001)
+    assert log.open() == []
+    log.start()
+    seqs = await asyncio.gather(*(log.append(f"rec-{i}".encode()) for i in range(3)))
+    assert seqs == [1, 2, 3]
+    log.ack(2)  # out of order: watermark stays at 0
+    log.ack(1)
+    assert log.committed == 2
+    await log.close()
+
+    # crash in the middle of the next append: torn frame at the tail
+    (seg,) = tmp_path.glob("*.seg")
+    with open(seg, "ab") as f:
+        f.write(b"\x10\x00\x00\x00partial")
+
+    reopened = SegmentLog(tmp_path)
+    assert reopened.open() == [(3, b"rec-2")]
+    assert reopened.next_seq == 4
+    await reopened.close()
+
+
+async def test_segment_log_rotates_and_deletes_committed_segments(tmp_path):
+    log = SegmentLog(tmp_path, segment_bytes=64, fsync_interval=0.001)
+    log.open()
+    log.start()
+    for i in range(10):
+        seq = await log.append(b"x" * 40)
+        log.ack(seq)
+    await log.flush()
+    assert len(list(tmp_path.glob("*.seg"))) == 1
+    assert log.depth == 0
+    await log.close()
+
+
+async def test_segment_log_refuses_a_second_owner(tmp_path):
+    log = SegmentLog(tmp_path)
+    log.open()
+    with pytest.raises(RuntimeError, match="in use by another process"):
+        SegmentLog(tmp_path).open()
+    await log.close()
+    second = SegmentLog(tmp_path)
+    assert second.open() == []
+    await second.close()
+
+
+async def test_hook_queue_delivers_after_restart(tmp_path):
+    handled = []
+
+    async def ping(payload):
+        handled.append(payload)
+
+    # First process: accepts events but dies before any worker runs.
+    q1 = HookQueue(SegmentLog(tmp_path, fsync_interval=0.001), {"ping": ping}, workers=0)
+    await q1.start()
+    ids = [await q1.enqueue("ping", b'{"n":%d}' % i) for i in range(3)]
+    await q1.stop()
+    assert len(set(ids)) == 3 and handled == []
+
+    q2 = HookQueue(SegmentLog(tmp_path, fsync_interval=0.001), {"ping": ping}, workers=2)
+    await q2.start()
+    await q2.join()
+    await q2.stop()
+    assert sorted(p["n"] for p in handled) == [0, 1, 2]
+    assert q2.log.depth == 0
+
+
+async def test_hook_queue_delivers_events_whose_append_wait_failed(tmp_path):
+    handled = []
+
+    async def ping(payload):
+        handled.append(payload["n"])
+
+    log = SegmentLog(tmp_path, fsync_interval=0.01, checkpoint_interval=0.01)
+    q = HookQueue(log, {"ping": ping}, workers=1)
+    await q.start()
+    # Klient rozłącza się w trakcie czekania na fsync: ramka jest już w logu
+    task = asyncio.create_task(q.enqueue("ping", b'{"n":0}'))
+    await asyncio.sleep(0)
+    task.cancel()
+    with patch("axv_gw.segment_log._fsync_all", side_effect=OSError("EIO")):
+        failed = asyncio.create_task(q.enqueue("ping", b'{"n":1}'))
+        await asyncio.sleep(0)
+        await log.flush()
+        with pytest.raises(OSError):
+            await failed
+    await q.join()
+    assert sorted(handled) == [0, 1]
+    assert log.depth == 0
+
+    # Acki bez kolejnych appendów i tak trafiają do checkpointu
+    await asyncio.sleep(0.05)
+    assert (tmp_path / "checkpoint").read_text() == "2"
+    await q.stop()
+
+
+async def test_hook_queue_retries_failing_handler(tmp_path):
+    calls = []
+
+    async def flaky(payload):
+        calls.append(payload)
+        if len(calls) < 3:
+            raise RuntimeError("downstream down")
+
+    q = HookQueue(SegmentLog(tmp_path, fsync_interval=0.001), {"ping": flaky}, retry_base_s=0.001)
+    await q.start()
+    await q.enqueue("ping", b'{"a":1}')
+    await q.join()
+    await q.stop()
+    assert len(calls) == 3 and q.log.committed == 1
+
+
+def test_hooks_ping_returns_202_in_queue_mode(tmp_path):
+    body = b'{"source":"pytest"}'
+    ts = str(int(time.time()))
+    sig = hmac.new(
+        os.environ["AXV_HMAC_SECRET"].encode(), ts.encode() + b"." + body, hashlib.sha256
+    ).hexdigest()
+    headers = {
+        "X-AXV-Timestamp": ts,
+        "X-AXV-Signature": f"sha256={sig}",
+        "X-Forwarded-For": "192.0.2.41",
+    }
+    with (
+        patch("app.config.settings.hooks_ingest_mode", "queue"),
+        patch("app.config.settings.hooks_queue_dir", str(tmp_path)),
+    ):
+        app = create_app()
+        with TestClient(app) as client:
+            r = client.post("/hooks/ping", content=body, headers=headers)
+            assert r.status_code == 202
+            assert r.json()["ok"] is True and len(r.json()["event_id"]) == 32
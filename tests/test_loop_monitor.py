@@ -0,0 +1,34 @@
+import asyncio
+import logging
+import time
+
+from axv_gw.loop_monitor import LoopMonitor
+from axv_gw.metrics import event_loop_blocked
+
+
+def _block_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+async def test_loop_monitor_counts_lag_and_logs_blocking_stack(caplog):
+    monitor = LoopMonitor(interval_ms=20, threshold_ms=50)
+    before = event_loop_blocked._value.get()
+
+    with caplog.at_level(logging.WARNING, logger="axv_gw.loop_monitor"):
+        await monitor.start()
+        await asyncio.sleep(0.05)
+        _block_the_loop(0.3)
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+    assert event_loop_blocked._value.get() > before
+    stacks = [r.getMessage() for r in caplog.records if "loop thread stack" in r.getMessage()]
+    assert stacks and "_block_the_loop" in stacks[0]
+
+
+async def test_loop_monitor_disabled_by_env(monkeypatch):
+    monkeypatch.setenv("LOOP_MONITOR", "0")
+    monitor = LoopMonitor()
+    await monitor.start()
+    assert monitor._task is None
+    await monitor.stop()
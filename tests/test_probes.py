@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.routers.front as front_module
+from app.main import create_app
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    front_module._cache = None
+    front_module._cache_timestamp = None
+    yield
+    front_module._cache = None
+    front_module._cache_timestamp = None
+
+
+def test_healthz_skips_the_stack_and_rate_limit():
+    client = TestClient(create_app())
+    headers = {"X-Forwarded-For": "192.0.2.71"}
+    with patch("app.middleware.RequestLoggingMiddleware.dispatch") as stack:
+        for _ in range(100):  # > RATE_LIMIT_DEFAULT
+            r = client.get("/healthz", headers=headers)
+            assert r.status_code == 200 and r.content == b'{"ok":true}'
+        head = client.head("/healthz")
+    stack.assert_not_called()
+    assert head.status_code == 200 and head.content == b""
+    assert head.headers["content-length"] == "11"
+
+
+def test_readyz_reflects_lifespan_and_front_cache(tmp_path):
+    app = create_app()
+    assert TestClient(app).get("/readyz").status_code == 503  # lifespan nie ruszył
+
+    with TestClient(app) as client:
+        r = client.get("/readyz")
+        assert r.status_code == 200
+        assert r.json() == {"ok": True, "checks": {"started": True, "front_status": True}}
+
+    front_module._cache = None
+    with patch("app.config.settings.stub_path", str(tmp_path / "missing.json")):
+        with TestClient(app) as client:
+            r = client.get("/readyz")
+    assert r.status_code == 503 and r.json()["checks"]["front_status"] is False
+
+
+def test_status_and_metrics_head_from_fast_lane():
+    client = TestClient(create_app())
+    r = client.get("/status", headers={"X-Request-ID": 'req-"7"'})
+    body = r.json()
+    assert list(body) == ["now", "ok", "service", "version", "uptime_s", "request_id"]
+    assert body["request_id"] == 'req-"7"' and r.headers["x-request-id"] == 'req-"7"'
+    assert client.get("/status").json()["request_id"] != body["request_id"]
+
+    head = client.head("/metrics")
+    assert head.status_code == 200 and head.content == b""
+    assert head.headers["content-type"].startswith("text/plain")
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.middleware import RequestLoggingMiddleware
+from app.routers.proxy import ProxyPool, Upstream, build_router, parse_upstreams
+from axv_api.app.main import app as axv_api_app
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Upstream stand-in: echoes the request, /stream answers in chunks, /slow stalls."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            data = b""
+            while size := int(self.rfile.readline().strip(), 16):
+                data += self.rfile.read(size)
+                self.rfile.readline()
+            self.rfile.readline()
+            return data
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _handle(self):
+        if self.path.startswith("/slow"):
+            time.sleep(1)
+        body = self._body()
+        if self.path.startswith("/stream"):
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Set-Cookie", "a=1")
+            self.send_header("Set-Cookie", "b=2")
+            self.end_headers()
+            for part in (b"one,", b"two,", b"three"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        payload = json.dumps(
+            {
+                "method": self.command,
+                "path": self.path,
+                "headers": {k.lower(): v for k, v in self.headers.items()},
+                "body": body.decode(),
+            }
+        ).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def upstream_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _app(pool: ProxyPool) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await pool.aclose()
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(RequestLoggingMiddleware)
+    app.include_router(build_router(pool))
+    return app
+
+
+def test_parse_upstreams_defaults_and_longest_prefix_first():
+    settings = Settings(
+        proxy_routes={
+            "/axv": "http://api:8001/",
+            "axv/admin": {"url": "http://adm", "timeout_s": 30},
+        },
+        proxy_timeout_s=5,
+    )
+    admin, axv = parse_upstreams(settings)
+    assert (admin.prefix, admin.timeout_s) == ("/axv/admin", 30.0)
+    assert (axv.prefix, axv.url, axv.timeout_s) == ("/axv", "http://api:8001", 5.0)
+
+
+def test_proxy_forwards_headers_query_and_streamed_body(upstream_url):
+    pool = ProxyPool([Upstream("/axv", upstream_url)])
+    with TestClient(_app(pool)) as client:
+        r = client.post(
+            "/axv/items?x=1&y=%2F",
+            content=iter([b"chunk-1;", b"chunk-2"]),  # no Content-Length → chunked upload
+            headers={
+                "X-Request-ID": "req-42",
+                "Connection": "keep-alive, X-Secret",
+                "X-Secret": "hop",
+                "X-Forwarded-For": "198.51.100.7",
+            },
+        )
+    assert r.status_code == 201
+    echo = r.json()
+    assert echo["method"] == "POST" and echo["path"] == "/axv/items?x=1&y=%2F"
+    assert echo["body"] == "chunk-1;chunk-2"
+    assert echo["headers"]["x-request-id"] == "req-42"
+    assert echo["headers"]["x-forwarded-for"] == "198.51.100.7, testclient"
+    assert "x-secret" not in echo["headers"]
+    assert r.headers["x-request-id"] == "req-42"
+
+
+def test_proxy_streams_response_and_keeps_repeated_headers(upstream_url):
+    pool = ProxyPool([Upstream("/files", upstream_url, strip_prefix=True)])
+    with TestClient(_app(pool)) as client:
+        with client.stream("GET", "/files/stream") as r:
+            chunks = list(r.iter_raw())
+            assert r.status_code == 200
+            assert r.headers.get_list("set-cookie") == ["a=1", "b=2"]
+    assert b"".join(chunks) == b"one,two,three"
+
+
+def test_proxy_maps_upstream_failures(upstream_url):
+    pool = ProxyPool(
+        [
+            Upstream("/slow", upstream_url, timeout_s=0.2),
+            Upstream("/down", "http://127.0.0.1:9", connect_timeout_s=0.5),
+        ]
+    )
+    with TestClient(_app(pool)) as client:
+        assert client.get("/slow").status_code == 504
+        r = client.get("/down/x")
+        assert r.status_code == 502 and r.json()["error"] == "upstream_unavailable"
+
+
+def test_proxy_to_axv_api():
+    transport = httpx.ASGITransport(axv_api_app)
+    pool = ProxyPool([Upstream("/axv", "http://axv-api")], transport=transport)
+    with TestClient(_app(pool)) as client:
+        r = client.get("/axv/status")
+    assert r.status_code == 200 and r.json()["status"]["api"] == "ok"
@@ -0,0 +1,142 @@
+import asyncio
+from dataclasses import replace
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+
+from axv_gw.middleware.response_cache import (
+    CacheEntry,
+    ResponseCacheMiddleware,
+    normalise_query,
+    parse_routes,
+)
+
+
+def _app(**cache_kwargs) -> tuple[FastAPI, dict]:
+    calls = {"n": 0}
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware, **cache_kwargs)
+
+    @app.get("/items")
+    async def items(request: Request):
+        calls["n"] += 1
+        await asyncio.sleep(0.05)
+        return {"n": calls["n"], "q": str(request.query_params)}
+
+    @app.get("/lang")
+    async def lang(request: Request):
+        calls["n"] += 1
+        body = f'{{"lang": "{request.headers.get("accept-language", "")}"}}'
+        return Response(body, media_type="application/json", headers={"Vary": "Accept-Language"})
+
+    @app.get("/private")
+    async def private():
+        calls["n"] += 1
+        return Response("x", headers={"Cache-Control": "private"})
+
+    @app.get("/big")
+    async def big():
+        calls["n"] += 1
+        return StreamingResponse(iter([b"a" * 1024] * 4))
+
+    return app, calls
+
+
+def _client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app), base_url="http://gw")
+
+
+def test_parse_routes_and_query_normalisation():
+    routes = parse_routes("/axv/*=10, /axv/status=2")
+    assert [(r.pattern, r.ttl_s) for r in routes] == [("/axv/status", 2.0), ("/axv/*", 10.0)]
+    assert routes[1].matches("/axv/x/y") and not routes[1].matches("/axvx")
+    assert normalise_query("b=2&a=1&a=0") == normalise_query("a=1&a=0&b=2")
+
+
+async def test_hit_miss_coalescing_and_vary():
+    app, calls = _app(routes="/items=60,/lang=60")
+    async with _client(app) as client:
+        first = await asyncio.gather(*(client.get("/items?b=2&a=1") for _ in range(5)))
+        assert calls["n"] == 1  # pięć równoległych missów → jedno wywołanie
+        assert {r.json()["n"] for r in first} == {1}
+        hit = await client.get("/items?a=1&b=2")
+        assert hit.headers["x-cache"] == "HIT" and hit.json()["n"] == 1
+        bypass = await client.get("/items", headers={"Cache-Control": "no-cache"})
+        assert bypass.json()["n"] == 2 and "x-cache" not in bypass.headers
+
+        pl = await client.get("/lang", headers={"Accept-Language": "pl"})
+        en = await client.get("/lang", headers={"Accept-Language": "en"})
+        pl_again = await client.get("/lang", headers={"Accept-Language": "pl"})
+    assert (pl.json()["lang"], en.json()["lang"]) == ("pl", "en")
+    assert pl_again.headers["x-cache"] == "HIT" and pl_again.json()["lang"] == "pl"
+
+
+def _cache_of(app: FastAPI) -> ResponseCacheMiddleware:
+    cache = app.middleware_stack
+    while not isinstance(cache, ResponseCacheMiddleware):
+        cache = cache.app
+    return cache
+
+
+async def test_coalesced_misses_keep_vary_variants_apart():
+    app, calls = _app(routes="/lang=60")
+    async with _client(app) as client:
+
+        async def pl_and_en():
+            return await asyncio.gather(
+                client.get("/lang", headers={"Accept-Language": "pl"}),
+                client.get("/lang", headers={"Accept-Language": "en"}),
+            )
+
+        pl, en = await pl_and_en()  # zimny cache: Vary jeszcze nieznane
+        assert (pl.json()["lang"], en.json()["lang"]) == ("pl", "en")
+
+        cache = _cache_of(app)
+        for key in list(cache.entries):  # wszystkie warianty wygasły
+            cache._evict(key, "expired")
+        assert ("GET", "/lang", "") not in cache.vary
+        pl, en = await pl_and_en()
+        assert (pl.json()["lang"], en.json()["lang"]) == ("pl", "en")
+    assert calls["n"] == 4
+
+
+def test_replacing_an_entry_keeps_its_vary_names():
+    cache = ResponseCacheMiddleware(FastAPI(), routes="/lang=60")
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/lang",
+        "query_string": b"",
+        "headers": [(b"accept-language", b"pl")],
+    }
+    base = ("GET", "/lang", "")
+    entry = CacheEntry(200, [(b"vary", b"Accept-Language")], b"{}", 0.0, 1e9, 300)
+    cache._store(Request(scope), base, entry)
+    cache._store(Request(scope), base, replace(entry))
+    assert cache.vary[base] == ("accept-language",) and len(cache.entries) == 1
+
+
+async def test_ttl_uncacheable_and_oversized_responses():
+    app, calls = _app(routes="/items=0.01,/private=60,/big=60", max_entry_kb=2)
+    async with _client(app) as client:
+        await client.get("/items")
+        await asyncio.sleep(0.02)
+        assert (await client.get("/items")).headers["x-cache"] == "MISS"
+        for path in ("/private", "/private", "/big", "/big"):
+            r = await client.get(path)
+            assert "x-cache" not in r.headers
+        assert len((await client.get("/big")).content) == 4096
+    assert calls["n"] == 7
+
+
+async def test_byte_budget_evicts_least_recently_used():
+    app, _ = _app(routes="/items=60")
+    async with _client(app) as client:
+        await client.get("/items?a=1")
+        cache = _cache_of(app)
+        cache.max_bytes = int(cache.size * 2.5)  # mieszczą się dwa wpisy
+        for q in ("b", "a", "c"):
+            await client.get(f"/items?{q}=1")
+        assert [key[2] for key in cache.entries] == ["a=1", "c=1"]
+        assert cache.size <= cache.max_bytes
@@ -0,0 +1,65 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+import app.responses as responses
+from app.main import create_app
+from app.schemas.status import FrontStatusV1
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    import app.routers.front as front_module
+
+    front_module._cache = None
+    front_module._cache_timestamp = None
+    yield
+    front_module._cache = None
+    front_module._cache_timestamp = None
+
+
+def _legacy_bytes(model) -> bytes:
+    """What FastAPI's response_model + JSONResponse path produces."""
+    return json.dumps(jsonable_encoder(model), ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def test_front_status_bytes_match_default_encoder_path():
+    client = TestClient(create_app())
+    with open("app/data/status.stub.json", encoding="utf-8") as f:
+        expected = _legacy_bytes(FrontStatusV1(**json.load(f)))
+
+    miss = client.get("/front/status")
+    hit = client.get("/front/status")
+
+    assert miss.content == expected
+    assert hit.content == expected
+    assert hit.headers["content-type"] == "application/json"
+
+
+def test_front_status_slow_path_still_available():
+    client = TestClient(create_app())
+    fast = client.get("/front/status").content
+    with patch("app.config.settings.fast_json", False):
+        slow = client.get("/front/status").content
+    assert slow == fast
+
+
+def test_dumps_stdlib_fallback_matches_orjson(monkeypatch):
+    content = {"ok": True, "note": "zażółć — ✓", "n": [1, 2.5, None]}
+    fast = responses.dumps(content)
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.dumps(content) == fast
+
+
+def test_dumps_accepts_what_the_stdlib_encoder_accepts():
+    big = 2**70
+    content = {"by_code": {200: 3, 404: 1}, "big": big, True: None}
+    expected = b'{"by_code":{"200":3,"404":1},"big":%d,"true":null}' % big
+    assert responses.dumps(content) == expected
+    with pytest.raises(TypeError):
+        responses.dumps({"s": {1, 2}})
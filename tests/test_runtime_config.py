@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from app import config
+from app.routers import front
+from axv_gw import runtime_config
+from axv_gw.middleware.rate_limit import RateLimitMiddleware
+from axv_gw.runtime_config import ConfigWatcher
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "runtime.env"
+    monkeypatch.setenv("RUNTIME_CONFIG_FILE", str(path))
+    yield path
+    # back to environment values for the rest of the suite
+    runtime_config.apply({})
+
+
+def test_rate_limit_reload_keeps_window_state(config_file, monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_DEFAULT", "5")
+    app = FastAPI()
+
+    @app.get("/status")
+    def status():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware)
+    c = TestClient(app)
+    h = {"X-Forwarded-For": "192.0.2.61"}
+    for _ in range(3):
+        assert c.get("/status", headers=h).status_code == 200
+
+    config_file.write_text("# tighter limit\nRATE_LIMIT_DEFAULT=3\n")
+    assert runtime_config.reload() is True
+    # the three requests already in the window count against the new limit
+    assert c.get("/status", headers=h).status_code == 429
+
+    config_file.write_text("")
+    runtime_config.reload()
+    assert c.get("/status", headers=h).status_code == 200
+
+
+def test_invalid_reload_keeps_previous_snapshot(config_file):
+    config_file.write_text("MAX_BODY_KB=128\n")
+    runtime_config.reload()
+    version = runtime_config.current().version
+
+    config_file.write_text("MAX_BODY_KB=lots\n")
+    assert runtime_config.reload() is False
+    config_file.write_text("AXV_GW_CACHE_TTL_SECONDS=soon\n")
+    assert runtime_config.reload() is False
+
+    assert runtime_config.current().version == version
+    assert runtime_config.env_int("MAX_BODY_KB", 64) == 128
+
+
+def test_settings_reload_swaps_object_and_expires_front_cache(config_file, tmp_path):
+    front._cache = {"version": "stale"}
+    front._cache_timestamp = front.datetime.now(front.UTC)
+    old = config.settings
+
+    config_file.write_text(
+        f'AXV_GW_STUB_PATH="{tmp_path / "other.json"}"\nAXV_GW_CACHE_TTL_SECONDS=5\n'
+    )
+    runtime_config.reload()
+
+    assert config.settings is not old
+    assert config.settings.stub_path == str(tmp_path / "other.json")
+    assert config.settings.cache_ttl_seconds == 5
+    assert front._cache_timestamp is None and front._cache == {"version": "stale"}
+    front._cache = None
+
+
+async def test_watcher_reloads_on_file_change(config_file):
+    config_file.write_text("HMAC_MAX_SKEW_S=60\n")
+    watcher = ConfigWatcher(watch_s=0.01)
+    await watcher.start()
+    try:
+        config_file.write_text("HMAC_MAX_SKEW_S=5\n")
+        for _ in range(100):
+            if runtime_config.current().get_int("HMAC_MAX_SKEW_S", 300) == 5:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await watcher.stop()
+    assert runtime_config.current().get_int("HMAC_MAX_SKEW_S", 300) == 5
+
+
+def test_reload_warns_about_status_registry_settings(config_file, caplog):
+    config_file.write_text('AXV_GW_FRONT_DEFAULT_LOCALE="pl"\nAXV_GW_FRONT_REGISTRY_MAX_MB=4\n')
+    with caplog.at_level("WARNING"):
+        runtime_config.reload()
+
+    assert "need a restart to apply: front_default_locale, front_registry_max_mb" in caplog.text
+
+
+def test_reload_warns_about_fast_json(config_file, caplog):
+    config_file.write_text("AXV_GW_FAST_JSON=false\n")
+    with caplog.at_level("WARNING"):
+        runtime_config.reload()
+
+    assert "need a restart to apply: fast_json" in caplog.text
@@ -0,0 +1,73 @@
+import json
+import multiprocessing
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.cli import main
+from app.config import Settings
+from app.serve import RecyclingServer, ServeOptions, available_cpus, uvicorn_config
+
+
+def _affinity() -> int:
+    return len(os.sched_getaffinity(0))
+
+
+def test_available_cpus_respects_cgroup_quota(tmp_path):
+    v2 = tmp_path / "v2"
+    v2.mkdir()
+    (v2 / "cpu.max").write_text("50000 100000\n")  # half a CPU → 1 worker
+    assert available_cpus(v2) == 1
+
+    (v2 / "cpu.max").write_text("max 100000\n")
+    assert available_cpus(v2) == _affinity()
+
+    v1 = tmp_path / "v1" / "cpu"
+    v1.mkdir(parents=True)
+    (v1 / "cpu.cfs_quota_us").write_text("-1\n")
+    (v1 / "cpu.cfs_period_us").write_text("100000\n")
+    assert available_cpus(tmp_path / "v1") == _affinity()
+
+
+def test_serve_options_from_settings_and_flags(capsys):
+    opts = ServeOptions.from_settings(Settings(workers=3, max_requests=1000), port=9001)
+    assert (opts.workers, opts.port, opts.max_requests) == (3, 9001, 1000)
+    assert opts.supervised
+    assert ServeOptions.from_settings(Settings()).workers == available_cpus()
+
+    assert main(["serve", "--workers", "2", "--no-reuse-port", "--print-config"]) == 0
+    out = capsys.readouterr().out
+    printed = json.loads(out[out.index("{") :])
+    assert printed["workers"] == 2 and printed["reuse_port"] is False
+
+
+def test_serve_refuses_shared_per_process_state(capsys):
+    queue = Settings(hooks_ingest_mode="queue")
+    assert ServeOptions.from_settings(queue, workers=1).workers == 1
+    for overrides in ({"workers": 2}, {"workers": 1, "max_requests": 1000}):
+        with pytest.raises(ValueError, match="hooks_ingest_mode=queue"):
+            ServeOptions.from_settings(queue, **overrides)
+
+    history = Settings(history_path="var/history.bin")
+    assert ServeOptions.from_settings(history, workers=1, max_requests=1000).supervised
+    with pytest.raises(ValueError, match="history_path"):
+        ServeOptions.from_settings(history, workers=4)
+
+    with patch("app.config.settings.hooks_ingest_mode", "queue"):
+        assert main(["serve", "--workers", "2", "--print-config"]) == 2
+    assert "--workers 1" in capsys.readouterr().err
+
+
+async def test_worker_asks_for_recycling_instead_of_exiting():
+    opts = ServeOptions(max_requests=10)
+    retire = multiprocessing.get_context("spawn").Event()
+    config = uvicorn_config(opts)
+    config.load()
+    server = RecyclingServer(config, opts, retire=retire)
+
+    server.server_state.total_requests = 5
+    assert await server.on_tick(1) is False and not retire.is_set()
+    server.server_state.total_requests = 12  # max_requests 10 ± 1 jitter
+    assert await server.on_tick(2) is False
+    assert retire.is_set()
@@ -0,0 +1,113 @@
+import statistics
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import app.routers.front as front_module
+from app.main import create_app
+from axv_api.app.simulator import Faults, Simulator
+from axv_api.app.simulator import create_app as create_simulator
+
+UPSTREAM = "http://sim/axv/front/status"
+
+
+@pytest.fixture
+def sim():
+    return Simulator(seed=7)
+
+
+def test_admin_api_controls_faults(sim):
+    client = TestClient(create_simulator(sim))
+    assert client.get("/axv/status").status_code == 200
+
+    client.put("/_sim/faults", json={"error_rate": 1, "error_status": 500})
+    assert client.get("/axv/status").status_code == 500
+    assert client.get("/axv/healthz").status_code == 500
+    assert client.get("/_sim/faults").json()["error_rate"] == 1  # admin bez usterek
+
+    client.patch("/_sim/faults", json={"paths": ["/axv/status"]})
+    assert client.get("/axv/healthz").status_code == 200
+    assert client.patch("/_sim/faults", json={"error_rate": 2}).status_code == 422
+
+    client.put("/_sim/faults", json={"states": {"axv-pulse": "down"}})
+    services = {s["id"]: s["state"] for s in client.get("/axv/front/status").json()["services"]}
+    assert services["axv-pulse"] == "down" and services["cli-brat"] == "ok"
+
+    client.delete("/_sim/faults")
+    assert client.get("/axv/status").status_code == 200
+    assert client.get("/_sim/stats").json()["errors"] == 2
+
+
+def test_latency_resets_and_slow_bodies(sim):
+    sim.faults = Faults(latency="lognormal", latency_ms=20, latency_sigma=0.5)
+    samples = [sim.delay_s() for _ in range(2000)]
+    assert 0.018 < statistics.median(samples) < 0.022
+    sim.faults = Faults(latency_ms=10, tail_rate=0.1, tail_ms=500, latency_max_ms=200)
+    samples = sorted(sim.delay_s() for _ in range(1000))
+    assert samples[500] == 0.01 and samples[-1] == 0.2
+
+    client = TestClient(create_simulator(sim))
+    sim.faults = Faults(reset_rate=1)
+    r = client.get("/axv/status")
+    assert r.status_code == 200 and r.content == b""
+    assert int(r.headers["content-length"]) > 0  # klient dostaje urwaną odpowiedź
+
+    sim.faults = Faults(slow_body_rate=1, slow_body_ms=50, slow_body_chunks=5)
+    r = client.get("/axv/status")
+    assert r.json()["status"]["api"] == "ok"
+    assert r.elapsed >= timedelta(milliseconds=50)
+    assert sim.stats["resets"] == 1 and sim.stats["slow_bodies"] == 1
+
+
+def test_gateway_serves_stale_while_upstream_fails(sim):
+    upstream = httpx.AsyncClient(transport=httpx.ASGITransport(create_simulator(sim)))
+    headers = {"X-Forwarded-For": "192.0.2.81"}
+    stale = front_module.stale_served
+    with (
+        patch.object(front_module, "_client", upstream),
+        patch("app.config.settings.front_status_url", UPSTREAM),
+        patch("app.config.settings.request_max_retries", 1),
+    ):
+        client = TestClient(create_app())
+        front_module._cache = None
+        sim.faults = Faults(states={"cli-brat": "warn"})
+        r = client.get("/front/status", headers=headers)
+        assert r.status_code == 200
+        assert {"id": "cli-brat", "label": "CLI-brat Agent", "state": "warn", "note": None} in (
+            r.json()["services"]
+        )
+
+        sim.faults = Faults(error_rate=1)
+        front_module._cache_timestamp -= timedelta(hours=1)
+        before = stale._value.get()
+        assert client.get("/front/status", headers=headers).status_code == 200
+        assert client.get("/front/status", headers=headers).status_code == 200
+        # Jedna próba + jeden retry; drugie żądanie czeka na kolejną próbę ze stale
+        assert sim.stats["errors"] == 2
+        assert stale._value.get() - before == 2
+
+        front_module._cache = None
+        assert client.get("/front/status", headers=headers).status_code == 502
+    front_module._cache = None
+    front_module._cache_timestamp = None
+
+
+def test_prewarm_load_has_a_total_deadline(sim):
+    sim.faults = Faults(slow_body_rate=1, slow_body_ms=3000, slow_body_chunks=30)
+    transport = httpx.ASGITransport(create_simulator(sim))
+    with (
+        patch.object(front_module, "_new_client", lambda: httpx.AsyncClient(transport=transport)),
+        patch("app.config.settings.request_timeout_seconds", 0.2),
+        patch("app.config.settings.request_max_retries", 1),
+    ):
+        t0 = time.perf_counter()
+        with pytest.raises(HTTPException) as exc:
+            front_module._load_upstream_sync(UPSTREAM)
+        # Dwie próby po 0,2 s, nie 2 × 3 s sączonego body
+        assert exc.value.status_code == 502 and time.perf_counter() - t0 < 1.5
+    assert sim.stats["slow_bodies"] == 2
@@ -0,0 +1,52 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from axv_gw.metrics import OTHER_PATH, hmac_bad_ts, hooks_ok
+from axv_gw.middleware.rate_limit import RateLimitMiddleware
+from bench.soak import growing_sites, soak
+
+
+def test_rate_limiter_sweeps_expired_buckets():
+    limiter = RateLimitMiddleware(FastAPI(), default_limit=10, window_seconds=60)
+    start = limiter._next_sweep - 60
+    for i in range(1000):
+        assert limiter._take((f"10.0.{i >> 8}.{i & 255}", f"/scan/{i}"), 10, 1, start) is None
+    limiter._take(("10.9.9.9", "/status"), 10, 1, start + 59)
+    assert len(limiter.buckets) == 1001
+
+    limiter._take(("10.9.9.9", "/status"), 10, 1, start + 61)
+    assert list(limiter.buckets) == [("10.9.9.9", "/status")]  # aktywny zostaje
+
+
+def test_path_labels_are_route_templates():
+    from app.main import create_app
+
+    client = TestClient(create_app())
+    headers = {"X-Forwarded-For": "192.0.2.91", "X-AXV-Timestamp": "0"}
+    for i in range(3):
+        assert client.post(f"/hooks/scan-{i}", headers=headers).status_code == 401
+    assert client.post("/hooks/ping", headers=headers).status_code == 401
+
+    labels = {s.labels["path"] for s in hmac_bad_ts.collect()[0].samples}
+    assert OTHER_PATH in labels and "/hooks/ping" in labels
+    assert not any(label.startswith("/hooks/scan-") for label in labels)
+    ok_labels = {s.labels["path"] for s in hooks_ok.collect()[0].samples}
+    assert all(not label.startswith("/hooks/scan-") for label in ok_labels)
+
+
+def test_growing_sites_need_steady_growth():
+    samples = [
+        {"leak.py:1": 1000 * n, "window.py:2": [5000, 9000, 4000, 8000][n], "flat.py:3": 10}
+        for n in range(4)
+    ]
+    growing = growing_sites(samples, top=10, min_share=0.75)
+    assert [g["site"] for g in growing] == ["leak.py:1"]
+    assert growing[0]["grew_in"] == "3/3"
+
+
+async def test_soak_run_reports_samples():
+    result = await soak(requests=280, warmup=56, interval=140, concurrency=4, ips=100)
+    assert [p["requests"] for p in result["samples"]] == [0, 140, 280]
+    assert sum(result["statuses"].values()) == 336
+    assert {200, 401, 404} <= set(result["statuses"])
+    assert result["samples"][-1]["traced_kib"] > 0
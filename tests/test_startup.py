@@ -0,0 +1,38 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.routers.front as front_module
+from app.main import create_app
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    front_module._cache = None
+    front_module._cache_timestamp = None
+    yield
+    front_module._cache = None
+    front_module._cache_timestamp = None
+
+
+def test_lifespan_prewarms_front_status_cache():
+    app = create_app()
+    with TestClient(app) as client:
+        assert app.state.prewarmed == {"front_status": True}
+        assert front_module._is_cache_valid()
+
+        with patch.object(front_module, "_load_stub", side_effect=AssertionError):
+            # Served from the warm cache, no stub read on the first request
+            assert client.get("/front/status").status_code == 200
+
+    report = app.state.startup
+    assert report["ready_ms"] >= report["import_ms"] > 0
+    assert report["budget_ms"] == 2000
+
+
+def test_prewarm_failure_is_not_fatal(tmp_path):
+    with patch("app.config.settings.stub_path", str(tmp_path / "missing.json")):
+        app = create_app()
+        with TestClient(app):
+            assert app.state.prewarmed == {"front_status": False}
@@ -0,0 +1,111 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.routers.front as front_module
+from app.main import create_app
+from app.status_registry import StatusRegistry, UnknownDocumentError
+
+
+def _write(root, site, locale, label, **extra):
+    path = root / site / f"{locale}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = {
+        "updatedAt": "2025-11-11T16:05:00Z",
+        "services": [{"id": "api", "label": label, "state": "ok"}],
+        **extra,
+    }
+    path.write_text(json.dumps(doc))
+    return path
+
+
+@pytest.fixture
+def sites(tmp_path):
+    _write(tmp_path, "axv", "en", "API")
+    _write(tmp_path, "axv", "pl", "Interfejs API")
+    _write(tmp_path, "shop", "en", "Shop API")
+    registry = StatusRegistry(tmp_path)
+    with patch.object(front_module, "registry", registry):
+        yield tmp_path, registry
+    registry.clear()
+
+
+def test_site_and_locale_selection(sites):
+    client = TestClient(create_app())
+
+    r = client.get("/front/sites/axv/status", headers={"Accept-Language": "pl-PL,pl;q=0.9"})
+    assert r.status_code == 200 and r.headers["content-language"] == "pl"
+    assert r.json()["services"][0]["label"] == "Interfejs API"
+    assert "Accept-Language" in r.headers["vary"]
+
+    r = client.get("/front/sites/axv/status", params={"locale": "de"})
+    assert r.headers["content-language"] == "en"  # fallback do domyślnego
+
+    r = client.get("/front/status", headers={"X-AXV-Site": "shop", "X-AXV-Locale": "pl"})
+    assert r.json()["services"][0]["label"] == "Shop API"
+
+    assert client.get("/front/sites/nope/status").status_code == 404
+    assert client.get("/front/sites/..%2Fetc/status").status_code == 404
+    # Bez X-AXV-Site: dokument domyślny jak dotąd, z tym samym Vary
+    r = client.get("/front/status")
+    assert r.json()["services"][0]["id"] == "k8s-cluster"
+    assert r.headers["vary"] == front_module.VARY
+
+
+async def test_single_flight_per_key_ttl_and_stale_fallback(sites):
+    root, registry = sites
+    _write(root, "axv", "en", "API", cacheTtlSeconds=0)
+    with patch.object(registry, "_read", wraps=registry._read) as read:
+        entries = await asyncio.gather(*(registry.get("axv", "en", 60) for _ in range(10)))
+        assert read.call_count == 1 and len({id(e) for e in entries}) == 1
+
+        await registry.get("axv", "pl", 60)
+        await registry.get("axv", "pl", 60)  # TTL 60 s → z pamięci
+        assert read.call_count == 2
+
+        (root / "axv" / "en.json").write_text("{broken")
+        stale = await registry.get("axv", "en", 60)  # cacheTtlSeconds=0 → przeładowanie
+        assert stale is entries[0] and read.call_count == 3
+
+    with pytest.raises(UnknownDocumentError):
+        await registry.get("axv/../shop", "en", 60)
+
+
+async def test_unknown_sites_are_listed_in_a_thread_and_remembered_lru(sites):
+    root, registry = sites
+    with (
+        patch("app.status_registry.MISSING_SITES", 2),
+        patch.object(registry, "_list", wraps=registry._list) as listing,
+        patch("app.status_registry.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread,
+    ):
+        for site in ["a", "b", "a", "c", "a", "b"]:
+            with pytest.raises(UnknownDocumentError):
+                await registry.get(site, None, 60)
+        # a, b, (a z pamięci), c wypycha b, (a z pamięci), b od nowa
+        assert [c.args[0] for c in listing.call_args_list] == ["a", "b", "c", "b"]
+        assert to_thread.call_count == 4
+        assert list(registry._missing) == ["a", "b"]
+
+        _write(root, "a", "en", "Late API")
+        registry._missing["a"] = 0.0  # TTL minął
+        assert (await registry.get("a", None, 60)).locale == "en"
+        assert "a" not in registry._missing
+
+
+async def test_memory_budget_evicts_least_recently_used(tmp_path):
+    for i in range(300):
+        _write(tmp_path, f"site{i}", "en", f"Service {i}")
+    registry = StatusRegistry(tmp_path)
+    for i in range(300):
+        await registry.get(f"site{i}", None, 60)
+    assert len(registry.entries) == 300
+    one = registry.entries["site0", "en"].size
+
+    small = StatusRegistry(tmp_path, max_bytes=one * 3)
+    for i in (0, 1, 2, 0, 3):
+        await small.get(f"site{i}", "en", 60)
+    assert list(small.entries) == [("site2", "en"), ("site0", "en"), ("site3", "en")]
+    assert small.size <= small.max_bytes